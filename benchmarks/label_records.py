@@ -0,0 +1,76 @@
+"""Compares building label times from dictionaries with the columnar label records.
+
+Each method runs in its own process, so the peak memory of one method does not affect the other.
+The records are generated like the records of a label search: a target group, a cutoff time and a label.
+
+    python benchmarks/label_records.py [number of labels]
+"""
+import multiprocessing
+import resource
+import sys
+from timeit import default_timer
+
+import numpy as np
+import pandas as pd
+
+from composeml import LabelTimes
+from composeml.label_times.records import LabelRecords
+
+COLUMNS = ["customer_id", "time", "total_spent"]
+
+
+def iter_records(n_labels, chunk_size=100000):
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2020-01-01")
+
+    for i in range(0, n_labels, chunk_size):
+        n = min(chunk_size, n_labels - i)
+        customer_id = (np.arange(i, i + n) // 100).tolist()
+        time = pd.date_range(start + pd.Timedelta(minutes=i), periods=n, freq="1min")
+        total_spent = rng.normal(size=n).tolist()
+        yield from zip(customer_id, time, total_spent)
+
+
+def from_dicts(records):
+    data = [dict(zip(COLUMNS, record)) for record in records]
+    return LabelTimes(data=data, target_dataframe_index="customer_id")
+
+
+def from_label_records(records):
+    label_records = LabelRecords(COLUMNS)
+    label_records.extend(records)
+    data = label_records.to_dict()
+    return LabelTimes(data=data, target_dataframe_index="customer_id")
+
+
+def peak_memory():
+    """Returns the peak resident memory of the process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform != "darwin" else peak / 1024**2
+
+
+def run(method, n_labels, queue):
+    baseline = peak_memory()
+    start = default_timer()
+    lt = method(iter_records(n_labels))
+    elapsed = default_timer() - start
+    queue.put((len(lt), elapsed, peak_memory() - baseline))
+
+
+def main(n_labels=10_000_000):
+    print(f"{'method':<20}{'labels':>12}{'time (s)':>12}{'peak (MB)':>12}")
+    context = multiprocessing.get_context("spawn")
+
+    for method in [from_dicts, from_label_records]:
+        queue = context.Queue()
+        process = context.Process(target=run, args=(method, n_labels, queue))
+        process.start()
+        n, elapsed, peak = queue.get()
+        process.join()
+
+        name = method.__name__
+        print(f"{name:<20}{n:>12}{elapsed:>12.2f}{peak:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""Compares the serial label search with the thread-backed label search.
+
+Threads pay off when labeling functions spend most of their time outside the GIL,
+for example in NumPy routines on large slices or while waiting on a local scoring process.
+Pure Python labeling functions hold the GIL and do not benefit from threads.
+
+    python benchmarks/search_executor.py
+"""
+import time
+from timeit import default_timer
+
+import numpy as np
+import pandas as pd
+
+from composeml import LabelMaker
+
+
+def make_data(n_instances=32, n_rows=10000, seed=0):
+    rng = np.random.default_rng(seed)
+    time_index = pd.date_range("2020-01-01", periods=n_rows, freq="1min")
+    frames = []
+
+    for instance in range(n_instances):
+        amount = rng.normal(size=n_rows)
+        frame = {"instance": instance, "time": time_index, "amount": amount}
+        frames.append(pd.DataFrame(frame))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def median_amount(ds):
+    """Sorts the slice values in NumPy, which releases the GIL."""
+    return np.median(np.sort(ds["amount"].to_numpy()))
+
+
+def scored_amount(ds):
+    """Simulates a call to a local scoring process."""
+    time.sleep(0.001)
+    return ds["amount"].sum()
+
+
+def python_amount(ds):
+    """Loops in Python, which holds the GIL."""
+    total = 0.0
+    for value in ds["amount"].tolist():
+        total += value
+    return total
+
+
+def run(df, labeling_function, **kwargs):
+    lm = LabelMaker(
+        target_dataframe_index="instance",
+        time_index="time",
+        labeling_function=labeling_function,
+        window_size="2d",
+    )
+
+    start = default_timer()
+    lt = lm.search(df, -1, gap="1h", verbose=False, **kwargs)
+    return default_timer() - start, lt
+
+
+def main(n_jobs=4):
+    df = make_data()
+    print(
+        f"{'labeling function':<20}{'serial (s)':>12}{'thread (s)':>12}{'speedup':>10}"
+    )
+
+    for labeling_function in [median_amount, scored_amount, python_amount]:
+        serial, expected = run(df, labeling_function)
+        thread, actual = run(df, labeling_function, n_jobs=n_jobs, executor="thread")
+        assert actual.equals(expected)
+
+        name = labeling_function.__name__
+        print(f"{name:<20}{serial:>12.2f}{thread:>12.2f}{serial / thread:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
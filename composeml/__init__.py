@@ -1,5 +1,15 @@
 # flake8:noqa
 from composeml.version import __version__
 from composeml import demos, update_checker
+from composeml.batch_function import batch
+from composeml.columns import uses_columns
 from composeml.label_maker import LabelMaker
-from composeml.label_times import LabelTimes, read_label_times
+from composeml.prepared_data import PreparedData
+from composeml.label_times import (
+    LabelTimes,
+    ParquetSink,
+    merge_label_times,
+    read_label_times,
+)
+from composeml.shard import is_in_shard
+from composeml.slice_plan import SlicePlan, read_slice_plan
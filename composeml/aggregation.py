@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+
+class WindowAggregation:
+    """A built-in labeling function that aggregates a column over each data slice.
+
+    When every labeling function is built-in, the label maker calculates the aggregations
+    for the data slices of all target groups at once instead of labeling one data slice at a time.
+
+    Args:
+        column (str): The name of the column to aggregate.
+        function (str): The name of the aggregation. Supported aggregations are
+            "count", "max", "mean", "min", "nunique" and "sum".
+
+    Examples:
+        >>> from composeml import LabelMaker
+        >>> lm = LabelMaker(
+        ...     target_dataframe_index='customer_id',
+        ...     time_index='time',
+        ...     labeling_function={'total_spent': ('amount', 'sum')},
+        ...     window_size='1h',
+        ... )
+        >>> lm.labeling_function['total_spent']
+        WindowAggregation(column='amount', function='sum')
+    """
+
+    functions = ["count", "max", "mean", "min", "nunique", "sum"]
+
+    def __init__(self, column, function):
+        info = "aggregation must be one of: %s" % ", ".join(self.functions)
+        assert function in self.functions, info
+        self.column = column
+        self.function = function
+        self.columns = [column]
+        self.__name__ = f"{column}_{function}"
+
+    def __call__(self, ds, *args, **kwargs):
+        """Aggregates the column of a data slice."""
+        values = ds[self.column]
+        if isinstance(values, np.ndarray):
+            values = pd.Series(values)
+
+        return getattr(values, self.function)()
+
+    def __repr__(self):
+        """Represents the aggregation as a string."""
+        return f"WindowAggregation(column={self.column!r}, function={self.function!r})"
+
+    def is_vectorized(self, df):
+        """Whether the aggregation can be calculated for all data slices at once.
+
+        The count and number of unique values support any data type.
+        Other aggregations require a boolean or numeric NumPy data type.
+        """
+        if self.function in ["count", "nunique"]:
+            return True
+
+        dtype = df[self.column].dtype
+        return isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+
+    def calculate(self, df, row_start, row_stop):
+        """Calculates the aggregation for the data slices at the row positions.
+
+        Args:
+            df (DataFrame): Data frame that contains the data slices.
+            row_start (ndarray): Positions of the first row in each data slice.
+            row_stop (ndarray): Positions after the last row in each data slice.
+
+        Returns:
+            labels (list): The label of each data slice. Undefined labels are None.
+        """
+        values = df[self.column]
+        method = getattr(self, "_calculate_" + self.function)
+        labels, valid = method(values, row_start, row_stop)
+        labels = np.asarray(labels).tolist()
+
+        if valid is not None:
+            labels = [label if ok else None for label, ok in zip(labels, valid)]
+
+        return labels
+
+    def _calculate_count(self, values, row_start, row_stop):
+        """Counts the values that are not null with a cumulative sum."""
+        counts = np.concatenate([[0], np.cumsum(values.notna().to_numpy())])
+        return counts[row_stop] - counts[row_start], None
+
+    def _calculate_nunique(self, values, row_start, row_stop, block_size=1 << 20):
+        """Counts the unique values that are not null.
+
+        A value is counted in a data slice when the previous row with the same value is before the data slice.
+        The rows of the data slices are expanded in blocks of data slices, so overlapping data slices use bounded memory.
+        """
+        codes, _ = pd.factorize(values)
+        order = np.argsort(codes, kind="stable")
+        same = codes[order[1:]] == codes[order[:-1]]
+        previous = np.full(len(codes), -1, dtype="int64")
+        previous[order[1:][same]] = order[:-1][same]
+
+        row_start = np.asarray(row_start, dtype="int64")
+        lengths = np.asarray(row_stop, dtype="int64") - row_start
+        labels = np.zeros(len(lengths), dtype="int64")
+        ends = np.cumsum(lengths)
+        i = 0
+
+        while i < len(lengths):
+            # at least one data slice is in each block
+            j = max(np.searchsorted(ends, ends[i] - lengths[i] + block_size), i + 1)
+            n = lengths[i:j]
+            window = np.repeat(np.arange(len(n)), n)
+            offsets = np.repeat(row_start[i:j] - (np.cumsum(n) - n), n)
+            rows = np.arange(n.sum()) + offsets
+            first = previous[rows] < row_start[i:j][window]
+            first &= codes[rows] >= 0
+            labels[i:j] = np.bincount(window, weights=first, minlength=len(n))
+            i = j
+
+        return labels, None
+
+    def _calculate_sum(self, values, row_start, row_stop):
+        """Sums the values, ignoring nulls.
+
+        Integers are summed with a cumulative sum. Floats are summed with a reduction over each data slice,
+        so the rounding does not accumulate across data slices.
+        """
+        values = values.to_numpy()
+        if values.dtype.kind == "f":
+            return self._sum_floats(values, row_start, row_stop), None
+
+        if values.dtype.kind == "b":
+            values = values.astype("int64")
+
+        sums = np.concatenate([np.zeros(1, dtype=values.dtype), np.cumsum(values)])
+        return sums[row_stop] - sums[row_start], None
+
+    def _calculate_mean(self, values, row_start, row_stop):
+        """Averages the values, ignoring nulls."""
+        counts, _ = self._calculate_count(values, row_start, row_stop)
+        values = values.to_numpy().astype("float64")
+        sums = self._sum_floats(values, row_start, row_stop)
+        valid = counts > 0
+        labels = np.divide(sums, counts, out=np.zeros(len(sums)), where=valid)
+        return labels, valid
+
+    def _sum_floats(self, values, row_start, row_stop):
+        """Sums the float values of each data slice, ignoring nulls. Empty data slices sum to zero."""
+        values = np.where(np.isnan(values), 0, values)
+        sums, _ = self._reduce_at(np.add, values, row_start, row_stop)
+        return np.where(np.greater(row_stop, row_start), sums, 0)
+
+    def _calculate_min(self, values, row_start, row_stop):
+        """Calculates the minimum values, ignoring nulls."""
+        return self._reduce_at(np.fmin, values.to_numpy(), row_start, row_stop)
+
+    def _calculate_max(self, values, row_start, row_stop):
+        """Calculates the maximum values, ignoring nulls."""
+        return self._reduce_at(np.fmax, values.to_numpy(), row_start, row_stop)
+
+    def _reduce_at(self, ufunc, values, row_start, row_stop):
+        """Reduces the values of each data slice with a ufunc.
+
+        The start and stop positions are interleaved, so data slices can overlap.
+        A sentinel value is appended to keep every position in range.
+        """
+        values = np.append(values, np.zeros(1, dtype=values.dtype))
+        indices = np.empty(2 * len(row_start), dtype="int64")
+        indices[0::2], indices[1::2] = row_start, row_stop
+
+        if not len(indices):
+            return [], None
+
+        labels = ufunc.reduceat(values, indices)[0::2]
+        valid = np.greater(row_stop, row_start)
+
+        if values.dtype.kind == "f":
+            valid &= ~np.isnan(labels)
+
+        return labels, valid
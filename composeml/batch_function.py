@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+
+class BatchLabelingFunction:
+    """A labeling function that calculates the labels of many data slices in one call.
+
+    The function receives a data frame with the rows of every data slice and a table of the data slices.
+    The data frame has a ``window_id`` column with the data slice that each row belongs to.
+    Rows are repeated when data slices overlap. The table is indexed by ``window_id``
+    and has the target dataframe index, slice number, slice start and slice stop of each data slice.
+    The function returns one label for each data slice, either as a sequence in the order of the table
+    or as a series indexed by ``window_id``. Data slices without a label in a series are null.
+
+    When the data slices are generated one at a time, the function is called with a single data slice.
+
+    Args:
+        function (function): Function that transforms a batch of data slices to labels.
+        batch_size (int): Maximum number of data slices in each call. The default value includes all data slices.
+    """
+
+    def __init__(self, function, batch_size=None):
+        assert callable(function), "labeling function must be callabe"
+        info = "batch size must be a positive integer"
+        assert batch_size is None or batch_size > 0, info
+        self.function = function
+        self.batch_size = batch_size
+        self.__name__ = getattr(function, "__name__", type(function).__name__)
+        self.__doc__ = getattr(function, "__doc__", None)
+        self.columns = getattr(function, "columns", None)
+
+    def __call__(self, ds, *args, **kwargs):
+        """Calculates the label of a single data slice."""
+        context = ds.context._series.drop("next_start", errors="ignore")
+        windows = context.to_frame().T.infer_objects()
+        windows.index = pd.Index([0], name="window_id")
+        df = pd.DataFrame(ds).assign(window_id=0)
+        return self._get_labels(df, windows, *args, **kwargs)[0]
+
+    def __repr__(self):
+        """Represents the batch labeling function as a string."""
+        return f"BatchLabelingFunction({self.__name__})"
+
+    def calculate(self, df, windows, *args, **kwargs):
+        """Calculates the labels of the data slices at the row positions.
+
+        Args:
+            df (DataFrame): Data frame that contains the data slices.
+            windows (DataFrame): Table of the data slices with the positions of the first row (``row_start``)
+                and after the last row (``row_stop``) of each data slice.
+            args (tuple): Positional arguments for the function.
+            kwargs (dict): Keyword arguments for the function.
+
+        Returns:
+            labels (list): The label of each data slice.
+        """
+        labels, batch_size = [], self.batch_size or max(len(windows), 1)
+
+        for i in range(0, len(windows), batch_size):
+            batch = windows.iloc[i : i + batch_size]
+            row_start = batch.pop("row_start").to_numpy()
+            row_stop = batch.pop("row_stop").to_numpy()
+            lengths = row_stop - row_start
+
+            offsets = np.repeat(row_start - np.cumsum(lengths) + lengths, lengths)
+            positions = np.arange(lengths.sum(), dtype="int64") + offsets
+            window_id = np.repeat(batch.index.to_numpy(), lengths)
+            frame = df.iloc[positions].assign(window_id=window_id)
+            labels.extend(self._get_labels(frame, batch, *args, **kwargs))
+
+        return labels
+
+    def _get_labels(self, df, windows, *args, **kwargs):
+        """Calls the function and aligns the labels with the data slices."""
+        labels = self.function(df, windows, *args, **kwargs)
+
+        if isinstance(labels, pd.Series):
+            labels = labels.reindex(windows.index)
+
+        labels = list(labels)
+        info = "batch labeling function must return one label for each data slice"
+        assert len(labels) == len(windows), info
+        return labels
+
+
+def batch(function=None, batch_size=None):
+    """Marks a labeling function that calculates the labels of many data slices in one call.
+
+    When all labeling functions are batch labeling functions or built-in aggregations,
+    the label maker calculates the labels of the data slices of all target groups in batches.
+
+    Args:
+        function (function): Function that transforms a batch of data slices to labels.
+        batch_size (int): Maximum number of data slices in each call. The default value includes all data slices.
+
+    Returns:
+        function (BatchLabelingFunction): The batch labeling function.
+
+    Examples:
+        >>> from composeml import batch
+        >>> @batch
+        ... def total_spent(df, windows):
+        ...     return df.groupby('window_id').amount.sum()
+        >>> total_spent
+        BatchLabelingFunction(total_spent)
+    """
+    if function is None:
+        return lambda function: BatchLabelingFunction(function, batch_size)
+
+    return BatchLabelingFunction(function, batch_size)
@@ -0,0 +1,78 @@
+import json
+import os
+import pickle
+
+from composeml.version import __version__
+
+
+class SearchCheckpoint:
+    """Saves the label records of a search to a directory as the target groups are searched.
+
+    The records are saved in parts with the number of target groups searched so far.
+    A checkpoint is identified by a key, so a search only resumes from a checkpoint of the same search.
+
+    Args:
+        path (str): Directory of the checkpoint (will be created if it does not exist).
+        key (str): Hash of the search configuration and data.
+    """
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.groups = 0
+        self.parts = 0
+
+    def load(self):
+        """Loads the progress of the checkpoint. A new checkpoint starts without progress."""
+        os.makedirs(self.path, exist_ok=True)
+        file = os.path.join(self.path, "checkpoint.json")
+        if not os.path.exists(file):
+            return
+
+        with open(file, "r") as file:
+            state = json.load(file)
+
+        info = "checkpoint was saved by a search with different settings or data"
+        assert state["key"] == self.key, info
+        self.groups, self.parts = state["groups"], state["parts"]
+
+    def read(self):
+        """Reads the label records of the saved parts in order."""
+        for part in range(self.parts):
+            with open(self._get_part_file(part), "rb") as file:
+                yield from pickle.load(file)
+
+    def save(self, records, groups):
+        """Saves the label records of the target groups searched since the last save.
+
+        The files are replaced atomically, so an interrupted save keeps the previous progress.
+
+        Args:
+            records (list(tuple)): The label records of the target groups.
+            groups (int): The number of target groups searched so far.
+        """
+        self._write(self._get_part_file(self.parts), pickle.dumps(records))
+        self.groups, self.parts = groups, self.parts + 1
+
+        state = {
+            "compose_version": __version__,
+            "key": self.key,
+            "groups": self.groups,
+            "parts": self.parts,
+        }
+
+        file = os.path.join(self.path, "checkpoint.json")
+        self._write(file, json.dumps(state).encode())
+
+    def _get_part_file(self, part):
+        return os.path.join(self.path, "records-%05d.pickle" % part)
+
+    def _write(self, file, data):
+        """Writes the data to a temporary file and then replaces the file."""
+        temporary = file + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary, file)
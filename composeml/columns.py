@@ -0,0 +1,29 @@
+def uses_columns(*columns):
+    """Declares the columns that a labeling function reads from the data slices.
+
+    When every labeling function declares its columns, the label maker projects the data frame
+    to those columns once before grouping, so the data slices only carry the columns that are used.
+    Built-in aggregations declare the column they aggregate.
+
+    Args:
+        *columns (str): Names of the columns read by the labeling function.
+
+    Returns:
+        decorator (function): Sets the columns of a labeling function.
+
+    Examples:
+        >>> from composeml import uses_columns
+        >>> @uses_columns('amount')
+        ... def total_spent(ds):
+        ...     return ds.amount.sum()
+        >>> total_spent.columns
+        ['amount']
+    """
+    for column in columns:
+        assert isinstance(column, str), "column names must be strings"
+
+    def decorator(function):
+        function.columns = list(columns)
+        return function
+
+    return decorator
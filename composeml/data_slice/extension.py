@@ -1,10 +1,29 @@
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
 
 from composeml.data_slice.offset import DataSliceOffset, DataSliceStep
 
 
 class DataSliceContext:
-    """Tracks contextual attributes about a data slice."""
+    """Tracks contextual attributes about a data slice.
+
+    The attributes are stored in slots, since a context is created for every data slice.
+    The first additional attribute set by the label maker (e.g. the target dataframe index) is also stored in slots.
+    Other attributes are stored in a dictionary that is only created when one is set.
+    The pandas series of the attributes is only created when represented.
+    """
+
+    __slots__ = (
+        "next_start",
+        "slice_stop",
+        "slice_start",
+        "slice_number",
+        "_name",
+        "_value",
+        "__dict__",
+    )
 
     def __init__(
         self,
@@ -25,16 +44,45 @@ class DataSliceContext:
         self.slice_stop = slice_stop
         self.slice_start = slice_start
         self.slice_number = slice_number
+        self._name = None
+        self._value = None
+
+    def __getattr__(self, name):
+        """Gets the additional attribute that is stored in slots."""
+        if name not in ("_name", "_value") and name == self._name:
+            return self._value
+
+        info = "'DataSliceContext' object has no attribute '%s'"
+        raise AttributeError(info % name)
 
     def __repr__(self):
         """Represents the data slice context as a string."""
         return self._series.fillna("").to_string()
 
+    def _set_attribute(self, name, value):
+        """Sets an additional attribute (e.g. the target dataframe index of the data slice)."""
+        if self._name is None or self._name == name:
+            self._name = name
+            self._value = value
+        else:
+            setattr(self, name, value)
+
+    def _items(self):
+        """Returns the names and values of the attributes in reverse order of when they were set."""
+        fields = DataSliceContext.__slots__[:4]
+        items = [(name, getattr(self, name)) for name in fields if hasattr(self, name)]
+
+        if self._name is not None and self._name not in self.__dict__:
+            items.append((self._name, self._value))
+
+        items.extend(self.__dict__.items())
+
+        return items[::-1]
+
     @property
     def _series(self):
         """Represents the data slice context as a pandas series."""
-        keys = reversed(list(vars(self)))
-        attrs = {key: getattr(self, key) for key in keys}
+        attrs = dict(self._items())
         context = pd.Series(attrs, name="context")
         return context
 
@@ -69,12 +117,88 @@ class DataSliceFrame(pd.DataFrame):
         return self.context
 
 
+class DataSliceArrays(Mapping):
+    """Maps the columns of a data slice to NumPy array views.
+
+    The columns are converted to arrays once, and each data slice is a positional view of the arrays,
+    so no pandas objects are created for a data slice. The length is the number of columns like other mappings.
+
+    Args:
+        arrays (dict(str=ndarray)): The arrays of the columns in the data frame that contains the data slice.
+        index (ndarray): The array of the time index in the data frame.
+        row_start (int): Position of the first row of the data slice.
+        row_stop (int): Position after the last row of the data slice.
+        context (DataSliceContext): The context of the data slice.
+    """
+
+    def __init__(self, arrays, index, row_start, row_stop, context=None):
+        self._arrays = arrays
+        self._index = index
+        self.row_start = row_start
+        self.row_stop = row_stop
+        self.context = context
+
+    @classmethod
+    def from_frame(cls, df):
+        """Creates the arrays of a data slice from a data frame.
+
+        Args:
+            df (DataFrame): The data slice.
+
+        Returns:
+            ds (DataSliceArrays): The data slice as arrays.
+        """
+        arrays = {column: df[column].to_numpy() for column in df.columns}
+        context = getattr(df, "context", None)
+        return cls(arrays, df.index.to_numpy(), 0, len(df), context)
+
+    def __getitem__(self, column):
+        """Returns the array view of a column."""
+        return self._arrays[column][self.row_start : self.row_stop]
+
+    def __iter__(self):
+        """Iterates the column names."""
+        return iter(self._arrays)
+
+    def __len__(self):
+        """Returns the number of columns."""
+        return len(self._arrays)
+
+    def __repr__(self):
+        """Represents the data slice as a string."""
+        info = "DataSliceArrays(rows={}, columns={})"
+        return info.format(self.num_rows, list(self._arrays))
+
+    @property
+    def index(self):
+        """The array view of the time index."""
+        return self._index[self.row_start : self.row_stop]
+
+    @property
+    def num_rows(self):
+        """The number of rows in the data slice."""
+        return self.row_stop - self.row_start
+
+    @property
+    def ctx(self):
+        """Alias for the data slice context."""
+        return self.context
+
+
 @pd.api.extensions.register_dataframe_accessor("slice")
 class DataSliceExtension:
     def __init__(self, df):
         self._df = df
 
-    def __call__(self, size=None, start=None, stop=None, step=None, drop_empty=True):
+    def __call__(
+        self,
+        size=None,
+        start=None,
+        stop=None,
+        step=None,
+        drop_empty=True,
+        check_index=True,
+    ):
         """Returns a data slice generator based on the data frame.
 
         Args:
@@ -84,15 +208,61 @@ class DataSliceExtension:
             stop (int or str): Where to stop generating data slices.
             step (int or str): The step size between data slices. The default value is the data slice size.
             drop_empty (bool): Whether to drop empty data slices. The default value is True.
+            check_index (bool): Whether to check for null or unsorted index values.
+                Can be disabled when the index was already checked. The default value is True.
 
         Returns:
             ds (generator): Returns a generator of data slices.
         """
-        self._check_index()
+        self._check_index(validate=check_index)
         offsets = self._check_offsets(size, start, stop, step)
         generator = self._apply(*offsets, drop_empty=drop_empty)
         return generator
 
+    def bounds(
+        self,
+        size=None,
+        start=None,
+        stop=None,
+        step=None,
+        drop_empty=True,
+        check_index=True,
+    ):
+        """Returns a generator of data slice boundaries based on the data frame.
+
+        The arguments are the same as calling the extension, but no data slices are created.
+
+        Returns:
+            bounds (generator): Returns a generator of tuples with the slice number, slice start,
+                slice stop, next start, and the positions of the first and last (exclusive) rows of the data slice.
+        """
+        self._check_index(validate=check_index)
+        offsets = self._check_offsets(size, start, stop, step)
+        generator = self._apply_bounds(*offsets, drop_empty=drop_empty)
+        return generator
+
+    def bound_columns(
+        self,
+        size=None,
+        start=None,
+        stop=None,
+        step=None,
+        drop_empty=True,
+        check_index=True,
+    ):
+        """Returns the data slice boundaries based on the data frame as columns.
+
+        The arguments are the same as calling the extension, but no data slices are created.
+        With fixed time offsets, the boundaries are calculated at once without creating a tuple for each data slice.
+
+        Returns:
+            columns (tuple): The slice numbers, slice starts, slice stops, next starts,
+                and the positions of the first and last (exclusive) rows of the data slices.
+        """
+        self._check_index(validate=check_index)
+        offsets = self._check_offsets(size, start, stop, step)
+        return self._apply_bound_columns(*offsets, drop_empty=drop_empty)
+
     def __getitem__(self, offset):
         """Generates data slices from a slice object."""
         if not isinstance(offset, slice):
@@ -101,81 +271,260 @@ class DataSliceExtension:
 
     def _apply(self, size, start, stop, step, drop_empty=True):
         """Generates data slices based on the data frame."""
-        df = self._apply_start(self._df, start, step)
-        if df.empty and drop_empty:
-            return df
+        df = DataSliceFrame(self._df)
+        bounds = self._apply_bounds(size, start, stop, step, drop_empty=drop_empty)
+
+        for slice_number, slice_start, slice_stop, next_start, i, j in bounds:
+            ds = df.iloc[i:j]
+            ds.context = DataSliceContext(
+                slice_number=slice_number,
+                slice_start=slice_start,
+                slice_stop=slice_stop,
+                next_start=next_start,
+            )
+            yield ds
+
+    def _apply_bounds(self, size, start, stop, step, drop_empty=True):
+        """Generates the boundaries of data slices based on the data frame.
+
+        The boundaries are calculated with a binary search on the sorted index,
+        so each data slice is a positional view of the data frame.
+
+        Returns:
+            bounds (generator): Returns a generator of tuples with the slice number, slice start,
+                slice stop, next start, and the positions of the first and last (exclusive) rows of the data slice.
+        """
+        i = self._apply_start(start, step)
+        size_of_df = len(self._df)
+        if i >= size_of_df and drop_empty:
+            return
 
-        df, slice_number = DataSliceFrame(df), 1
+        if self._is_bounds_fixed(size, start, stop, step):
+            bounds = self._apply_bounds_fixed(i, size, start, stop, step, drop_empty)
+            yield from zip(*bounds)
+            return
+
+        yield from self._iter_bounds(i, size, start, stop, step, drop_empty)
+
+    def _apply_bound_columns(self, size, start, stop, step, drop_empty=True):
+        """Calculates the boundaries of data slices based on the data frame as columns.
+
+        Returns:
+            columns (tuple): The slice numbers, slice starts, slice stops, next starts,
+                and the positions of the first and last (exclusive) rows of the data slices.
+        """
+        i = self._apply_start(start, step)
+        if i >= len(self._df) and drop_empty:
+            return tuple([] for _ in range(6))
+
+        if self._is_bounds_fixed(size, start, stop, step):
+            return self._get_bounds_fixed(i, size, start, stop, step, drop_empty)
+
+        bounds = self._iter_bounds(i, size, start, stop, step, drop_empty)
+        columns = tuple(map(list, zip(*bounds)))
+        return columns or tuple([] for _ in range(6))
+
+    def _iter_bounds(self, i, size, start, stop, step, drop_empty=True):
+        """Generates the boundaries of data slices one after the other from the position of the first row."""
+        size_of_df = len(self._df)
+        slice_number = 1
+        skip_empty = drop_empty and size._is_offset_fixed and step._is_offset_fixed
         while start.value and start.value <= stop.value:
-            if df.empty and drop_empty:
+            if i >= size_of_df and drop_empty:
                 break
-            ds = self._apply_size(df, start, size)
-            df = self._apply_step(df, start, step)
-            if ds.empty and drop_empty:
+            if skip_empty and self._is_empty(i, start, size):
+                i = self._skip_empty(i, start, size, step)
+                continue
+            slice_start = start.value
+            slice_stop, j = self._apply_size(i, start, size)
+            row_start, i = i, self._apply_step(i, start, step)
+            if j <= row_start and drop_empty:
                 continue
-            ds.context.next_start = start.value
-            ds.context.slice_number = slice_number
+            yield slice_number, slice_start, slice_stop, start.value, row_start, j
             slice_number += 1
-            yield ds
 
-    def _apply_size(self, df, start, size):
-        """Returns a data slice calculated by the offsets."""
+    def _is_bounds_fixed(self, size, start, stop, step):
+        """Whether the data slice boundaries can be calculated at once.
+
+        The size and step must be fixed amounts of time on a nanosecond time index,
+        and the start and stop must be timestamps in the time zone of the index.
+        """
+        fixed = size._is_offset_fixed and step._is_offset_fixed
+        fixed &= start._is_offset_timestamp and stop._is_offset_timestamp
+        fixed &= self._df.index.values.dtype == np.dtype("datetime64[ns]")
+        if not fixed:
+            return False
+
+        tz = str(self._df.index.tz)
+        if str(start.value.tz) != tz or str(stop.value.tz) != tz:
+            return False
+
+        try:
+            start.value.as_unit("ns"), stop.value.as_unit("ns")
+        except (OverflowError, ValueError):
+            return False
+
+        return True
+
+    def _apply_bounds_fixed(self, i, size, start, stop, step, drop_empty=True):
+        """Calculates the boundaries of all data slices at once with fixed time offsets.
+
+        Returns:
+            bounds (tuple(list)): The slice numbers, slice starts, slice stops,
+                next starts, and the positions of the first and last (exclusive) rows of the data slices.
+        """
+        columns = self._get_bounds_fixed(i, size, start, stop, step, drop_empty)
+        slice_number, slice_start, slice_stop, next_start, row_start, row_stop = columns
+        slice_start, slice_stop, next_start = map(list, columns[1:4])
+        row_start, row_stop = row_start.tolist(), row_stop.tolist()
+        return (
+            slice_number.tolist(),
+            slice_start,
+            slice_stop,
+            next_start,
+            row_start,
+            row_stop,
+        )
+
+    def _get_bounds_fixed(self, i, size, start, stop, step, drop_empty=True):
+        """Calculates the boundaries of all data slices at once with fixed time offsets as arrays.
+
+        The data slices start at multiples of the step from the first data slice.
+        When dropping empty data slices, only the strides that contain a row are calculated,
+        so sparse data does not create a stride for every empty data slice.
+
+        Returns:
+            bounds (tuple): The slice numbers, slice starts, slice stops, next starts (DatetimeIndex),
+                and the positions of the first and last (exclusive) rows of the data slices.
+        """
+        index = self._df.index.values.view("int64")
+        size, step = pd.Timedelta(size.value).value, pd.Timedelta(step.value).value
+        first, last = start.value.as_unit("ns").value, stop.value.as_unit("ns").value
+        num_strides = max((last - first) // step + 1, 0)
+
+        if drop_empty:
+            strides = self._get_strides(index[i:], first, size, step, num_strides)
+        else:
+            strides = np.arange(num_strides, dtype="int64")
+
+        starts = first + strides * step
+        row_start = np.maximum(index.searchsorted(starts, side="left"), i)
+        row_stop = index.searchsorted(starts + size, side="left")
+        row_stop = np.maximum(row_stop, row_start)
+
+        def to_timestamps(values):
+            values = pd.DatetimeIndex(values.view("datetime64[ns]"))
+            if start.value.tz is not None:
+                values = values.tz_localize("UTC").tz_convert(start.value.tz)
+            return values
+
+        slice_number = np.arange(1, len(strides) + 1, dtype="int64")
+        slice_start, slice_stop = to_timestamps(starts), to_timestamps(starts + size)
+        next_start = to_timestamps(starts + step)
+        row_start, row_stop = row_start.astype("int64"), row_stop.astype("int64")
+        return slice_number, slice_start, slice_stop, next_start, row_start, row_stop
+
+    def _get_strides(self, values, first, size, step, num_strides):
+        """Returns the strides from the first data slice to the data slices that contain a value.
+
+        Each value is contained by a range of strides. The ranges are sorted,
+        so overlapping ranges are merged with the range of the previous value.
+        """
+        upper = np.minimum((values - first) // step, num_strides - 1)
+        lower = np.maximum((values - first - size) // step + 1, 0)
+        lower[1:] = np.maximum(lower[1:], upper[:-1] + 1)
+        counts = np.maximum(upper - lower + 1, 0)
+        offsets = np.repeat(lower - (np.cumsum(counts) - counts), counts)
+        return np.arange(counts.sum(), dtype="int64") + offsets
+
+    def _apply_size(self, i, start, size):
+        """Returns where a data slice stops and the position after its last row."""
         if size._is_offset_position:
-            index = self._get_index(df, size.value)
+            j = i + size.value
+            index = self._get_index(self._df, j)
             stop = index or self._last_index
-            ds = df.iloc[: size.value]
+            j = min(j, len(self._df))
         else:
             stop = start.value + size.value
-            ds = df[:stop]
 
             # Pandas includes both endpoints when slicing by time.
             # This results in the right endpoint overlapping in consecutive data slices.
             # Resolved by making the right endpoint exclusive.
             # https://pandas.pydata.org/pandas-docs/version/0.19/gotchas.html#endpoints-are-inclusive
 
-            if not ds.empty:
-                overlap = ds.index == stop
-                if overlap.any():
-                    ds = ds[~overlap]
+            j = max(self._get_position(stop), i)
+
+        return stop, j
 
-        ds.context = DataSliceContext(slice_start=start.value, slice_stop=stop)
-        return ds
+    def _is_empty(self, i, start, size):
+        """Whether the data slice starting at the row position is empty."""
+        return self._df.index[i] >= start.value + size.value
 
-    def _apply_start(self, df, start, step):
-        """Removes data before the index calculated by the offset."""
-        inplace = start.value == self._first_index
+    def _skip_empty(self, i, start, size, step):
+        """Strides over empty data slices to the first data slice that contains the row position.
+
+        Every data slice that stops at or before the next row is empty,
+        so the number of strides is calculated in one step instead of one stride at a time.
+        """
+        size, step = pd.Timedelta(size.value), pd.Timedelta(step.value)
+        strides = (self._df.index[i] - size - start.value) // step + 1
+        start.value += strides * step
+        return max(self._get_position(start.value), i)
+
+    def _apply_start(self, start, step):
+        """Returns the position of the first row calculated by the offset."""
+        i, inplace = 0, start.value == self._first_index
         if start._is_offset_position and not inplace:
-            df = df.iloc[start.value :]
-            first_index = df.first_valid_index()
+            i = start.value
+            if i < 0:
+                i = max(len(self._df) + i, 0)
+            first_index = self._get_index(self._df, i)
             start.value = self._first_index = first_index
 
         if start._is_offset_timestamp and not inplace:
-            df = df[df.index >= start.value]
+            i = max(self._get_position(start.value), i)
             if step._is_offset_position:
-                first_index = df.first_valid_index()
+                first_index = self._get_index(self._df, i)
                 start.value = self._first_index = first_index
 
-        return df
+        return i
 
-    def _apply_step(self, df, start, step):
-        """Strides the first index by the offset."""
+    def _apply_step(self, i, start, step):
+        """Strides the first row by the offset and returns its position."""
         if step._is_offset_position:
-            df = df.iloc[step.value :]
-            first_index = df.first_valid_index()
-            start.value = first_index
+            i += step.value
+            start.value = self._get_index(self._df, i)
         else:
             start.value += step.value
-            df = df[start.value :]
+            i = max(self._get_position(start.value), i)
 
-        return df
+        return i
 
-    def _check_index(self):
+    def _check_index(self, validate=True):
         """Checks if index values are null or unsorted."""
-        null = self._df.index.isnull().any()
-        assert not null, "index contains null values"
-        assert self._is_sorted, "data frame must be sorted chronologically"
-        self._first_index = self._df.first_valid_index()
-        self._last_index = self._df.last_valid_index()
+        if validate:
+            null = self._df.index.isnull().any()
+            assert not null, "index contains null values"
+            assert self._is_sorted, "data frame must be sorted chronologically"
+
+        self._first_index = self._get_valid_index(0)
+        self._last_index = self._get_valid_index(-1)
+
+    def _get_valid_index(self, position):
+        """Returns the first or last index value of a row that is not all null.
+
+        The row at the position is checked first, so the rows of the data frame are only searched when it is all null.
+        """
+        df = self._df
+        if len(df):
+            values = (df.iat[position, k] for k in range(df.shape[1]))
+            if any(not pd.api.types.is_scalar(v) or pd.notna(v) for v in values):
+                return df.index[position]
+
+        if position == 0:
+            return df.first_valid_index()
+
+        return df.last_valid_index()
 
     def _check_offsets(self, size, start, stop, step):
         """Checks for valid data slice offsets."""
@@ -239,6 +588,17 @@ class DataSliceExtension:
         if i < df.index.size and df.index.size > 0:
             return df.index[i]
 
+    def _get_position(self, value):
+        """Helper function for getting the position of the first index value at or after a value."""
+        index = self._df.index
+        if index.size == 0 or value <= index[0]:
+            return 0
+
+        if value > index[-1]:
+            return index.size
+
+        return index.searchsorted(value, side="left")
+
     @property
     def _is_sorted(self):
         """Whether index values are sorted."""
@@ -1,4 +1,7 @@
+from copy import copy
+
 from composeml.data_slice.extension import DataSliceContext, DataSliceFrame
+from composeml.data_slice.offset import DataSliceOffset, DataSliceStep
 
 
 class DataSliceGenerator:
@@ -11,19 +14,42 @@ class DataSliceGenerator:
         min_data=None,
         max_data=None,
         drop_empty=True,
+        cache=None,
     ):
+        """Creates the data slice generator.
+
+        Args:
+            window_size (str or int): Size of the data slices or a column in the data frame to group by.
+            gap (str or int): Time between data slices.
+            min_data (str or int): Where to start the first data slice.
+            max_data (str or int): Where to stop generating data slices.
+            drop_empty (bool): Whether to drop empty data slices.
+            cache (dict): Parsed offsets keyed by the raw value.
+                Generators that share a cache parse the same value once. By default, each generator has its own cache.
+        """
         self.window_size = window_size
         self.gap = gap
         self.min_data = min_data
         self.max_data = max_data
         self.drop_empty = drop_empty
+        self._cache = {} if cache is None else cache
+        self._offsets = None
+
+    def __call__(self, df, check_index=True):
+        """Applies the data slice generator to the data frame.
+
+        Args:
+            df (DataFrame): Data frame to slice.
+            check_index (bool): Whether to check for null or unsorted index values when slicing by time.
+        """
+        if self._is_column(df):
+            return self._slice_by_column(df)
 
-    def __call__(self, df):
-        """Applies the data slice generator to the data frame."""
-        is_column = self.window_size in df
-        method = "column" if is_column else "time"
-        attr = f"_slice_by_{method}"
-        return getattr(self, attr)(df)
+        return self._slice_by_time(df, check_index=check_index)
+
+    def _is_column(self, df):
+        """Whether the window size is a column in the data frame."""
+        return self.window_size in df
 
     def _slice_by_column(self, df):
         """Slices the data frame by an existing column."""
@@ -37,20 +63,91 @@ class DataSliceGenerator:
                 slice_start=ds.first_valid_index(),
                 slice_stop=ds.last_valid_index(),
             )
-            setattr(ds.context, self.window_size, group)
+            ds.context._set_attribute(self.window_size, group)
             del ds.context.next_start
             slice_number += 1
             yield ds
 
-    def _slice_by_time(self, df):
+    def _get_offsets(self):
+        """Returns the parsed offsets for slicing a data frame along the time index.
+
+        The offsets are parsed once and copied for each data frame,
+        because the data slices update the values of the offsets.
+        """
+        if self._offsets is None:
+            self._offsets = {
+                "size": self._parse_offset(DataSliceStep, self.window_size),
+                "start": self._parse_offset(DataSliceOffset, self.min_data),
+                "stop": self._parse_offset(DataSliceOffset, self.max_data),
+                "step": self._parse_offset(DataSliceStep, self.gap),
+            }
+
+        return {key: copy(offset) for key, offset in self._offsets.items()}
+
+    def _parse_offset(self, offset_type, value):
+        """Parses the value of an offset once for the generators that share the cache."""
+        if not value or isinstance(value, DataSliceOffset):
+            return value
+
+        key = offset_type, type(value), value
+        try:
+            offset = self._cache.get(key)
+        except TypeError:
+            return offset_type(value)
+
+        if offset is None:
+            offset = self._cache[key] = offset_type(value)
+
+        return offset
+
+    def _slice_by_time(self, df, check_index=True):
         """Slices the data frame along the time index."""
         data_slices = df.slice(
-            size=self.window_size,
-            start=self.min_data,
-            stop=self.max_data,
-            step=self.gap,
+            **self._get_offsets(),
             drop_empty=self.drop_empty,
+            check_index=check_index,
         )
 
         for ds in data_slices:
             yield ds
+
+    def bounds(self, df, check_index=True):
+        """Calculates the boundaries of the data slices along the time index.
+
+        Args:
+            df (DataFrame): Data frame to slice.
+            check_index (bool): Whether to check for null or unsorted index values.
+
+        Returns:
+            bounds (generator): Returns a generator of data slice boundaries.
+        """
+        info = "data slice boundaries require a time-based window size"
+        assert not self._is_column(df), info
+
+        bounds = df.slice.bounds(
+            **self._get_offsets(),
+            drop_empty=self.drop_empty,
+            check_index=check_index,
+        )
+
+        return bounds
+
+    def bound_columns(self, df, check_index=True):
+        """Calculates the boundaries of the data slices along the time index as columns.
+
+        Args:
+            df (DataFrame): Data frame to slice.
+            check_index (bool): Whether to check for null or unsorted index values.
+
+        Returns:
+            columns (tuple): The slice numbers, slice starts, slice stops, next starts,
+                and the positions of the first and last (exclusive) rows of the data slices.
+        """
+        info = "data slice boundaries require a time-based window size"
+        assert not self._is_column(df), info
+
+        return df.slice.bound_columns(
+            **self._get_offsets(),
+            drop_empty=self.drop_empty,
+            check_index=check_index,
+        )
@@ -36,6 +36,13 @@ class DataSliceOffset:
         """Whether offset is a timestamp."""
         return isinstance(self.value, pd.Timestamp)
 
+    @property
+    def _is_offset_fixed(self):
+        """Whether offset is a timedelta or a fixed frequency."""
+        value = self._is_offset_timedelta
+        value |= isinstance(self.value, pd.tseries.offsets.Tick)
+        return value
+
     @property
     def _is_offset_frequency(self):
         """Whether offset is a base type or timedelta."""
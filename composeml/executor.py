@@ -0,0 +1,124 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from math import ceil
+
+
+def get_executor(executor="process", n_jobs=None):
+    """Gets the executor that runs a label search in parallel.
+
+    Args:
+        executor (str or Executor): The type of executor to create or an existing executor.
+            The supported types are "process" and "thread". An existing executor is used as is.
+        n_jobs (int): Number of workers. A value of -1 uses all processors.
+
+    Returns:
+        executor (Executor): The executor to submit work to.
+        owner (bool): Whether the executor was created and must be shut down by the caller.
+    """
+    if isinstance(executor, Executor):
+        return executor, False
+
+    executors = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+    info = 'executor must be "process", "thread" or an instance of Executor'
+    assert executor in executors, info
+    max_workers = get_n_jobs(n_jobs)
+    return executors[executor](max_workers=max_workers), True
+
+
+def get_n_jobs(n_jobs):
+    """Checks and formats the number of workers."""
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+
+    info = "n_jobs must be a positive integer or -1"
+    assert isinstance(n_jobs, int) and n_jobs > 0, info
+    return n_jobs
+
+
+def split_batches(items, n_jobs, batches_per_job=4):
+    """Splits items into contiguous batches that preserve the original order.
+
+    Args:
+        items (list): Items to split.
+        n_jobs (int): Number of workers processing the batches.
+        batches_per_job (int): Number of batches for each worker. More batches balance the load between workers.
+
+    Returns:
+        batches (list(list)): Contiguous batches of items.
+    """
+    batch_size = get_batch_size(len(items), n_jobs, batches_per_job)
+    return list(iter_batches(items, batch_size))
+
+
+def get_batch_size(n_items, n_jobs, batches_per_job=4, max_batch_size=None):
+    """Calculates the number of items in each batch.
+
+    Args:
+        n_items (int): Number of items to split.
+        n_jobs (int): Number of workers processing the batches.
+        batches_per_job (int): Number of batches for each worker. More batches balance the load between workers.
+        max_batch_size (int): Maximum number of items in each batch. By default, the batches have no maximum size.
+
+    Returns:
+        batch_size (int): The number of items in each batch.
+    """
+    n_batches = max(get_n_jobs(n_jobs) * batches_per_job, 1)
+    batch_size = max(ceil(n_items / n_batches), 1)
+    if max_batch_size is not None:
+        batch_size = min(batch_size, max_batch_size)
+
+    return batch_size
+
+
+def iter_batches(items, batch_size):
+    """Iterates contiguous batches of items that preserve the original order.
+
+    The items are consumed as the batches are iterated.
+
+    Args:
+        items (iterable): Items to split.
+        batch_size (int): Number of items in each batch.
+
+    Returns:
+        batches (generator): Returns a generator of contiguous batches of items.
+    """
+    items = iter(items)
+    batch = list(islice(items, batch_size))
+
+    while batch:
+        yield batch
+        batch = list(islice(items, batch_size))
+
+
+def iter_futures(items, submit, max_pending):
+    """Submits the items in order with a bounded number of pending futures.
+
+    The next item is submitted when the future of a previous item is requested,
+    so the results held at once are bounded by the number of pending futures.
+    Pending futures are cancelled or awaited when the generator is closed.
+
+    Args:
+        items (iterable): Items to submit.
+        submit (function): Submits an item to an executor and returns its future.
+        max_pending (int): Maximum number of futures that are submitted before their results are requested.
+
+    Returns:
+        futures (generator): Returns a generator of each item with its future in the order of the items.
+    """
+    pending = deque()
+
+    try:
+        for item in items:
+            pending.append((item, submit(item)))
+            if len(pending) >= max_pending:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+        wait([future for _, future in pending])
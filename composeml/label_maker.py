@@ -1,23 +1,61 @@
+import pickle
+from concurrent.futures import Executor, ThreadPoolExecutor
+from copy import copy
+from functools import partial
+from hashlib import sha256
+from itertools import chain
 from sys import stdout
 
-from pandas import Series
-from pandas.api.types import is_categorical_dtype
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, RangeIndex, Series, Timedelta, concat
+from pandas.util import hash_pandas_object
 from tqdm import tqdm
 
+from composeml.aggregation import WindowAggregation
+from composeml.batch_function import BatchLabelingFunction
+from composeml.checkpoint import SearchCheckpoint
 from composeml.data_slice import DataSliceGenerator
-from composeml.label_search import ExampleSearch, LabelSearch
+from composeml.data_slice.extension import (
+    DataSliceArrays,
+    DataSliceContext,
+    DataSliceFrame,
+)
+from composeml.data_slice.offset import DataSliceOffset, DataSliceStep
+from composeml.executor import (
+    get_batch_size,
+    get_executor,
+    get_n_jobs,
+    iter_batches,
+    iter_futures,
+)
+from composeml.label_search import ExampleSearch, LabelSearch, SearchQuota
 from composeml.label_times import LabelTimes
+from composeml.label_times.merge import _get_json_key
+from composeml.label_times.records import LabelRecords
+from composeml.prepared_data import PreparedData
+from composeml.scheduler import get_window_costs, split_tasks
+from composeml.shard import is_in_shard
+from composeml.shared_frame import SharedFrame, attach_frame
+from composeml.slice_plan import SlicePlan
+from composeml.target_groups import TargetGroups
 
 
 class LabelMaker:
     """Automatically makes labels for prediction problems."""
 
+    # the labels of a search are calculated in parts of bounded size
+    window_chunk_size = 100000
+    max_batch_size = 1000
+
     def __init__(
         self,
         target_dataframe_index,
         time_index,
         labeling_function=None,
         window_size=None,
+        slice_filter=None,
+        columns=None,
+        raw=False,
     ):
         """Creates an instance of label maker.
 
@@ -26,13 +64,46 @@ class LabelMaker:
             time_index (str): Name of time column in the data frame.
             labeling_function (function or list(function) or dict(str=function)): Function, list of functions, or dictionary of functions that transform a data slice.
                 When set as a dictionary, the key is used as the name of the labeling function.
+                A tuple of a column name and an aggregation (e.g. ``("amount", "sum")``) uses a built-in labeling function.
+                A function decorated with ``batch`` calculates the labels of many data slices in one call.
+                When all labeling functions are built-in or batch labeling functions, the labels for the data slices of all target groups are calculated at once.
             window_size (str or int): Size of the data slices. As a string, the value can be a timedelta or a column in the data frame to group by.
                 As an integer, the value can be the number of rows. Default value is all future data.
+            slice_filter (function): Function that returns whether a data slice is labeled. The filter runs before the labeling functions,
+                so the labeling functions only receive the data slices that pass the filter. A function decorated with ``batch``
+                returns whether each data slice passes the filter for many data slices in one call.
+                The number of data slices skipped by the filter is counted in the search statistics.
+            columns (list(str)): Names of the columns read by the labeling functions and slice filter.
+                The data frame is projected to these columns once before grouping, so the data slices only carry the columns that are used.
+                By default, the columns are declared by the labeling functions with ``uses_columns`` or built-in aggregations.
+                When a labeling function does not declare its columns, the data slices have all columns.
+            raw (bool): Whether labeling functions and the slice filter receive each data slice as a mapping of column names to NumPy array views
+                instead of a data frame, like ``DataFrame.apply(raw=True)``. The mapping has the time index as ``index`` and the data slice context as ``context``.
+                Built-in and batch labeling functions are not affected. Default value is False.
         """
         self.labeling_function = labeling_function or {}
         self.target_dataframe_index = target_dataframe_index
         self.time_index = time_index
         self.window_size = window_size
+        self.slice_filter = slice_filter
+        self.columns = columns
+        self.raw = raw
+        self.search_statistics = {}
+
+    @property
+    def slice_filter(self):
+        """Gets the slice filter."""
+        return self._slice_filter
+
+    @slice_filter.setter
+    def slice_filter(self, value):
+        """Sets the slice filter.
+
+        Args:
+            value (function): Function that returns whether a data slice is labeled.
+        """
+        assert value is None or callable(value), "slice filter must be callable"
+        self._slice_filter = value
 
     def _name_labeling_function(self, function):
         """Gets the names of the labeling functions."""
@@ -41,6 +112,9 @@ class LabelMaker:
 
     def _check_labeling_function(self, function, name=None):
         """Checks whether the labeling function is callable."""
+        if isinstance(function, tuple):
+            function = WindowAggregation(*function)
+
         assert callable(function), "labeling function must be callabe"
         return function
 
@@ -57,19 +131,18 @@ class LabelMaker:
             value (function or list(function) or dict(str=function)): Function that transforms a data slice to a label.
         """
         if isinstance(value, dict):
+            value = value.copy()
             for name, function in value.items():
-                self._check_labeling_function(function)
+                value[name] = self._check_labeling_function(function)
                 assert isinstance(name, str), "labeling function name must be string"
 
         if callable(value):
             value = [value]
 
         if isinstance(value, (tuple, list)):
+            value = map(self._check_labeling_function, value)
             value = {
-                self._name_labeling_function(function): self._check_labeling_function(
-                    function,
-                )
-                for function in value
+                self._name_labeling_function(function): function for function in value
             }
 
         assert isinstance(value, dict), "value type for labeling function not supported"
@@ -92,11 +165,15 @@ class LabelMaker:
         maximum_data=None,
         gap=None,
         drop_empty=True,
+        n_jobs=None,
+        executor="process",
+        shard_index=None,
+        num_shards=None,
     ):
         """Generates data slices of target dataframe.
 
         Args:
-            df (DataFrame): Data frame to create slices on.
+            df (DataFrame or PreparedData): Data frame to create slices on.
             num_examples_per_instance (int): Number of examples per unique instance of target dataframe.
             minimum_data (int or str or Series): The amount of data needed before starting the search. Defaults to the first value in the time index.
                 The value can be a datetime string to directly set the first cutoff time or a timedelta string to denote the amount of data needed before
@@ -106,38 +183,73 @@ class LabelMaker:
             gap (str or int): Time between examples. Default value is window size.
                 If an integer, search will start on the first event after the minimum data.
             drop_empty (bool): Whether to drop empty slices. Default value is True.
+            n_jobs (int): Number of workers that slice the target groups in parallel. A value of -1 uses all processors.
+                By default, the target groups are sliced serially unless an executor instance is provided.
+            executor (str or Executor): Slices batches of target groups in parallel. The values "process" and "thread" use a pool with ``n_jobs`` workers.
+                An instance of ``concurrent.futures.Executor`` is used as is. The data slices are generated in the order of the target groups.
+            shard_index (int): Position of the shard from zero. Only the target instances in the shard are sliced.
+                The target instances are assigned to shards by a stable hash of the target dataframe index (see ``is_in_shard``).
+            num_shards (int): Number of shards. Must be set with the shard index.
 
         Returns:
             ds (generator): Returns a generator of data slices.
         """
         self._check_example_count(num_examples_per_instance, gap)
-        df = self.set_index(df)
-        target_groups = df.groupby(self.target_dataframe_index)
+        df = self._get_shard(df, shard_index, num_shards)
         num_examples_per_instance = ExampleSearch._check_number(
             num_examples_per_instance,
         )
 
         minimum_data = self._check_cutoff_time(minimum_data)
-        minimum_data_varies = isinstance(minimum_data, dict)
+        target_groups = self._get_target_groups(df)
+        ngroups = target_groups.ngroups
+        target_groups = self._iter_target_groups(
+            target_groups,
+            minimum_data=minimum_data,
+            maximum_data=maximum_data,
+            gap=gap,
+            drop_empty=drop_empty,
+        )
 
-        for group_key, df in target_groups:
-            if minimum_data_varies:
-                if group_key not in minimum_data:
-                    continue
-                min_data_for_group = minimum_data[group_key]
-            else:
-                min_data_for_group = minimum_data
-
-            generator = DataSliceGenerator(
-                window_size=self.window_size,
-                min_data=min_data_for_group,
-                max_data=maximum_data,
-                drop_empty=drop_empty,
-                gap=gap,
-            )
+        slice_kwargs = {"num_examples_per_instance": num_examples_per_instance}
+
+        if n_jobs is None and not isinstance(executor, Executor):
+            yield from self._iter_slices(target_groups, **slice_kwargs)
+            return
+
+        # the batches are submitted as the data slices are generated like a parallel search
+        executor, owner = get_executor(executor, n_jobs)
+        batch_size = get_batch_size(ngroups, n_jobs, max_batch_size=self.max_batch_size)
+        batches = iter_batches(target_groups, batch_size)
+        submit = partial(executor.submit, self._slice_batch, **slice_kwargs)
+        futures = iter_futures(batches, submit, 2 * get_n_jobs(n_jobs))
+
+        try:
+            for _, future in futures:
+                yield from future.result()
+        finally:
+            futures.close()
+
+            if owner:
+                executor.shutdown()
+
+    def _slice_batch(self, batch, **kwargs):
+        """Calculates the data slices of a batch of target groups in a worker."""
+        return list(self._iter_slices(batch, **kwargs))
+
+    def _iter_slices(self, batch, num_examples_per_instance):
+        """Generates the data slices of a batch of target groups.
 
-            for ds in generator(df):
-                setattr(ds.context, self.target_dataframe_index, group_key)
+        Args:
+            batch (iterable(tuple)): The group key, data frame and data slice generator of each target group.
+            num_examples_per_instance (int): Number of examples per unique instance of target dataframe.
+
+        Returns:
+            ds (generator): Returns a generator of data slices.
+        """
+        for group_key, df, generator in batch:
+            for ds in generator(df, check_index=False):
+                ds.context._set_attribute(self.target_dataframe_index, group_key)
                 yield ds
 
                 if ds.context.slice_number >= num_examples_per_instance:
@@ -160,6 +272,574 @@ class LabelMaker:
                 not more_than_one
             ), "must specify gap if num_examples > 1 and window size = none"
 
+    def _search_group(self, group_key, df, generator, search, args, kwargs):
+        """Calculates the labels of a target group.
+
+        Args:
+            group_key: The value of the target dataframe index for the group.
+            df (DataFrame): Data frame of the target group.
+            generator (DataSliceGenerator): Generates the data slices of the group.
+            search (ExampleSearch or LabelSearch): The label search that keeps count of the labels.
+            args (tuple): Positional arguments for labeling function.
+            kwargs (dict): Keyword arguments for labeling function.
+
+        Returns:
+            records (generator): Returns a generator of label records.
+        """
+        slice_filter = self.slice_filter
+
+        for ds in generator(df, check_index=False):
+            ds.context._set_attribute(self.target_dataframe_index, group_key)
+
+            if self.raw and not isinstance(ds, DataSliceArrays):
+                ds = DataSliceArrays.from_frame(ds)
+
+            if slice_filter is not None and not slice_filter(ds):
+                search.update_filtered_count()
+                continue
+
+            items = self.labeling_function.items()
+            labels = {name: lf(ds, *args, **kwargs) for name, lf in items}
+            valid_labels = search.is_valid_labels(labels)
+            if not valid_labels:
+                continue
+
+            yield (group_key, ds.context.slice_start, *labels.values())
+
+            search.update_count(labels)
+            if search.is_complete:
+                break
+
+        search.reset_count()
+
+    def _search_batch(self, batch, num_examples_per_instance, args, kwargs):
+        """Calculates the labels of a batch of target groups in a worker.
+
+        Args:
+            batch (list(tuple)): The group key, data frame and data slice generator of each target group.
+            num_examples_per_instance (int or dict): The expected number of examples to return from each dataframe group.
+            args (tuple): Positional arguments for labeling function.
+            kwargs (dict): Keyword arguments for labeling function.
+
+        Returns:
+            records (list(tuple)): The label records of the batch in group order.
+            filtered_count (int): The number of data slices skipped by the slice filter.
+        """
+        search = self._get_search(num_examples_per_instance)
+        records = []
+
+        for group_key, df, generator in batch:
+            group = self._search_group(group_key, df, generator, search, args, kwargs)
+            records.extend(group)
+
+        return records, search.filtered_count
+
+    def _search_shared_batch(self, handle, batch, **search_kwargs):
+        """Calculates the labels of a batch of target groups from a data frame in shared memory.
+
+        Args:
+            handle (dict): The handle of the grouped data frame in shared memory.
+            batch (list(tuple)): The group key, positions of the first and after the last row, and data slice generator of each target group.
+            **search_kwargs: Keyword arguments for searching the batch.
+
+        Returns:
+            records (list(tuple)): The label records of the batch in group order.
+            filtered_count (int): The number of data slices skipped by the slice filter.
+        """
+        df = attach_frame(handle)
+        batch = [(key, df.iloc[i:j], generator) for key, i, j, generator in batch]
+        return self._search_batch(batch, **search_kwargs)
+
+    def _get_search(self, num_examples_per_instance, quota=None):
+        """Gets the label search based on the expected number of examples and the quota across target groups (if any)."""
+        is_label_search = isinstance(num_examples_per_instance, dict)
+        search = (LabelSearch if is_label_search else ExampleSearch)(
+            num_examples_per_instance,
+            quota=None if quota is None else SearchQuota(quota),
+        )
+        return search
+
+    def _get_target_groups(self, df):
+        """Groups the data frame by the target dataframe index and checks the time index once for all groups.
+
+        The data frame is projected to the columns used by the label maker before grouping.
+        The target groups of prepared data are reused.
+        """
+        if isinstance(df, PreparedData):
+            columns = self._get_columns(df.df)
+            data = df if columns is None else df.select_columns(columns)
+        else:
+            columns = self._get_columns(df)
+            data = self.prepare(df if columns is None else df[columns])
+
+        info = "prepared data must have the same target dataframe index and time index"
+        assert data.target_dataframe_index == self.target_dataframe_index, info
+        assert data.time_index == self.time_index, info
+
+        if self.window_size not in data.df:
+            data.check_index()
+
+        return data.target_groups
+
+    def _get_columns(self, df):
+        """Gets the columns of the data frame used by the label maker.
+
+        Returns None when all columns are used, so the data frame is not projected.
+        """
+        columns = self.columns
+        if columns is None:
+            functions = list(self.labeling_function.values())
+            if self.slice_filter is not None:
+                functions.append(self.slice_filter)
+
+            if not functions:
+                return None
+
+            columns = []
+            for function in functions:
+                names = getattr(function, "columns", None)
+                if names is None:
+                    return None
+
+                columns.extend(names)
+
+        missing = [column for column in columns if column not in df]
+        info = "columns are missing from the data frame: %s"
+        assert not missing, info % ", ".join(map(str, missing))
+
+        used = set(columns)
+        used.update([self.target_dataframe_index, self.time_index])
+        if isinstance(self.window_size, str):
+            used.add(self.window_size)
+
+        columns = [column for column in df.columns if column in used]
+        return None if len(columns) == len(df.columns) else columns
+
+    def _iter_generators(
+        self,
+        target_groups,
+        minimum_data,
+        maximum_data,
+        gap,
+        drop_empty,
+        order=None,
+    ):
+        """Iterates the position and key of the target groups with the data slice generator of each group.
+
+        The target groups are iterated in the order of their positions (if provided), otherwise in the order of the keys.
+        """
+        minimum_data_varies = isinstance(minimum_data, dict)
+        kwargs = {
+            "window_size": self.window_size,
+            "max_data": maximum_data,
+            "drop_empty": drop_empty,
+            "gap": gap,
+            "cache": {},
+        }
+
+        if not minimum_data_varies:
+            generator = DataSliceGenerator(min_data=minimum_data, **kwargs)
+
+        groups = enumerate(target_groups.keys)
+        if order is not None:
+            keys = target_groups.keys.tolist()
+            groups = ((i, keys[i]) for i in order)
+
+        for i, group_key in groups:
+            if minimum_data_varies:
+                if group_key not in minimum_data:
+                    continue
+                min_data_for_group = minimum_data[group_key]
+                generator = DataSliceGenerator(min_data=min_data_for_group, **kwargs)
+
+            yield i, group_key, generator
+
+    def _iter_target_groups(self, target_groups, **kwargs):
+        """Iterates the target groups with the data slice generator of each group."""
+        for i, group_key, generator in self._iter_generators(target_groups, **kwargs):
+            yield group_key, target_groups[i], generator
+
+    def _iter_group_rows(self, target_groups, **kwargs):
+        """Iterates the target groups with the positions of their rows and the data slice generator of each group."""
+        starts, stops = target_groups.starts, target_groups.stops
+        for i, group_key, generator in self._iter_generators(target_groups, **kwargs):
+            yield group_key, starts[i], stops[i], generator
+
+    def _iter_raw_groups(self, target_groups, **kwargs):
+        """Iterates the target groups with a generator of their data slices as views of the column arrays.
+
+        The columns are converted to arrays once for all target groups.
+        """
+        df = target_groups.df
+        arrays = {column: df[column].to_numpy() for column in df.columns}
+        index = df.index.to_numpy()
+
+        for i, group_key, generator in self._iter_generators(target_groups, **kwargs):
+            offset = target_groups.starts[i]
+            slices = partial(self._iter_raw_slices, generator, arrays, index, offset)
+            yield group_key, target_groups[i], slices
+
+    def _iter_raw_slices(self, generator, arrays, index, offset, df, check_index=True):
+        """Generates the data slices of a target group as views of the column arrays."""
+        bounds = generator.bounds(df, check_index=check_index)
+
+        for slice_number, slice_start, slice_stop, next_start, i, j in bounds:
+            ds = DataSliceArrays(arrays, index, offset + i, offset + j)
+            ds.context = DataSliceContext(
+                slice_number=slice_number,
+                slice_start=slice_start,
+                slice_stop=slice_stop,
+                next_start=next_start,
+            )
+            yield ds
+
+    def _get_windows(self, target_groups, **kwargs):
+        """Calculates the boundaries of the data slices of every target group without creating data slices.
+
+        Returns:
+            windows (dict): Columns with the target group position, slice number, slice start, slice stop, next start,
+                and the positions of the first and last (exclusive) rows of each data slice in the grouped data frame.
+        """
+        return next(self._iter_windows(target_groups, **kwargs))
+
+    def _iter_windows(self, target_groups, chunk_size=None, **kwargs):
+        """Iterates the boundaries of the data slices in chunks of whole target groups.
+
+        Args:
+            target_groups (TargetGroups): The target groups of the data frame.
+            chunk_size (int): Number of data slices after which a chunk ends at the next target group.
+                By default, the boundaries of all data slices are in one chunk.
+            **kwargs: Keyword arguments for the data slice generators.
+
+        Returns:
+            windows (generator): Returns a generator of the boundaries of the data slices in each chunk.
+        """
+        columns = ["group", "slice_number", "slice_start", "slice_stop", "next_start"]
+        columns += ["row_start", "row_stop"]
+        windows, count = {column: [] for column in columns}, 0
+
+        for i, _, generator in self._iter_generators(target_groups, **kwargs):
+            if chunk_size is not None and count >= chunk_size:
+                yield self._get_window_arrays(windows)
+                windows, count = {column: [] for column in columns}, 0
+
+            # the boundaries of each target group are calculated as columns
+            bounds = generator.bound_columns(target_groups[i], check_index=False)
+            n = len(bounds[0])
+            if not n:
+                continue
+
+            offset = target_groups.starts[i]
+            bounds = dict(zip(columns[1:], bounds))
+            bounds["group"] = np.full(n, i, dtype="int64")
+            bounds["row_start"] = np.add(bounds["row_start"], offset, dtype="int64")
+            bounds["row_stop"] = np.add(bounds["row_stop"], offset, dtype="int64")
+
+            for column in columns:
+                windows[column].append(bounds[column])
+
+            count += n
+
+        if chunk_size is None or count:
+            yield self._get_window_arrays(windows)
+
+    def _get_window_arrays(self, windows):
+        """Concatenates the columns of the boundaries of the data slices of each target group.
+
+        The integer columns are arrays. The time columns are a DatetimeIndex
+        when every target group has fixed time offsets, otherwise lists.
+        """
+        for column, values in windows.items():
+            if column in ["slice_start", "slice_stop", "next_start"]:
+                if values and all(isinstance(v, DatetimeIndex) for v in values):
+                    windows[column] = values[0].append(values[1:])
+                else:
+                    windows[column] = list(chain.from_iterable(values))
+            else:
+                values = np.concatenate(values) if values else []
+                windows[column] = np.asarray(values, dtype="int64")
+
+        return windows
+
+    def _is_vectorized(self, df):
+        """Whether built-in or batch labeling functions can calculate the labels of all data slices at once."""
+        if self.window_size in df:
+            return False
+
+        for function in self.labeling_function.values():
+            if isinstance(function, BatchLabelingFunction):
+                continue
+
+            if not isinstance(function, WindowAggregation):
+                return False
+
+            if not function.is_vectorized(df):
+                return False
+
+        return True
+
+    def _calculate_labels(self, df, keys, windows, args, kwargs):
+        """Calculates the labels of the data slices that pass the slice filter (if any) for each labeling function.
+
+        Built-in and batch labeling functions calculate the labels of all data slices at once.
+        Other labeling functions are called with one data slice at a time.
+        The labels of the data slices skipped by the slice filter are null.
+
+        Args:
+            df (DataFrame): Data frame that contains the rows of the data slices.
+            keys (Index): The keys of the target groups at the group positions of the data slices.
+            windows (dict): The boundaries of the data slices with row positions in the data frame.
+            args (tuple): Positional arguments for labeling function.
+            kwargs (dict): Keyword arguments for labeling function.
+
+        Returns:
+            passed (ndarray): Whether each data slice passes the slice filter.
+            labels (list(list)): The labels of the data slices for each labeling function.
+        """
+        passed = self._filter_windows(df, keys, windows)
+        if passed.all():
+            return passed, self._calculate_window_labels(
+                df, keys, windows, args, kwargs
+            )
+
+        positions = np.flatnonzero(passed)
+        windows = {
+            column: self._take(values, positions) for column, values in windows.items()
+        }
+        labels = self._calculate_window_labels(df, keys, windows, args, kwargs)
+        filled = []
+
+        for values in labels:
+            column = [None] * len(passed)
+            for position, value in zip(positions.tolist(), values):
+                column[position] = value
+
+            filled.append(column)
+
+        return passed, filled
+
+    def _filter_windows(self, df, keys, windows):
+        """Whether each data slice passes the slice filter.
+
+        A slice filter decorated with ``batch`` is evaluated for all data slices at once.
+        Null values do not pass the filter.
+        """
+        count = len(windows["row_start"])
+        if self.slice_filter is None:
+            return np.ones(count, dtype=bool)
+
+        if isinstance(self.slice_filter, BatchLabelingFunction):
+            table = self._get_window_table(keys, windows)
+            passed = self.slice_filter.calculate(df, table)
+        else:
+            data_slices = self._iter_window_slices(df, keys, windows)
+            passed = [self.slice_filter(ds) for ds in data_slices]
+
+        passed = Series(list(passed), dtype="boolean").fillna(False)
+        return passed.to_numpy(dtype=bool)
+
+    def _take(self, values, positions):
+        """Takes the values of the boundaries of the data slices at the positions."""
+        if isinstance(values, (np.ndarray, DatetimeIndex)):
+            return values[positions]
+
+        return [values[position] for position in positions]
+
+    def _calculate_window_labels(self, df, keys, windows, args, kwargs):
+        """Calculates the labels of the data slices for each labeling function."""
+        table, labels = None, {}
+
+        for name, function in self.labeling_function.items():
+            if isinstance(function, WindowAggregation) and function.is_vectorized(df):
+                row_start, row_stop = windows["row_start"], windows["row_stop"]
+                labels[name] = function.calculate(df, row_start, row_stop)
+
+            elif isinstance(function, BatchLabelingFunction):
+                if table is None:
+                    table = self._get_window_table(keys, windows)
+
+                labels[name] = function.calculate(df, table.copy(), *args, **kwargs)
+
+        functions = {
+            name: function
+            for name, function in self.labeling_function.items()
+            if name not in labels
+        }
+
+        if functions:
+            labels.update({name: [] for name in functions})
+            data_slices = self._iter_window_slices(df, keys, windows)
+
+            for ds in data_slices:
+                for name, function in functions.items():
+                    labels[name].append(function(ds, *args, **kwargs))
+
+        return [list(labels[name]) for name in self.labeling_function]
+
+    def _iter_window_slices(self, df, keys, windows):
+        """Generates the data slices at the boundaries of every target group.
+
+        In raw mode, the data slices are views of the column arrays instead of data frames.
+        """
+        keys = list(keys)
+        columns = ["group", "slice_number", "slice_start", "slice_stop", "next_start"]
+        columns += ["row_start", "row_stop"]
+        bounds = zip(*(windows[column] for column in columns))
+
+        if self.raw:
+            arrays = {column: df[column].to_numpy() for column in df.columns}
+            index = df.index.to_numpy()
+        else:
+            df = DataSliceFrame(df)
+
+        for group, slice_number, slice_start, slice_stop, next_start, i, j in bounds:
+            if self.raw:
+                ds = DataSliceArrays(arrays, index, i, j)
+            else:
+                ds = df.iloc[i:j]
+
+            ds.context = DataSliceContext(
+                slice_number=slice_number,
+                slice_start=slice_start,
+                slice_stop=slice_stop,
+                next_start=next_start,
+            )
+
+            ds.context._set_attribute(self.target_dataframe_index, keys[group])
+            yield ds
+
+    def _get_window_table(self, keys, windows):
+        """Creates the table of the data slices that is passed to batch labeling functions."""
+        keys = keys.take(windows["group"])
+        columns = ["slice_number", "slice_start", "slice_stop", "row_start", "row_stop"]
+        table = {self.target_dataframe_index: keys}
+        table.update({column: windows[column] for column in columns})
+
+        index = RangeIndex(len(keys), name="window_id")
+        table = DataFrame(table, index=index)
+        return table
+
+    def _search_windows(
+        self, target_groups, windows, search, progress_bar, args, kwargs
+    ):
+        """Searches the data slices of every target group with built-in or batch labeling functions.
+
+        The labels of the data slices in each chunk of boundaries are calculated at once.
+        Then, the labels are searched in order like the labels of a serial search.
+        The next chunk is only labeled when the search needs its labels.
+        """
+        df, keys = target_groups.df, target_groups.keys
+        if isinstance(search, LabelSearch) or search.quota is not None:
+            rows = self._iter_window_rows(df, keys, windows, args, kwargs)
+            yield from self._search_window_labels(keys, rows, search, progress_bar)
+            return
+
+        group_count = 0
+        for chunk in windows:
+            passed, labels = self._calculate_labels(df, keys, chunk, args, kwargs)
+            yield from self._search_chunk_labels(keys, chunk, passed, labels, search)
+
+            # the chunks end at a target group, so every target group of the chunk is searched
+            group_count += len(np.unique(chunk["group"]))
+            if search.is_finite:
+                n = group_count * search.expected_count - progress_bar.n
+            else:
+                n = group_count - progress_bar.n
+
+            progress_bar.update(n=n)
+
+    def _search_chunk_labels(self, keys, windows, passed, labels, search):
+        """Searches the labels of a chunk of data slices at once for the expected number of examples.
+
+        The data slices of each target group are next to each other, so the labels found before each data slice
+        are counted with a cumulative sum that restarts at each target group.
+        Only the labels before the expected number of examples is met are searched like a serial search.
+
+        Returns:
+            records (generator): Returns a generator of label records.
+        """
+        group = windows["group"]
+        valid = passed.copy()
+        for values in labels:
+            valid &= Series(values, dtype="object").notna().to_numpy()
+
+        first = np.ones(len(group), dtype=bool)
+        first[1:] = group[1:] != group[:-1]
+        found = np.cumsum(valid) - valid
+        found -= found[first][np.cumsum(first) - 1]
+        searched = found < search.expected_count
+
+        search.filtered_count += int(np.count_nonzero(~passed & searched))
+        positions = np.flatnonzero(valid & searched)
+        keys = keys.take(group[positions])
+        slice_start = self._take(windows["slice_start"], positions)
+        labels = [self._take(values, positions) for values in labels]
+        yield from zip(keys, slice_start, *labels)
+
+    def _iter_window_rows(self, df, keys, windows, args, kwargs):
+        """Iterates the group position, slice start, whether the slice filter passes and labels of the data slices in each chunk."""
+        for chunk in windows:
+            passed, labels = self._calculate_labels(df, keys, chunk, args, kwargs)
+            yield from zip(chunk["group"], chunk["slice_start"], passed, *labels)
+
+    def _search_window_labels(self, keys, rows, search, progress_bar):
+        """Searches the labels of the data slices in order like the labels of a serial search.
+
+        Args:
+            keys (Index): The keys of the target groups.
+            rows (iterable(tuple)): The group position, slice start, whether the slice filter passes and labels of each data slice in the order of the search.
+            search (ExampleSearch or LabelSearch): The label search that keeps count of the labels.
+            progress_bar (tqdm): The progress bar of the search.
+
+        Returns:
+            records (generator): Returns a generator of label records.
+        """
+        names, keys = list(self.labeling_function), list(keys)
+        group_count, previous = 0, None
+
+        for group, slice_start, passed, *values in rows:
+            if group != previous:
+                if previous is not None:
+                    group_count += 1
+                    self._update_progress(progress_bar, search, group_count)
+
+                search.reset_count()
+                previous = search.group = group
+
+                if search.is_exhausted:
+                    break
+
+            if search.is_complete:
+                continue
+
+            if not passed:
+                search.update_filtered_count()
+                continue
+
+            values = dict(zip(names, values))
+            if not search.is_valid_labels(values):
+                continue
+
+            yield (keys[group], slice_start, *values.values())
+
+            search.update_count(values)
+            if search.is_finite:
+                progress_bar.update(n=1)
+
+        search.reset_count()
+
+    def _update_progress(self, progress_bar, search, group_count):
+        """Updates the progress bar after searching a target group."""
+        # if finite search, update progress bar for missing examples
+        if search.is_finite:
+            progress_bar.update(
+                n=group_count * search.expected_count - progress_bar.n,
+            )
+        else:
+            progress_bar.update(
+                n=1,
+            )  # otherwise, update progress bar once for each group
+
     def search(
         self,
         df,
@@ -170,12 +850,26 @@ class LabelMaker:
         drop_empty=True,
         verbose=True,
         *args,
+        n_jobs=None,
+        executor="process",
+        shared_memory=False,
+        split_groups=False,
+        shard_index=None,
+        num_shards=None,
+        time_shard_index=None,
+        num_time_shards=None,
+        quota=None,
+        shuffle=False,
+        random_state=None,
+        sink=None,
+        checkpoint=None,
+        checkpoint_size=1000,
         **kwargs,
     ):
         """Searches the data to calculates labels.
 
         Args:
-            df (DataFrame): Data frame to search and extract labels.
+            df (DataFrame or PreparedData): Data frame to search and extract labels.
             num_examples_per_instance (int or dict): The expected number of examples to return from each dataframe group.
                 A dictionary can be used to further specify the expected number of examples to return from each label.
             minimum_data (int or str or Series): The amount of data needed before starting the search. Defaults to the first value in the time index.
@@ -188,119 +882,1365 @@ class LabelMaker:
             drop_empty (bool): Whether to drop empty slices. Default value is True.
             verbose (bool): Whether to render progress bar. Default value is True.
             *args: Positional arguments for labeling function.
+            n_jobs (int): Number of workers that search the target groups in parallel. A value of -1 uses all processors.
+                By default, the target groups are searched serially unless an executor instance is provided.
+            executor (str or Executor): Runs batches of target groups in parallel. The values "process" and "thread" use a pool with ``n_jobs`` workers.
+                An instance of ``concurrent.futures.Executor`` is used as is. Labeling functions must be picklable to run in other processes.
+                Threads avoid pickling the data and are faster when labeling functions release the GIL (e.g. NumPy reductions or I/O).
+            shared_memory (bool): Whether worker processes read the data from shared memory instead of receiving pickled data frames.
+                The data is published once and each batch of target groups is sent as the positions of their rows. Default value is False.
+            split_groups (bool): Whether to balance the parallel search by the estimated cost of the target groups. Default value is False.
+                The cost is estimated from the number of data slices and their rows. Target groups with a high cost are split into ranges of cutoff times
+                that are labeled by different workers, then the labels are searched in order like a serial search.
+                Since the labels of a target group are calculated before the search, data slices after the expected number of examples are also labeled.
+                Requires a time-based window size.
+            shard_index (int): Position of the shard from zero. Only the target instances in the shard are searched.
+                The target instances are assigned to shards by a stable hash of the target dataframe index (see ``is_in_shard``).
+            num_shards (int): Number of shards. Must be set with the shard index.
+            time_shard_index (int): Position of the time shard from zero. Only the cutoff times in the time shard are searched.
+                The cutoff times from the minimum data to the maximum data are split into ranges of the same length (see ``get_time_shard``).
+                The labels of every data slice in the range are returned, so the number of examples per instance is applied by ``merge_label_times``.
+                Requires a fixed window size and gap, timestamps for the minimum and maximum data, and dropping empty slices.
+            num_time_shards (int): Number of time shards. Must be set with the time shard index.
+            quota (int or dict): The number of examples to find across all target groups. The search stops visiting target groups when the quota is met.
+                A dictionary maps a label to the number of examples to find for the label, so labels that met their quota are no longer returned.
+                Requires a serial search. By default, there is no quota.
+            shuffle (bool): Whether to search the target groups in a random order, so the target groups searched before the quota is met are a random sample.
+                The labels are returned in the order that the target groups are searched. Default value is False.
+            random_state (int): Seed for the random order of the target groups.
+            sink (ParquetSink): Writes the labels to disk as they are calculated instead of returning them.
+                The labels are written in batches of ``sink.row_group_size`` labels, so the labels of all target groups are not held in memory at once.
+            checkpoint (str): Directory where the labels are saved after every ``checkpoint_size`` target groups.
+                When the directory has a checkpoint of the same search with the same data, the saved target groups are not searched again.
+                The search is identified by its settings, labeling function names and arguments, so arguments must have the same representation in every run.
+            checkpoint_size (int): Number of target groups searched between checkpoints. Default value is 1000.
             **kwargs: Keyword arguments for labeling function.
 
         Returns:
-            lt (LabelTimes): Calculated labels with cutoff times.
+            lt (LabelTimes or str): Calculated labels with cutoff times. When a sink is used, returns the path of the label times on disk.
+                After the search, ``search_statistics`` has the number of target groups, labels and data slices skipped by the slice filter.
         """
-        assert self.labeling_function, "missing labeling function(s)"
-        self._check_example_count(num_examples_per_instance, gap)
-        is_label_search = isinstance(num_examples_per_instance, dict)
-        search = (LabelSearch if is_label_search else ExampleSearch)(
-            num_examples_per_instance,
-        )
+        df = self._get_shard(df, shard_index, num_shards)
+        num_examples = num_examples_per_instance
+        search_kwargs = {
+            "minimum_data": minimum_data,
+            "maximum_data": maximum_data,
+            "gap": gap,
+            "drop_empty": drop_empty,
+            "verbose": verbose,
+            "args": args,
+            "kwargs": kwargs,
+            "n_jobs": n_jobs,
+            "executor": executor,
+            "shared_memory": shared_memory,
+            "split_groups": split_groups,
+            "quota": quota,
+            "shuffle": shuffle,
+            "random_state": random_state,
+        }
 
-        # check minimum data cutoff time
-        minimum_data = self._check_cutoff_time(minimum_data)
-        minimum_data_varies = isinstance(minimum_data, dict)
+        if time_shard_index is not None or num_time_shards is not None:
+            assert drop_empty, "time shards require dropping empty slices"
+            first, last, size = self._get_time_shard_cutoffs(
+                time_shard_index,
+                num_time_shards,
+                minimum_data,
+                maximum_data,
+                gap,
+            )
 
-        df = self.set_index(df)
-        total = search.expected_count if search.is_finite else 1
-        # If the target is categorical, make sure there are no unused categories
-        if is_categorical_dtype(df[self.target_dataframe_index]):
-            df[self.target_dataframe_index] = df[
-                self.target_dataframe_index
-            ].cat.remove_unused_categories()
-        target_groups = df.groupby(self.target_dataframe_index)
-        total *= target_groups.ngroups
+            data = self.set_index(df)
+            mask = (data.index >= first) & (data.index < last + size)
+            df = df.select(mask) if isinstance(df, PreparedData) else data[mask]
+            search_kwargs["minimum_data"] = first
+            search_kwargs["maximum_data"] = last
+            num_examples = -1
 
-        progress_bar = tqdm(
-            total=total,
-            file=stdout,
-            disable=not verbose,
-            bar_format=self._bar_format,
-        )
+        if checkpoint is None:
+            records = self._iter_records(df, num_examples, **search_kwargs)
+        else:
+            info = "global quotas and shuffling are not supported with checkpoints"
+            assert quota is None and not shuffle, info
 
-        records = []
-        for group_count, (group_key, df) in enumerate(target_groups, start=1):
-            if minimum_data_varies:
-                if group_key not in minimum_data:
-                    continue
-                min_data_for_group = minimum_data[group_key]
-            else:
-                min_data_for_group = minimum_data
-
-            generator = DataSliceGenerator(
-                window_size=self.window_size,
-                min_data=min_data_for_group,
-                max_data=maximum_data,
-                drop_empty=drop_empty,
-                gap=gap,
+            records = self._iter_checkpoint_records(
+                df,
+                num_examples,
+                checkpoint,
+                checkpoint_size,
+                **search_kwargs,
             )
 
-            for ds in generator(df):
-                setattr(ds.context, self.target_dataframe_index, group_key)
+        search_settings = self._get_search_settings(
+            num_examples_per_instance,
+            minimum_data=minimum_data,
+            maximum_data=maximum_data,
+            gap=gap,
+        )
 
-                items = self.labeling_function.items()
-                labels = {name: lf(ds, *args, **kwargs) for name, lf in items}
-                valid_labels = search.is_valid_labels(labels)
-                if not valid_labels:
-                    continue
+        if sink is not None:
+            label_times = self._iter_label_times(
+                records,
+                search_settings,
+                batch_size=sink.row_group_size,
+            )
 
-                records.append(
-                    {
-                        self.target_dataframe_index: group_key,
-                        "time": ds.context.slice_start,
-                        **labels,
-                    },
-                )
+            with sink:
+                for lt in label_times:
+                    sink.write(lt)
 
-                search.update_count(labels)
-                # if finite search, update progress bar for the example found
-                if search.is_finite:
-                    progress_bar.update(n=1)
-                if search.is_complete:
-                    break
+                # the settings are still written when the search finds no labels
+                sink.write(self._get_label_times([], search_settings))
 
-            # if finite search, update progress bar for missing examples
-            if search.is_finite:
-                progress_bar.update(
-                    n=group_count * search.expected_count - progress_bar.n,
-                )
-            else:
-                progress_bar.update(
-                    n=1,
-                )  # otherwise, update progress bar once for each group
-            search.reset_count()
+            return sink.path
 
-        total -= progress_bar.n
-        progress_bar.update(n=total)
-        progress_bar.close()
+        lt = self._get_label_times(records, search_settings)
+        return lt
 
-        lt = LabelTimes(
-            data=records,
-            target_columns=list(self.labeling_function),
-            target_dataframe_index=self.target_dataframe_index,
-            search_settings={
-                "num_examples_per_instance": num_examples_per_instance,
-                "minimum_data": minimum_data,
-                "maximum_data": str(maximum_data),
+    def search_iter(
+        self,
+        df,
+        num_examples_per_instance,
+        minimum_data=None,
+        maximum_data=None,
+        gap=None,
+        drop_empty=True,
+        verbose=True,
+        *args,
+        batch_size=100000,
+        n_jobs=None,
+        executor="process",
+        shared_memory=False,
+        split_groups=False,
+        shard_index=None,
+        num_shards=None,
+        quota=None,
+        shuffle=False,
+        random_state=None,
+        **kwargs,
+    ):
+        """Searches the data to calculate labels in batches.
+
+        The labels are returned in batches of label times as they are calculated,
+        so the labels of all target groups are not held in memory at once.
+
+        Args:
+            df (DataFrame or PreparedData): Data frame to search and extract labels.
+            num_examples_per_instance (int or dict): The expected number of examples to return from each dataframe group.
+                A dictionary can be used to further specify the expected number of examples to return from each label.
+            minimum_data (int or str or Series): The amount of data needed before starting the search. Defaults to the first value in the time index.
+                The value can be a datetime string to directly set the first cutoff time or a timedelta string to denote the amount of data needed before
+                the first cutoff time. The value can also be an integer to denote the number of rows needed before the first cutoff time.
+                If a Series, minimum_data should be datetime string, timedelta string, or integer values with a unique set of target groups as the corresponding index.
+            maximum_data (str): Maximum data before stopping the search. Defaults to the last value in the time index.
+            gap (str or int): Time between examples. Default value is window size.
+                If an integer, search will start on the first event after the minimum data.
+            drop_empty (bool): Whether to drop empty slices. Default value is True.
+            verbose (bool): Whether to render progress bar. Default value is True.
+            *args: Positional arguments for labeling function.
+            batch_size (int): Maximum number of labels in each batch. Default value is 100000.
+            n_jobs (int): Number of workers that search the target groups in parallel. A value of -1 uses all processors.
+                By default, the target groups are searched serially unless an executor instance is provided.
+            executor (str or Executor): Runs batches of target groups in parallel. The values "process" and "thread" use a pool with ``n_jobs`` workers.
+                An instance of ``concurrent.futures.Executor`` is used as is. Labeling functions must be picklable to run in other processes.
+                Threads avoid pickling the data and are faster when labeling functions release the GIL (e.g. NumPy reductions or I/O).
+            shared_memory (bool): Whether worker processes read the data from shared memory instead of receiving pickled data frames.
+                The data is published once and each batch of target groups is sent as the positions of their rows. Default value is False.
+            split_groups (bool): Whether to balance the parallel search by the estimated cost of the target groups. Default value is False.
+                The cost is estimated from the number of data slices and their rows. Target groups with a high cost are split into ranges of cutoff times
+                that are labeled by different workers, then the labels are searched in order like a serial search.
+                Since the labels of a target group are calculated before the search, data slices after the expected number of examples are also labeled.
+                Requires a time-based window size.
+            shard_index (int): Position of the shard from zero. Only the target instances in the shard are searched.
+                The target instances are assigned to shards by a stable hash of the target dataframe index (see ``is_in_shard``).
+            num_shards (int): Number of shards. Must be set with the shard index.
+            quota (int or dict): The number of examples to find across all target groups. The search stops visiting target groups when the quota is met.
+                A dictionary maps a label to the number of examples to find for the label, so labels that met their quota are no longer returned.
+                Requires a serial search. By default, there is no quota.
+            shuffle (bool): Whether to search the target groups in a random order, so the target groups searched before the quota is met are a random sample.
+                The labels are returned in the order that the target groups are searched. Default value is False.
+            random_state (int): Seed for the random order of the target groups.
+            **kwargs: Keyword arguments for labeling function.
+
+        Returns:
+            lt (generator): Returns a generator of label times with calculated labels and cutoff times.
+        """
+        info = "batch size must be a positive integer"
+        assert isinstance(batch_size, int) and batch_size > 0, info
+
+        records = self._iter_records(
+            self._get_shard(df, shard_index, num_shards),
+            num_examples_per_instance,
+            minimum_data=minimum_data,
+            maximum_data=maximum_data,
+            gap=gap,
+            drop_empty=drop_empty,
+            verbose=verbose,
+            args=args,
+            kwargs=kwargs,
+            n_jobs=n_jobs,
+            executor=executor,
+            shared_memory=shared_memory,
+            split_groups=split_groups,
+            quota=quota,
+            shuffle=shuffle,
+            random_state=random_state,
+        )
+
+        search_settings = self._get_search_settings(
+            num_examples_per_instance,
+            minimum_data=minimum_data,
+            maximum_data=maximum_data,
+            gap=gap,
+        )
+
+        return self._iter_label_times(records, search_settings, batch_size)
+
+    def _iter_label_times(self, records, search_settings, batch_size):
+        """Creates label times from batches of the label records of a search."""
+        batch = self._get_label_records()
+        for record in records:
+            batch.append(record)
+
+            if len(batch) == batch_size:
+                yield self._get_label_times(batch, search_settings)
+                batch = self._get_label_records()
+
+        if len(batch):
+            yield self._get_label_times(batch, search_settings)
+
+    def sweep(
+        self,
+        df,
+        configs,
+        num_examples_per_instance=-1,
+        minimum_data=None,
+        maximum_data=None,
+        gap=None,
+        drop_empty=True,
+        verbose=True,
+        *args,
+        **kwargs,
+    ):
+        """Searches the data with many configurations in a single pass over the target groups.
+
+        The data frame is prepared and grouped once. Then, the data slices of every configuration are labeled
+        for one target group before the next, so the data of the target group is reused by the configurations.
+        The labels of each configuration match a search with the settings of the configuration.
+
+        Args:
+            df (DataFrame or PreparedData): Data frame to search and extract labels.
+            configs (list(dict) or dict(dict)): The settings of each search. The supported settings are ``window_size``, ``num_examples_per_instance``,
+                ``minimum_data``, ``maximum_data``, ``gap`` and ``drop_empty``. Missing settings use the window size of the label maker
+                and the values of the other arguments. When set as a dictionary, the key is used as the name of the configuration.
+            num_examples_per_instance (int or dict): The expected number of examples to return from each dataframe group. Default value is all examples.
+            minimum_data (int or str or Series): The amount of data needed before starting the search. Defaults to the first value in the time index.
+            maximum_data (str): Maximum data before stopping the search. Defaults to the last value in the time index.
+            gap (str or int): Time between examples. Default value is window size.
+            drop_empty (bool): Whether to drop empty slices. Default value is True.
+            verbose (bool): Whether to render progress bar. Default value is True.
+            *args: Positional arguments for labeling function.
+            **kwargs: Keyword arguments for labeling function.
+
+        Returns:
+            labels (dict(LabelTimes)): Calculated labels with cutoff times for each configuration. The labels are keyed by the name of the configuration
+                or, when the configurations are a list, by the position of the configuration in the list.
+        """
+        assert self.labeling_function, "missing labeling function(s)"
+        if not isinstance(configs, dict):
+            configs = dict(enumerate(configs))
+
+        defaults = {
+            "window_size": self.window_size,
+            "num_examples_per_instance": num_examples_per_instance,
+            "minimum_data": minimum_data,
+            "maximum_data": maximum_data,
+            "gap": gap,
+            "drop_empty": drop_empty,
+        }
+
+        data = self.prepare(df)
+        searches = []
+
+        for name, config in configs.items():
+            info = "configuration has unknown settings: %s"
+            unknown = sorted(set(config) - set(defaults))
+            assert not unknown, info % ", ".join(map(str, unknown))
+            searches.append((name, *self._get_sweep(data, {**defaults, **config})))
+
+        target_groups = data.target_groups
+        progress_bar = tqdm(
+            total=target_groups.ngroups,
+            file=stdout,
+            disable=not verbose,
+            bar_format=self._bar_format,
+        )
+
+        for i, (group_key, group) in enumerate(target_groups):
+            for _, lm, generators, search, records, _ in searches:
+                if i in generators:
+                    group_records = lm._search_group(
+                        group_key,
+                        group,
+                        generators[i],
+                        search,
+                        args,
+                        kwargs,
+                    )
+                    records.extend(group_records)
+
+            progress_bar.update(n=1)
+
+        progress_bar.close()
+        return {
+            name: self._get_label_times(records, search_settings)
+            for name, _, _, _, records, search_settings in searches
+        }
+
+    def _get_sweep(self, data, config):
+        """Gets the label maker, data slice generators, label search, label records and search settings of a configuration in a sweep."""
+        lm = copy(self)
+        lm.window_size = config.pop("window_size")
+        num_examples_per_instance = config.pop("num_examples_per_instance")
+        lm._check_example_count(num_examples_per_instance, config["gap"])
+        config["minimum_data"] = lm._check_cutoff_time(config["minimum_data"])
+
+        target_groups = lm._get_target_groups(data)
+        generators = lm._iter_generators(target_groups, **config)
+        generators = {i: generator for i, _, generator in generators}
+
+        search_settings = lm._get_search_settings(
+            num_examples_per_instance,
+            minimum_data=config["minimum_data"],
+            maximum_data=config["maximum_data"],
+            gap=config["gap"],
+        )
+
+        search = lm._get_search(num_examples_per_instance)
+        return lm, generators, search, lm._get_label_records(), search_settings
+
+    def update(
+        self,
+        df,
+        lt,
+        drop_empty=True,
+        verbose=True,
+        *args,
+        n_jobs=None,
+        executor="process",
+        **kwargs,
+    ):
+        """Updates the labels of a previous search with new data.
+
+        The search settings of the label times are reused. The last cutoff time of each target group is its watermark.
+        Only the data slices that end after the watermark are calculated, which includes the trailing data slices
+        that could be incomplete in the previous search and the data slices of the new data. The labels before these data slices are kept.
+        Then, the number of examples per instance is applied to the labels again.
+
+        The data frame must contain the rows of each target group from the start of the data slices that end after the watermark.
+        Earlier rows are not used, so the cost of an update depends on the new data. Target groups without labels,
+        or with data slices that end after the watermark from their first cutoff time, are searched from the start and use all of their rows.
+        The window size and gap must be fixed amounts of time.
+
+        Args:
+            df (DataFrame or PreparedData): Data frame to search and extract labels.
+            lt (LabelTimes): Label times from a previous search with the same labeling functions and window size.
+            drop_empty (bool): Whether to drop empty slices. Default value is True.
+            verbose (bool): Whether to render progress bar. Default value is True.
+            *args: Positional arguments for labeling function.
+            n_jobs (int): Number of workers that search the target groups in parallel. A value of -1 uses all processors.
+                By default, the target groups are searched serially unless an executor instance is provided.
+            executor (str or Executor): Runs batches of target groups in parallel. The values "process" and "thread" use a pool with ``n_jobs`` workers.
+                An instance of ``concurrent.futures.Executor`` is used as is. Labeling functions must be picklable to run in other processes.
+            **kwargs: Keyword arguments for labeling function.
+
+        Returns:
+            lt (LabelTimes): Calculated labels with cutoff times.
+        """
+        settings = lt.search_settings
+        info = "window size of label times does not match the label maker"
+        assert settings.get("window_size") == str(self.window_size), info
+        assert not lt.transforms, "label times with transforms cannot be updated"
+
+        num_examples_per_instance = settings["num_examples_per_instance"]
+        is_label_search = isinstance(num_examples_per_instance, dict)
+        if is_label_search:
+            # the labels are compared like the keys of the settings saved in json format
+            items = num_examples_per_instance.items()
+            num_examples_per_instance = {
+                _get_json_key(label): count for label, count in items
+            }
+
+        data = self.set_index(df)
+        index = self.target_dataframe_index
+        keys = data[index].dropna().unique()
+        minimum_data = self._get_minimum_data(settings["minimum_data"], keys)
+        maximum_data = self._parse_search_setting(settings["maximum_data"])
+        gap = self._parse_search_setting(settings["gap"])
+
+        size = DataSliceStep(self.window_size)
+        step = DataSliceStep(gap or self.window_size)
+        info = "updating labels requires a fixed time-based window size and gap"
+        assert size._is_offset_fixed and step._is_offset_fixed, info
+
+        if maximum_data is not None:
+            info = "updating labels requires maximum data to be a timestamp"
+            assert DataSliceOffset(maximum_data)._is_offset_timestamp, info
+
+            # empty data slices after the previous data would be kept as labels
+            info = "updating labels with maximum data requires dropping empty slices"
+            assert drop_empty, info
+
+        search = self._get_search(num_examples_per_instance)
+        if lt.empty:
+            labels = self.search(
+                df,
+                -1 if is_label_search else num_examples_per_instance,
+                minimum_data,
+                maximum_data,
+                gap,
+                drop_empty,
+                verbose,
+                *args,
+                n_jobs=n_jobs,
+                executor=executor,
+                **kwargs,
+            )
+
+            if not is_label_search:
+                return labels
+
+            if not labels.empty:
+                labels = labels[self._search_labels(labels, {}, search)]
+
+            return LabelTimes(
+                data=DataFrame(labels) if not labels.empty else None,
+                target_columns=list(self.labeling_function),
+                target_dataframe_index=index,
+                search_settings=settings,
+            )
+
+        info = "labeling functions of label times do not match the label maker"
+        assert lt.target_columns == list(self.labeling_function), info
+
+        df = data
+        restarts = self._get_restarts(lt, size.value, step.value)
+        restarts = restarts[restarts.index.isin(keys)]
+        is_kept = lt.time.array < restarts.reindex(lt[index].to_numpy()).array
+
+        # the kept labels count towards the number of examples per instance
+        is_filtered = isinstance(search, LabelSearch) or search.is_finite
+        previous = self._group_labels(lt[is_kept], search) if is_filtered else {}
+        complete = [key for key in previous if self._is_complete(search, previous[key])]
+        restarts = restarts.drop(complete)
+        is_kept |= lt[index].isin(complete) | ~lt[index].isin(keys)
+        complete = set(complete)
+
+        cutoff_times = restarts.to_dict()
+        for key in keys:
+            if key in cutoff_times or key in complete:
+                continue
+
+            if not isinstance(minimum_data, dict):
+                cutoff_times[key] = minimum_data
+            elif key in minimum_data:
+                cutoff_times[key] = minimum_data[key]
+
+        restarts = restarts.reindex(df[index].to_numpy()).array
+        records = self._iter_records(
+            df[~(df.index < restarts)],
+            -1,
+            minimum_data=cutoff_times,
+            maximum_data=maximum_data,
+            gap=gap,
+            drop_empty=drop_empty,
+            verbose=verbose,
+            args=args,
+            kwargs=kwargs,
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+
+        labels = self._get_label_times(records, settings)
+        if is_filtered and not labels.empty:
+            labels = labels[self._search_labels(labels, previous, search)]
+
+        data = None
+        frames = [
+            DataFrame(frame) for frame in (lt[is_kept], labels) if not frame.empty
+        ]
+        if frames:
+            data = concat(frames).sort_values([index, "time"], kind="stable")
+            data = data.reset_index(drop=True)
+
+        lt = LabelTimes(
+            data=data,
+            target_columns=list(self.labeling_function),
+            target_dataframe_index=index,
+            search_settings=settings,
+        )
+
+        return lt
+
+    def _parse_search_setting(self, value):
+        """Parses a search setting that was saved as a string."""
+        if value == "None":
+            return None
+
+        if isinstance(value, str) and value.lstrip("-").isdigit():
+            return int(value)
+
+        return value
+
+    def _get_restarts(self, lt, size, step):
+        """Returns the start of the first data slice that ends after the last cutoff time of each target group.
+
+        The data slices start at multiples of the step from the last cutoff time.
+        Target groups are excluded when the start is not after their first cutoff time,
+        since the first data slice can depend on how the minimum data is set.
+        """
+        size, step = Timedelta(size), Timedelta(step)
+        overlap = (size - Timedelta(1, "ns")) // step
+
+        times = lt.time.groupby(lt[self.target_dataframe_index].to_numpy())
+        first, last = times.min(), times.max()
+        restarts = last - step * overlap
+        return restarts[restarts > first]
+
+    def _group_labels(self, lt, search):
+        """Returns the labels of each target group in label times."""
+        names = list(self.labeling_function)
+        groups = {}
+
+        for key, *values in zip(lt[self.target_dataframe_index], *lt[names].values.T):
+            groups.setdefault(key, []).append(
+                self._get_search_labels(names, values, search)
+            )
+
+        return groups
+
+    def _get_search_labels(self, names, values, search):
+        """Returns the labels by name, which are compared like the keys of the settings saved in json format for a label search."""
+        if isinstance(search, LabelSearch):
+            values = map(_get_json_key, values)
+
+        return dict(zip(names, values))
+
+    def _get_minimum_data(self, minimum_data, keys):
+        """Returns the minimum data of the search settings with the keys of the target groups.
+
+        The keys of the minimum data for each target group are strings when the settings were saved in json format.
+        """
+        minimum_data = self._check_cutoff_time(minimum_data)
+        if not isinstance(minimum_data, dict):
+            return minimum_data
+
+        keys = {_get_json_key(key): key for key in keys}
+        items = minimum_data.items()
+        return {keys.get(_get_json_key(key), key): value for key, value in items}
+
+    def _is_complete(self, search, labels):
+        """Whether the labels of a target group complete the search."""
+        search.reset_count()
+        for values in labels:
+            search.update_count(values)
+
+        is_complete = search.is_complete
+        search.reset_count()
+        return is_complete
+
+    def _search_labels(self, lt, previous, search):
+        """Applies the search to the labels of each target group after the previous labels.
+
+        Returns:
+            is_valid (list(bool)): Whether each label is found by the search.
+        """
+        names = list(self.labeling_function)
+        is_valid, current = [], None
+
+        for key, *values in zip(lt[self.target_dataframe_index], *lt[names].values.T):
+            if key != current:
+                search.reset_count()
+                for labels in previous.get(key, []):
+                    search.update_count(labels)
+                current = key
+
+            labels = self._get_search_labels(names, values, search)
+            valid = not search.is_complete and search.is_valid_labels(labels)
+            if valid:
+                search.update_count(labels)
+            is_valid.append(valid)
+
+        search.reset_count()
+        return is_valid
+
+    def _iter_records(
+        self,
+        df,
+        num_examples_per_instance,
+        minimum_data,
+        maximum_data,
+        gap,
+        drop_empty,
+        verbose,
+        args,
+        kwargs,
+        n_jobs,
+        executor,
+        shared_memory=False,
+        split_groups=False,
+        quota=None,
+        shuffle=False,
+        random_state=None,
+    ):
+        """Searches the data and generates the label records in the order of the target groups."""
+        assert self.labeling_function, "missing labeling function(s)"
+        self._check_example_count(num_examples_per_instance, gap)
+        search = self._get_search(num_examples_per_instance, quota)
+        parallel = n_jobs is not None or isinstance(executor, Executor)
+        assert quota is None or not parallel, "global quotas require a serial search"
+
+        # check minimum data cutoff time
+        minimum_data = self._check_cutoff_time(minimum_data)
+
+        target_groups = self._get_target_groups(df)
+        df = target_groups.df
+        total = search.expected_count if search.is_finite else 1
+        total *= target_groups.ngroups
+        statistics = {
+            "target_groups": target_groups.ngroups,
+            "labels": 0,
+            "filtered_slices": 0,
+        }
+
+        progress_bar = tqdm(
+            total=total,
+            file=stdout,
+            disable=not verbose,
+            bar_format=self._bar_format,
+        )
+
+        group_kwargs = {
+            "minimum_data": minimum_data,
+            "maximum_data": maximum_data,
+            "gap": gap,
+            "drop_empty": drop_empty,
+        }
+
+        if shuffle:
+            state = np.random.RandomState(random_state)
+            group_kwargs["order"] = state.permutation(target_groups.ngroups)
+
+        search_kwargs = {
+            "num_examples_per_instance": num_examples_per_instance,
+            "args": args,
+            "kwargs": kwargs,
+        }
+
+        chunk_size = self.window_chunk_size
+        if not parallel and self._is_vectorized(df):
+            windows = self._iter_windows(target_groups, chunk_size, **group_kwargs)
+            records = self._search_windows(
+                target_groups,
+                windows,
+                search,
+                progress_bar,
+                args=args,
+                kwargs=kwargs,
+            )
+        elif parallel and split_groups:
+            info = "splitting target groups requires a time-based window size"
+            assert self.window_size not in df, info
+
+            windows = self._iter_windows(target_groups, chunk_size, **group_kwargs)
+            records = self._search_split(
+                target_groups,
+                windows,
+                search,
+                progress_bar,
+                n_jobs=n_jobs,
+                executor=executor,
+                shared_memory=shared_memory,
+                args=args,
+                kwargs=kwargs,
+            )
+        elif parallel and shared_memory and not self._is_thread_executor(executor):
+            records = self._search_parallel(
+                self._iter_group_rows(target_groups, **group_kwargs),
+                search,
+                progress_bar,
+                n_jobs=n_jobs,
+                executor=executor,
+                ngroups=target_groups.ngroups,
+                df=target_groups.df,
+                **search_kwargs,
+            )
+        else:
+            ngroups = target_groups.ngroups
+            if not parallel and self.raw and self.window_size not in df:
+                target_groups = self._iter_raw_groups(target_groups, **group_kwargs)
+            else:
+                target_groups = self._iter_target_groups(target_groups, **group_kwargs)
+
+            method = "_search_parallel" if parallel else "_search_serial"
+            records = getattr(self, method)(
+                target_groups,
+                search,
+                progress_bar,
+                n_jobs=n_jobs,
+                executor=executor,
+                ngroups=ngroups,
+                **search_kwargs,
+            )
+
+        try:
+            for record in records:
+                statistics["labels"] += 1
+                yield record
+
+            total -= progress_bar.n
+            progress_bar.update(n=total)
+        finally:
+            records.close()
+            progress_bar.close()
+            statistics["filtered_slices"] = search.filtered_count
+            self.search_statistics = statistics
+
+    def _iter_checkpoint_records(
+        self,
+        df,
+        num_examples_per_instance,
+        checkpoint,
+        checkpoint_size,
+        verbose,
+        n_jobs,
+        executor,
+        **search_kwargs,
+    ):
+        """Searches chunks of target groups and saves the label records of each chunk to a checkpoint.
+
+        The records of the target groups in the checkpoint are read instead of searched again.
+        Each chunk is searched like the whole data frame, so the records match a search without a checkpoint.
+        """
+        info = "checkpoint size must be a positive integer"
+        assert isinstance(checkpoint_size, int) and checkpoint_size > 0, info
+
+        target_groups = self._get_target_groups(df)
+        minimum_data = self._check_cutoff_time(search_kwargs["minimum_data"])
+        search_kwargs["minimum_data"] = minimum_data
+        key = self._get_checkpoint_key(
+            target_groups.df,
+            num_examples_per_instance,
+            search_kwargs,
+        )
+        checkpoint = SearchCheckpoint(checkpoint, key)
+        checkpoint.load()
+
+        search = self._get_search(num_examples_per_instance)
+        unit = search.expected_count if search.is_finite else 1
+        ngroups = target_groups.ngroups
+
+        progress_bar = tqdm(
+            total=unit * ngroups,
+            initial=unit * checkpoint.groups,
+            file=stdout,
+            disable=not verbose,
+            bar_format=self._bar_format,
+        )
+
+        # a pool is created once for all chunks
+        owner = False
+        if n_jobs is not None or isinstance(executor, Executor):
+            executor, owner = get_executor(executor, n_jobs)
+
+        statistics = {"target_groups": ngroups, "labels": 0, "filtered_slices": 0}
+
+        try:
+            for record in checkpoint.read():
+                statistics["labels"] += 1
+                yield record
+
+            for start in range(checkpoint.groups, ngroups, checkpoint_size):
+                stop = min(start + checkpoint_size, ngroups)
+                rows = slice(target_groups.starts[start], target_groups.stops[stop - 1])
+                records = self._iter_records(
+                    target_groups.df.iloc[rows],
+                    num_examples_per_instance,
+                    verbose=False,
+                    n_jobs=n_jobs,
+                    executor=executor,
+                    **search_kwargs,
+                )
+
+                records = list(records)
+                statistics["labels"] += len(records)
+                statistics["filtered_slices"] += self.search_statistics[
+                    "filtered_slices"
+                ]
+                checkpoint.save(records, stop)
+                progress_bar.update(n=unit * (stop - start))
+                yield from records
+        finally:
+            progress_bar.close()
+            self.search_statistics = statistics
+            if owner:
+                executor.shutdown()
+
+    def _name_slice_filter(self):
+        """Gets the name of the slice filter (if any)."""
+        if self.slice_filter is not None:
+            return self._name_labeling_function(self.slice_filter)
+
+    def _get_checkpoint_key(self, df, num_examples_per_instance, search_kwargs):
+        """Returns the hash of the search configuration and the data that identifies a checkpoint."""
+        config = {
+            "target_dataframe_index": self.target_dataframe_index,
+            "time_index": self.time_index,
+            "window_size": self.window_size,
+            "labeling_function": list(self.labeling_function),
+            "slice_filter": self._name_slice_filter(),
+            "num_examples_per_instance": num_examples_per_instance,
+        }
+
+        for name in ["minimum_data", "maximum_data", "gap", "drop_empty"]:
+            config[name] = search_kwargs[name]
+
+        config["args"] = search_kwargs["args"]
+        config["kwargs"] = sorted(search_kwargs["kwargs"].items())
+
+        key = sha256(repr(config).encode())
+        key.update(repr(df.columns.tolist()).encode())
+        key.update(hash_pandas_object(df.index).to_numpy().tobytes())
+
+        for column in df.columns:
+            key.update(self._hash_column(df[column]))
+
+        return key.hexdigest()
+
+    def _hash_column(self, values):
+        """Hashes the values of a column. Columns of unhashable objects (e.g. lists) are hashed by their pickled values."""
+        try:
+            return hash_pandas_object(values, index=False).to_numpy().tobytes()
+        except TypeError:
+            return pickle.dumps(values.tolist())
+
+    def _get_search_settings(
+        self,
+        num_examples_per_instance,
+        minimum_data,
+        maximum_data,
+        gap,
+    ):
+        """Returns the settings of a label search."""
+        return {
+            "num_examples_per_instance": num_examples_per_instance,
+            "minimum_data": self._check_cutoff_time(minimum_data),
+            "maximum_data": str(maximum_data),
+            "window_size": str(self.window_size),
+            "gap": str(gap),
+        }
+
+    def _get_label_records(self):
+        """Creates the columns that accumulate the label records of a search."""
+        columns = [self.target_dataframe_index, "time", *self.labeling_function]
+        return LabelRecords(columns)
+
+    def _get_label_times(self, records, search_settings):
+        """Creates the label times from the label records of a search.
+
+        Args:
+            records (iterable(tuple) or LabelRecords): The target group, cutoff time and labels of each record.
+            search_settings (dict): The settings of the search.
+
+        Returns:
+            lt (LabelTimes): Calculated labels with cutoff times.
+        """
+        if not isinstance(records, LabelRecords):
+            records, iterable = self._get_label_records(), records
+            records.extend(iterable)
+
+        lt = LabelTimes(
+            data=records.to_dict() if len(records) else None,
+            target_columns=list(self.labeling_function),
+            target_dataframe_index=self.target_dataframe_index,
+            search_settings=search_settings,
+        )
+
+        return lt
+
+    def plan(
+        self,
+        df,
+        num_examples_per_instance,
+        minimum_data=None,
+        maximum_data=None,
+        gap=None,
+        drop_empty=True,
+    ):
+        """Calculates the boundaries of the data slices without calculating labels.
+
+        The slice plan can be saved and labeled many times with different labeling functions.
+
+        Args:
+            df (DataFrame or PreparedData): Data frame to create slices on.
+            num_examples_per_instance (int): Number of data slices per unique instance of target dataframe.
+            minimum_data (int or str or Series): The amount of data needed before starting the search. Defaults to the first value in the time index.
+                The value can be a datetime string to directly set the first cutoff time or a timedelta string to denote the amount of data needed before
+                the first cutoff time. The value can also be an integer to denote the number of rows needed before the first cutoff time.
+                If a Series, minimum_data should be datetime string, timedelta string, or integer values with a unique set of target groups as the corresponding index.
+            maximum_data (str): Maximum data before stopping the search. Defaults to the last value in the time index.
+            gap (str or int): Time between examples. Default value is window size.
+                If an integer, search will start on the first event after the minimum data.
+            drop_empty (bool): Whether to drop empty slices. Default value is True.
+
+        Returns:
+            plan (SlicePlan): The boundaries of the data slices like the data slices generated by ``slice``.
+        """
+        self._check_example_count(num_examples_per_instance, gap)
+        num_examples = ExampleSearch._check_number(num_examples_per_instance)
+        minimum_data = self._check_cutoff_time(minimum_data)
+        target_groups = self._get_target_groups(df)
+
+        windows = self._get_windows(
+            target_groups,
+            minimum_data=minimum_data,
+            maximum_data=maximum_data,
+            gap=gap,
+            drop_empty=drop_empty,
+        )
+
+        group = windows.pop("group")
+        keys = target_groups.keys.take(group)
+        data = {self.target_dataframe_index: keys, **windows}
+        data["row_start"] = data["row_start"] - target_groups.starts[group]
+        data["row_stop"] = data["row_stop"] - target_groups.starts[group]
+
+        plan = SlicePlan(
+            data=data,
+            target_dataframe_index=self.target_dataframe_index,
+            search_settings={
+                "num_examples_per_instance": num_examples_per_instance,
+                "minimum_data": minimum_data,
+                "maximum_data": str(maximum_data),
                 "window_size": str(self.window_size),
                 "gap": str(gap),
+                "drop_empty": drop_empty,
             },
         )
 
+        plan = plan[plan.slice_number <= num_examples]
+        plan = plan.reset_index(drop=True)
+        return plan
+
+    def label(self, df, plan, verbose=True, *args, **kwargs):
+        """Calculates the labels of the data slices in a slice plan.
+
+        Every data slice in the plan is labeled. Data slices with null labels are dropped.
+
+        Args:
+            df (DataFrame or PreparedData): Data frame that the slice plan was calculated on.
+            plan (SlicePlan): The boundaries of the data slices.
+            verbose (bool): Whether to render progress bar. Default value is True.
+            *args: Positional arguments for labeling function.
+            **kwargs: Keyword arguments for labeling function.
+
+        Returns:
+            lt (LabelTimes): Calculated labels with cutoff times.
+        """
+        assert self.labeling_function, "missing labeling function(s)"
+        info = "slice plan must have the same target dataframe index"
+        assert plan.target_dataframe_index == self.target_dataframe_index, info
+
+        target_groups = self._get_target_groups(df)
+        windows = self._get_plan_windows(target_groups, plan)
+        search = self._get_search(-1)
+
+        total = len(np.unique(windows["group"]))
+        progress_bar = tqdm(
+            total=total,
+            file=stdout,
+            disable=not verbose,
+            bar_format=self._bar_format,
+        )
+
+        records = self._search_windows(
+            target_groups,
+            [windows],
+            search,
+            progress_bar,
+            args=args,
+            kwargs=kwargs,
+        )
+
+        lt = self._get_label_times(records, plan.search_settings)
+        progress_bar.update(n=total - progress_bar.n)
+        progress_bar.close()
         return lt
 
+    def _get_plan_windows(self, target_groups, plan):
+        """Calculates the positions of the data slices in a slice plan within the grouped data frame."""
+        keys = plan[self.target_dataframe_index]
+        group = target_groups.keys.get_indexer(keys)
+        info = "target groups in slice plan not found in data frame"
+        assert (group >= 0).all(), info
+
+        windows = {"group": group}
+        for column in ["slice_number", "row_start", "row_stop"]:
+            windows[column] = plan[column].to_numpy(dtype="int64")
+
+        for column in ["slice_start", "slice_stop", "next_start"]:
+            windows[column] = plan[column].tolist()
+
+        windows["row_start"] = windows["row_start"] + target_groups.starts[group]
+        windows["row_stop"] = windows["row_stop"] + target_groups.starts[group]
+        info = "slice plan does not match the rows of the data frame"
+        assert (windows["row_stop"] <= target_groups.stops[group]).all(), info
+        return windows
+
+    def _search_serial(
+        self,
+        target_groups,
+        search,
+        progress_bar,
+        num_examples_per_instance,
+        args,
+        kwargs,
+        **_,
+    ):
+        """Searches the target groups one after the other until the quota (if any) is met."""
+        for group_count, (group_key, df, generator) in enumerate(
+            target_groups,
+            start=1,
+        ):
+            if search.is_exhausted:
+                break
+
+            group = self._search_group(group_key, df, generator, search, args, kwargs)
+            for record in group:
+                yield record
+                # if finite search, update progress bar for the example found
+                if search.is_finite:
+                    progress_bar.update(n=1)
+
+            self._update_progress(progress_bar, search, group_count)
+
+    def _search_parallel(
+        self,
+        target_groups,
+        search,
+        progress_bar,
+        n_jobs,
+        executor,
+        ngroups,
+        df=None,
+        **search_kwargs,
+    ):
+        """Searches batches of target groups in parallel.
+
+        The batches are contiguous, so generating the records of each batch in order matches the serial search.
+        The batches have at most ``max_batch_size`` target groups and are submitted as the records are generated,
+        so the records of a bounded number of batches are held at once.
+        When the grouped data frame is provided, it is published to shared memory once and
+        the target groups are the positions of their rows, so workers do not receive pickled data frames.
+        """
+        executor, owner = get_executor(executor, n_jobs)
+        batch_size = get_batch_size(ngroups, n_jobs, max_batch_size=self.max_batch_size)
+        batches = iter_batches(target_groups, batch_size)
+        futures, frame = None, None
+
+        try:
+            if df is not None:
+                frame = SharedFrame(df)
+                method = partial(self._search_shared_batch, frame.handle)
+            else:
+                method = self._search_batch
+
+            submit = partial(executor.submit, method, **search_kwargs)
+            futures = iter_futures(batches, submit, 2 * get_n_jobs(n_jobs))
+
+            for batch, future in futures:
+                records, filtered_count = future.result()
+                search.filtered_count += filtered_count
+
+                # update progress bar once for each group in the batch
+                n = len(batch)
+                n *= search.expected_count if search.is_finite else 1
+                progress_bar.update(n=n)
+                yield from records
+        finally:
+            if futures is not None:
+                futures.close()
+
+            if owner:
+                executor.shutdown()
+
+            if frame is not None:
+                frame.close()
+
+    def _search_split(
+        self,
+        target_groups,
+        windows,
+        search,
+        progress_bar,
+        n_jobs,
+        executor,
+        shared_memory,
+        args,
+        kwargs,
+    ):
+        """Labels tasks of data slices with a similar cost in parallel and searches the labels in order.
+
+        The data slices in each chunk of boundaries are split into contiguous tasks by their estimated cost,
+        so the data slices of a target group with a high cost are labeled by different workers.
+        The tasks are submitted as the labels are searched, so the labels of a bounded number of tasks are held at once.
+        The slice numbers are calculated before splitting and the labels are searched in the order of the data slices,
+        so the records match the serial search.
+        """
+        shared_memory = shared_memory and not self._is_thread_executor(executor)
+        executor, owner = get_executor(executor, n_jobs)
+        futures, frame = None, None
+
+        try:
+            if shared_memory:
+                frame = SharedFrame(target_groups.df)
+                method = partial(self._label_shared_task, frame.handle)
+            else:
+                method = self._label_task
+
+            submit = partial(
+                self._submit_task,
+                executor,
+                method,
+                target_groups,
+                shared_memory,
+                args,
+                kwargs,
+            )
+
+            tasks = self._iter_tasks(windows, search, n_jobs)
+            futures = iter_futures(tasks, submit, 2 * get_n_jobs(n_jobs))
+            rows = chain.from_iterable(self._iter_task_labels(futures))
+            yield from self._search_window_labels(
+                target_groups.keys,
+                rows,
+                search,
+                progress_bar,
+            )
+        finally:
+            if futures is not None:
+                futures.close()
+
+            if owner:
+                executor.shutdown()
+
+            if frame is not None:
+                frame.close()
+
+    def _iter_tasks(self, windows, search, n_jobs):
+        """Iterates the boundaries and the positions of the first and after the last data slice of each task in the chunks of boundaries.
+
+        The tasks are iterated as the labels are searched, so the data slices of a target group
+        that already has the expected number of examples are not labeled.
+        """
+        for chunk in windows:
+            costs = get_window_costs(chunk["row_start"], chunk["row_stop"])
+            for start, stop in split_tasks(costs, n_jobs):
+                if search.is_complete:
+                    complete = chunk["group"][start:stop] == search.group
+                    start += len(complete) if complete.all() else int(complete.argmin())
+
+                if start < stop:
+                    yield chunk, start, stop
+
+    def _submit_task(
+        self, executor, method, target_groups, shared_memory, args, kwargs, task
+    ):
+        """Submits a task of data slices to the executor."""
+        windows, start, stop = task
+        task = self._get_task(target_groups, windows, start, stop, shared_memory)
+        return executor.submit(method, task, args, kwargs)
+
+    def _get_task(self, target_groups, windows, start, stop, shared_memory=False):
+        """Gets the rows, target group keys and boundaries of a task of data slices.
+
+        The group and row positions of the data slices are relative to the task.
+        The target groups of a task are not contiguous when they are shuffled,
+        so the rows of each target group are taken separately unless the target groups are next to each other.
+        When using shared memory, the rows are the positions of the first and after the last row of each span in the grouped data frame.
+        """
+        task = {column: values[start:stop] for column, values in windows.items()}
+        groups, task["group"] = np.unique(task["group"], return_inverse=True)
+        keys = target_groups.keys.take(groups)
+
+        if groups[-1] - groups[0] + 1 == len(groups):
+            i, j = task["row_start"].min(), task["row_stop"].max()
+            spans = [(i, j)]
+            offsets = np.full(len(groups), i)
+        else:
+            starts = np.full(len(groups), task["row_stop"].max())
+            stops = np.zeros(len(groups), dtype="int64")
+            np.minimum.at(starts, task["group"], task["row_start"])
+            np.maximum.at(stops, task["group"], task["row_stop"])
+            spans = list(zip(starts.tolist(), stops.tolist()))
+            sizes = stops - starts
+            offsets = starts - (np.cumsum(sizes) - sizes)
+
+        offsets = offsets[task["group"]]
+        task["row_start"] = task["row_start"] - offsets
+        task["row_stop"] = task["row_stop"] - offsets
+        rows = spans if shared_memory else self._take_rows(target_groups.df, spans)
+        return rows, keys, task
+
+    def _take_rows(self, df, spans):
+        """Takes the rows of the spans of positions in order."""
+        if len(spans) == 1:
+            i, j = spans[0]
+            return df.iloc[i:j]
+
+        positions = [np.arange(i, j) for i, j in spans]
+        return df.iloc[np.concatenate(positions)]
+
+    def _label_task(self, task, args, kwargs):
+        """Calculates the labels of a task of data slices in a worker."""
+        df, keys, windows = task
+        return self._calculate_labels(df, keys, windows, args, kwargs)
+
+    def _label_shared_task(self, handle, task, args, kwargs):
+        """Calculates the labels of a task of data slices from a data frame in shared memory."""
+        spans, keys, windows = task
+        df = self._take_rows(attach_frame(handle), spans)
+        return self._label_task((df, keys, windows), args, kwargs)
+
+    def _iter_task_labels(self, futures):
+        """Iterates the group position, slice start, whether the slice filter passes and labels of the data slices of each task in order."""
+        for (windows, start, stop), future in futures:
+            passed, labels = future.result()
+            group = windows["group"][start:stop]
+            slice_start = windows["slice_start"][start:stop]
+            yield zip(group, slice_start, passed, *labels)
+
+    def _is_thread_executor(self, executor):
+        """Whether the executor runs in threads that can read the data frame without shared memory."""
+        return executor == "thread" or isinstance(executor, ThreadPoolExecutor)
+
+    def get_time_shard(
+        self,
+        time_shard_index,
+        num_time_shards,
+        minimum_data,
+        maximum_data,
+        gap=None,
+    ):
+        """Calculates the time range of the data needed to search a time shard.
+
+        The cutoff times from the minimum data to the maximum data are split into ranges with the same number of cutoff times.
+        The data of a time shard starts at its first cutoff time and includes the window size after its last cutoff time,
+        so each time shard only loads the data of its own data slices.
+
+        Args:
+            time_shard_index (int): Position of the time shard from zero.
+            num_time_shards (int): Number of time shards.
+            minimum_data (str): Timestamp of the first cutoff time of the search.
+            maximum_data (str): Timestamp of the last cutoff time of the search.
+            gap (str): Time between examples. Default value is window size.
+
+        Returns:
+            start (Timestamp): The first time of the data in the time shard.
+            stop (Timestamp): The time after the last time of the data in the time shard.
+        """
+        first, last, size = self._get_time_shard_cutoffs(
+            time_shard_index,
+            num_time_shards,
+            minimum_data,
+            maximum_data,
+            gap,
+        )
+
+        return first, last + size
+
+    def _get_time_shard_cutoffs(
+        self,
+        time_shard_index,
+        num_time_shards,
+        minimum_data,
+        maximum_data,
+        gap,
+    ):
+        """Returns the first and last cutoff times of a time shard with the window size."""
+        size = DataSliceStep(self.window_size)
+        step = DataSliceStep(gap or self.window_size)
+        info = "time shards require a fixed time-based window size and gap"
+        assert size._is_offset_fixed and step._is_offset_fixed, info
+
+        info = "time shards require timestamps for the minimum and maximum data"
+        is_timestamp = [
+            value is not None and DataSliceOffset(value)._is_offset_timestamp
+            for value in (minimum_data, maximum_data)
+        ]
+        assert all(is_timestamp), info
+
+        info = (
+            "time shard index must be an integer from zero to the number of time shards"
+        )
+        valid = isinstance(time_shard_index, int) and isinstance(num_time_shards, int)
+        assert valid and 0 <= time_shard_index < num_time_shards, info
+
+        size, step = Timedelta(size.value), Timedelta(step.value)
+        start = DataSliceOffset(minimum_data).value
+        stop = DataSliceOffset(maximum_data).value
+        num_cutoffs = max((stop - start) // step + 1, 0)
+
+        # the time shards have the same number of cutoff times
+        i = num_cutoffs * time_shard_index // num_time_shards
+        j = num_cutoffs * (time_shard_index + 1) // num_time_shards
+        return start + step * i, start + step * (j - 1), size
+
+    def _get_shard(self, df, shard_index, num_shards):
+        """Selects the rows of the target instances in a shard."""
+        if shard_index is None and num_shards is None:
+            return df
+
+        data = df.df if isinstance(df, PreparedData) else df
+        mask = is_in_shard(data[self.target_dataframe_index], shard_index, num_shards)
+        return df.select(mask) if isinstance(df, PreparedData) else df[mask]
+
+    def prepare(self, df):
+        """Prepares a data frame once for many searches.
+
+        The time index is set, the data frame is grouped by the target dataframe index and the time index is checked.
+        The prepared data can be passed instead of the data frame to ``search``, ``search_iter``, ``slice``, ``plan``, ``label`` and ``update``
+        of label makers with the same target dataframe index and time index, so the data frame is not prepared for each call.
+
+        Args:
+            df (DataFrame): Data frame to prepare.
+
+        Returns:
+            data (PreparedData): The data frame indexed by time and grouped by the target dataframe index.
+        """
+        if isinstance(df, PreparedData):
+            return df
+
+        df = self.set_index(df)
+        target_groups = TargetGroups(df, self.target_dataframe_index)
+        data = PreparedData(target_groups, self.time_index)
+
+        if self.window_size not in df:
+            data.check_index()
+
+        return data
+
     def set_index(self, df):
         """Sets the time index in a data frame (if not already set).
 
         Args:
-            df (DataFrame): Data frame to set time index in.
+            df (DataFrame or PreparedData): Data frame to set time index in. Prepared data returns its data frame.
 
         Returns:
             df (DataFrame): Data frame with time index set.
         """
+        if isinstance(df, PreparedData):
+            return df.df
+
         if df.index.name != self.time_index:
             df = df.set_index(self.time_index)
 
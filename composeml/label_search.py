@@ -3,15 +3,76 @@ from collections import Counter
 from pandas import isnull
 
 
+class SearchQuota:
+    """The number of examples to find across all target groups of a search.
+
+    Unlike the expected number of examples, the counts are not reset between target groups.
+
+    Args:
+        quota (int or dict): The total number of examples to find. A dictionary maps a label to the total number of examples to find for the label.
+    """
+
+    def __init__(self, quota):
+        self.is_label_quota = isinstance(quota, dict)
+        if self.is_label_quota:
+            items = quota.items()
+            self.expected_label_counts = Counter(
+                {label: ExampleSearch._check_number(count) for label, count in items},
+            )
+            self.actual_label_counts = Counter()
+        else:
+            self.expected_count = ExampleSearch._check_number(quota)
+            self.actual_count = 0
+
+    @property
+    def is_complete(self):
+        """Whether the quota is met, so no more target groups need to be searched."""
+        if self.is_label_quota:
+            return len(self.expected_label_counts - self.actual_label_counts) == 0
+
+        return self.actual_count >= self.expected_count
+
+    def is_complete_label(self, label):
+        """Whether the quota of a label is met."""
+        return (
+            self.actual_label_counts.get(label, 0) >= self.expected_label_counts[label]
+        )
+
+    def is_valid_labels(self, labels):
+        """Whether the labels count towards the quota.
+
+        With a quota for each label, any label value must be in the quota and not have met its quota.
+        """
+        if not self.is_label_quota:
+            return not self.is_complete
+
+        return any(
+            label in self.expected_label_counts and not self.is_complete_label(label)
+            for label in labels.values()
+        )
+
+    def update_count(self, labels):
+        """Update the counts of the quota with the labels found."""
+        if self.is_label_quota:
+            self.actual_label_counts.update(labels.values())
+        else:
+            self.actual_count += 1
+
+
 class ExampleSearch:
     """A label search based on the number of examples.
 
     Args:
         expected_count (int): The expected number of examples to find.
+        quota (SearchQuota): The number of examples to find across all target groups. By default, there is no quota.
     """
 
-    def __init__(self, expected_count):
+    def __init__(self, expected_count, quota=None):
         self.expected_count = self._check_number(expected_count)
+        self.quota = quota
+        self.filtered_count = 0
+        # the position of the target group being searched
+        self.group = None
         self.reset_count()
 
     @staticmethod
@@ -32,7 +93,12 @@ class ExampleSearch:
     @property
     def is_complete(self):
         """Whether the search has found the expected number of examples."""
-        return self.actual_count >= self.expected_count
+        return self.actual_count >= self.expected_count or self.is_exhausted
+
+    @property
+    def is_exhausted(self):
+        """Whether the quota is met, so no more target groups need to be searched."""
+        return self.quota is not None and self.quota.is_complete
 
     @property
     def is_finite(self):
@@ -40,8 +106,13 @@ class ExampleSearch:
         return self._is_finite_number(self.expected_count)
 
     def is_valid_labels(self, labels):
-        """Whether the label values are not null."""
-        return not any(map(isnull, labels.values()))
+        """Whether the label values are not null and count towards the quota."""
+        not_null = not any(map(isnull, labels.values()))
+        return not_null and self._is_in_quota(labels)
+
+    def _is_in_quota(self, labels):
+        """Whether the labels count towards the quota (if any)."""
+        return self.quota is None or self.quota.is_valid_labels(labels)
 
     def reset_count(self):
         """Reset the internal count of actual labels."""
@@ -50,6 +121,16 @@ class ExampleSearch:
     def update_count(self, labels):
         """Update the internal count of actual labels."""
         self.actual_count += 1
+        self._update_quota(labels)
+
+    def update_filtered_count(self):
+        """Update the count of data slices skipped by the slice filter."""
+        self.filtered_count += 1
+
+    def _update_quota(self, labels):
+        """Update the counts of the quota (if any)."""
+        if self.quota is not None:
+            self.quota.update_count(labels)
 
 
 class LabelSearch(ExampleSearch):
@@ -58,20 +139,25 @@ class LabelSearch(ExampleSearch):
     Args:
         expected_label_counts (dict): The expected number of examples to be find for each label.
             The dictionary should map a label to the number of examples to find for the label.
+        quota (SearchQuota): The number of examples to find across all target groups. By default, there is no quota.
     """
 
-    def __init__(self, expected_label_counts):
+    def __init__(self, expected_label_counts, quota=None):
         items = expected_label_counts.items()
         self.expected_label_counts = Counter(
             {label: self._check_number(count) for label, count in items},
         )
         self.expected_count = sum(self.expected_label_counts.values())
         self.actual_label_counts = Counter()
+        self.quota = quota
+        self.filtered_count = 0
+        self.group = None
 
     @property
     def is_complete(self):
         """Whether the search has found the expected number of examples for each label."""
-        return len(self.expected_label_counts - self.actual_label_counts) == 0
+        is_complete = len(self.expected_label_counts - self.actual_label_counts) == 0
+        return is_complete or self.is_exhausted
 
     def is_complete_label(self, label):
         """Whether the search has found the expected number of examples for a label."""
@@ -100,7 +186,7 @@ class LabelSearch(ExampleSearch):
         value = is_expected and any(
             not self.is_complete_label(label) for label in label_values
         )
-        return value
+        return value and self._is_in_quota(labels)
 
     def reset_count(self):
         """Reset the internal count of actual labels."""
@@ -113,3 +199,4 @@ class LabelSearch(ExampleSearch):
             labels (dict): The actual label values found during a search.
         """
         self.actual_label_counts.update(labels.values())
+        self._update_quota(labels)
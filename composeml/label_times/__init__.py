@@ -1,3 +1,5 @@
 # flake8:noqa
 from composeml.label_times.deserialize import read_label_times
+from composeml.label_times.merge import merge_label_times
 from composeml.label_times.object import LabelTimes
+from composeml.label_times.sink import ParquetSink
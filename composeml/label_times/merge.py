@@ -0,0 +1,108 @@
+import json
+import os
+
+import pandas as pd
+
+from composeml.label_search import ExampleSearch, LabelSearch
+from composeml.label_times.deserialize import read_config, read_label_times
+from composeml.label_times.object import LabelTimes
+
+
+def merge_label_times(paths, path=None):
+    """Merges label times of shards that were saved to disk into one dataset.
+
+    The label times must be saved with the same settings by searches of the same label maker on different shards.
+    The labels are sorted by target instance and cutoff time like the labels of a search without shards.
+    Then, the number of examples per instance is applied to the labels of each target instance in order,
+    so the labels of time shards match the labels of a search without shards.
+
+    Args:
+        paths (list(str)): Directories where the label times of the shards are stored.
+        path (str): Directory where the merged label times are saved in parquet format with their settings.
+            By default, the merged label times are not saved.
+
+    Returns:
+        lt (LabelTimes): The merged label times.
+    """
+    assert paths, "no label times to merge"
+    settings = [_get_merge_settings(read_config(shard)) for shard in paths]
+    info = "label times must have the same settings to merge: '%s'"
+    for shard, value in zip(paths, settings):
+        assert value == settings[0], info % shard
+
+    shards = [read_label_times(shard) for shard in paths]
+    frames = [pd.DataFrame(lt) for lt in shards if not lt.empty]
+    first = shards[0]
+    data = None
+
+    if frames:
+        index = first.target_dataframe_index
+        data = pd.concat(frames).sort_values([index, "time"], kind="stable")
+        data = data[_search_labels(data, first)].reset_index(drop=True)
+
+    lt = LabelTimes(
+        data=data,
+        target_dataframe_index=first.target_dataframe_index,
+        target_columns=first.target_columns,
+        search_settings=first.search_settings,
+        transforms=first.transforms,
+    )
+
+    if path is not None:
+        os.makedirs(path, exist_ok=True)
+        lt.to_parquet(path)
+
+    return lt
+
+
+def _get_merge_settings(config):
+    """Returns the settings that must match between the label times of shards.
+
+    The data types are excluded, since a shard without labels can infer different data types.
+    """
+    settings = config["label_times"].copy()
+    settings.pop("target_types", None)
+    return settings
+
+
+def _search_labels(data, lt):
+    """Applies the number of examples per instance to the labels of each target instance in order.
+
+    Returns:
+        is_valid (list(bool)): Whether each label is found by the search.
+    """
+    expected = lt.search_settings.get("num_examples_per_instance", -1)
+    if isinstance(expected, dict):
+        # the labels are compared like the keys of the settings saved in json format
+        expected = {_get_json_key(key): count for key, count in expected.items()}
+        search = LabelSearch(expected)
+    else:
+        search = ExampleSearch(expected)
+        if not search.is_finite:
+            return [True] * len(data)
+
+    index, names = lt.target_dataframe_index, lt.target_columns
+    is_valid, current = [], None
+
+    for key, *values in zip(data[index], *(data[name] for name in names)):
+        if key != current:
+            search.reset_count()
+            current = key
+
+        labels = dict(zip(names, values))
+        if isinstance(search, LabelSearch):
+            labels = {name: _get_json_key(value) for name, value in labels.items()}
+
+        valid = not search.is_complete and search.is_valid_labels(labels)
+        if valid:
+            search.update_count(labels)
+        is_valid.append(valid)
+
+    search.reset_count()
+    return is_valid
+
+
+def _get_json_key(value):
+    """Returns the value as a key of a dictionary saved in json format."""
+    value = getattr(value, "item", lambda: value)()
+    return next(iter(json.loads(json.dumps({value: None}))))
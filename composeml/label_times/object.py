@@ -152,7 +152,7 @@ class LabelTimes(pd.DataFrame):
             "label_times": {
                 "target_dataframe_index": self.target_dataframe_index,
                 "target_columns": self.target_columns,
-                "target_types": self.target_types.to_dict(),
+                "target_types": dict(self.target_types),
                 "search_settings": self.search_settings,
                 "transforms": self.transforms,
             },
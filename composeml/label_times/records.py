@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+
+class LabelRecords:
+    """Accumulates the records of a label search in typed column buffers.
+
+    The values of each column are written to a NumPy buffer that grows as records are added.
+    A column of timestamps is stored as nanoseconds with the time zone of its first value.
+    When the values of a column do not share a data type, the column falls back to a list of values,
+    so the data types match creating a data frame from the records.
+
+    Args:
+        columns (list(str)): The name of each column in the order of the values in a record.
+        capacity (int): The initial number of records that the buffers can hold.
+    """
+
+    def __init__(self, columns, capacity=1024):
+        self.columns = list(columns)
+        self._capacity = max(capacity, 1)
+        self._size = 0
+
+        n = len(self.columns)
+        self._buffers = [None] * n
+        self._types = [None] * n
+        self._kinds = [None] * n
+        self._tz = [None] * n
+
+    def __len__(self):
+        """Returns the number of records."""
+        return self._size
+
+    def append(self, record):
+        """Adds a record with a value for each column."""
+        i = self._size
+        if i == self._capacity:
+            self._grow()
+
+        for j, value in enumerate(record):
+            buffer = self._buffers[j]
+
+            if buffer is None:
+                self._create_buffer(j, value)
+                buffer = self._buffers[j]
+
+            if type(buffer) is list:
+                buffer.append(value)
+                continue
+
+            if not self._write(j, i, value):
+                self._to_list(j, i)
+                self._buffers[j].append(value)
+
+        self._size += 1
+
+    def extend(self, records):
+        """Adds many records."""
+        for record in records:
+            self.append(record)
+
+    def to_dict(self):
+        """Returns the values of each column.
+
+        Returns:
+            data (dict): The values of each column as an array or list. When column names repeat, the last column is used.
+        """
+        data = {}
+        for j, column in enumerate(self.columns):
+            data[column] = self._get_values(j)
+
+        return data
+
+    def _create_buffer(self, j, value):
+        """Creates the buffer of a column from its first value."""
+        kind = self._get_kind(value)
+        self._types[j], self._kinds[j] = type(value), kind
+
+        if kind is None:
+            self._buffers[j] = []
+        elif isinstance(kind, tuple):
+            self._tz[j] = value.tz
+            self._buffers[j] = np.empty(self._capacity, dtype="int64")
+        else:
+            self._buffers[j] = np.empty(self._capacity, dtype=kind)
+
+    def _write(self, j, i, value):
+        """Writes a value to the buffer of a column. Returns whether the value was written."""
+        kind = self._kinds[j]
+
+        if isinstance(kind, tuple):
+            if not isinstance(value, pd.Timestamp) or str(value.tz) != kind[1]:
+                return False
+
+            try:
+                value = value.value
+            except OverflowError:
+                return False
+
+        elif type(value) is not self._types[j] and self._get_kind(value) != kind:
+            return False
+
+        try:
+            self._buffers[j][i] = value
+        except (OverflowError, TypeError, ValueError):
+            return False
+
+        return True
+
+    def _get_kind(self, value):
+        """Returns the data type of a buffer that holds a value or None when a list is needed."""
+        if isinstance(value, (bool, np.bool_)):
+            return np.dtype("bool")
+
+        if isinstance(value, int):
+            return np.dtype("int64")
+
+        if isinstance(value, float):
+            return np.dtype("float64")
+
+        if isinstance(value, np.generic) and value.dtype.kind in "iuf":
+            return value.dtype
+
+        if isinstance(value, pd.Timestamp):
+            return "datetime64", str(value.tz)
+
+        return None
+
+    def _get_values(self, j, n=None):
+        """Returns the first values of a column. By default, the values of all records are returned."""
+        buffer, kind = self._buffers[j], self._kinds[j]
+
+        if buffer is None:
+            return []
+
+        if type(buffer) is list:
+            return buffer
+
+        values = buffer[: self._size if n is None else n]
+        if isinstance(kind, tuple):
+            values = pd.DatetimeIndex(values.view("datetime64[ns]"))
+            tz = self._tz[j]
+            if tz is not None:
+                values = values.tz_localize("UTC").tz_convert(tz)
+
+        return values
+
+    def _to_list(self, j, n):
+        """Replaces the buffer of a column with a list of its first values."""
+        values = self._get_values(j, n)
+        self._buffers[j], self._kinds[j] = list(values), None
+
+    def _grow(self):
+        """Doubles the capacity of the buffers."""
+        self._capacity *= 2
+
+        for j, buffer in enumerate(self._buffers):
+            if isinstance(buffer, np.ndarray):
+                grown = np.empty(self._capacity, dtype=buffer.dtype)
+                grown[: len(buffer)] = buffer
+                self._buffers[j] = grown
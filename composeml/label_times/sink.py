@@ -0,0 +1,176 @@
+import os
+
+from composeml.label_times.object import LabelTimes
+
+
+class ParquetSink:
+    """Writes the labels of a search to disk in parquet format as they are calculated.
+
+    The labels are written to ``data.parquet`` in row groups, so the labels of all target groups are not held in memory at once.
+    After the search completes, the settings are written to ``settings.json`` like ``LabelTimes.to_parquet``,
+    so the label times can be read back with ``read_label_times``.
+
+    Args:
+        path (str): Location on disk to write to (will be created as a directory).
+        row_group_size (int): Maximum number of labels in each row group. Default value is 100000.
+        **kwargs: Keyword arguments to pass to underlying pyarrow.parquet.ParquetWriter.
+
+    Examples:
+        >>> sink = ParquetSink('labels', row_group_size=50000) # doctest: +SKIP
+        >>> path = lm.search(df, num_examples_per_instance=-1, sink=sink) # doctest: +SKIP
+        >>> lt = read_label_times(path) # doctest: +SKIP
+    """
+
+    def __init__(self, path, row_group_size=100000, **kwargs):
+        info = "row group size must be a positive integer"
+        assert isinstance(row_group_size, int) and row_group_size > 0, info
+
+        kwargs.setdefault("compression", None)
+        self.path = path
+        self.row_group_size = row_group_size
+        self.kwargs = kwargs
+        self._label_times = None
+        self._schema = None
+        self._writer = None
+        self._writer_file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(save_settings=exc_type is None)
+
+    def open(self):
+        """Creates the directory and prepares the sink to write a new search."""
+        os.makedirs(self.path, exist_ok=True)
+        self._label_times = None
+        self._schema = None
+        self._writer = None
+        self._writer_file = None
+
+    def write(self, lt):
+        """Writes a batch of label times as a row group.
+
+        The first batch sets the schema of the data. The data types of later batches are converted to the schema.
+        When a later batch has labels that do not fit the schema (e.g. float labels after integer labels),
+        the schema is promoted and the row groups already written are converted to the promoted schema.
+
+        Args:
+            lt (LabelTimes): Calculated labels with cutoff times.
+        """
+        import pyarrow as pa
+
+        if self._label_times is None or self._writer is None:
+            self._label_times = lt.head(0)
+
+        if lt.empty:
+            return
+
+        table = pa.Table.from_pandas(lt, preserve_index=False)
+
+        if self._writer is None:
+            self._open_writer(table.schema)
+        else:
+            schema = self._promote_schema(table.schema)
+            if not schema.equals(self._schema):
+                self._rewrite(schema)
+                self._promote_label_times()
+
+            table = table.cast(self._schema)
+
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def _open_writer(self, schema, file=None):
+        """Opens a parquet writer with the schema of the data."""
+        import pyarrow.parquet as pq
+
+        self._schema = schema
+        self._writer_file = file or self._file
+        self._writer = pq.ParquetWriter(self._writer_file, schema, **self.kwargs)
+
+    def _promote_schema(self, schema):
+        """Promotes the schema of the data to hold the data types of a batch.
+
+        Null columns take the data type of the batch and numeric columns with different data types are promoted to float.
+        """
+        import pyarrow as pa
+
+        fields = []
+        for field, other in zip(self._schema, schema):
+            if pa.types.is_null(field.type):
+                field = field.with_type(other.type)
+            elif field.type.equals(other.type) or pa.types.is_null(other.type):
+                pass
+            elif self._is_numeric(field.type) and self._is_numeric(other.type):
+                field = field.with_type(pa.float64())
+
+            fields.append(field)
+
+        # the pandas metadata of the batch describes the promoted data types
+        promoted = pa.schema(fields)
+        if promoted.equals(self._schema):
+            return self._schema
+
+        return promoted.with_metadata(schema.metadata)
+
+    def _is_numeric(self, data_type):
+        """Whether a parquet data type is an integer or float."""
+        import pyarrow as pa
+
+        return pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+
+    def _promote_label_times(self):
+        """Converts the data types saved with the settings to the promoted schema."""
+        dtypes = {}
+        for field in self._schema:
+            if self._is_numeric(field.type):
+                dtype = field.type.to_pandas_dtype()
+                if self._label_times[field.name].dtype != dtype:
+                    dtypes[field.name] = dtype
+
+        self._label_times = self._label_times.astype(dtypes)
+
+    def _rewrite(self, schema):
+        """Converts the row groups already written to a new schema and continues writing with the new schema."""
+        import pyarrow.parquet as pq
+
+        self._writer.close()
+        file = self._writer_file
+        other = self._file if file != self._file else self._file + ".tmp"
+        self._open_writer(schema, other)
+
+        with open(file, "rb") as data:
+            data = pq.ParquetFile(data)
+            for i in range(data.num_row_groups):
+                table = data.read_row_group(i).cast(schema)
+                self._writer.write_table(table, row_group_size=self.row_group_size)
+
+        os.remove(file)
+
+    def close(self, save_settings=True):
+        """Closes the parquet file and writes the settings used to make the label times.
+
+        Args:
+            save_settings (bool) : Whether to save the settings used to make the label times.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+            if self._writer_file != self._file:
+                os.replace(self._writer_file, self._file)
+
+        if save_settings:
+            lt = self._label_times
+            if lt is None:
+                lt = LabelTimes()
+
+            if self._schema is None:
+                lt.to_parquet(self.path, save_settings=False)
+
+            lt._save_settings(self.path)
+
+    @property
+    def _file(self):
+        return os.path.join(self.path, "data.parquet")
@@ -0,0 +1,76 @@
+from copy import copy
+
+from composeml.target_groups import TargetGroups
+
+
+class PreparedData:
+    """A data frame prepared once for many searches of label makers.
+
+    The data frame is indexed by time, grouped by the target dataframe index with a single sort,
+    and the time index is checked once. Label makers with the same target dataframe index and time index
+    search the prepared data without preparing the data frame again.
+
+    Args:
+        target_groups (TargetGroups): The target groups of the data frame indexed by time.
+        time_index (str): Name of the time index of the data frame.
+        is_index_checked (bool): Whether the time index was checked for null and unsorted values.
+    """
+
+    def __init__(self, target_groups, time_index, is_index_checked=False):
+        self.target_groups = target_groups
+        self.time_index = time_index
+        self.is_index_checked = is_index_checked
+
+    def __len__(self):
+        """Returns the number of rows."""
+        return len(self.df)
+
+    def __repr__(self):
+        """Represents the prepared data as a string."""
+        info = "PreparedData(rows={}, target_dataframe_index={}, time_index={})"
+        return info.format(len(self), self.target_dataframe_index, self.time_index)
+
+    @property
+    def df(self):
+        """The data frame indexed by time and grouped by the target dataframe index."""
+        return self.target_groups.df
+
+    @property
+    def target_dataframe_index(self):
+        """Name of the column of the target groups."""
+        return self.target_groups.target_dataframe_index
+
+    def check_index(self):
+        """Checks if index values are null or unsorted within the target groups (if not already checked)."""
+        if not self.is_index_checked:
+            self.target_groups.check_index()
+            self.is_index_checked = True
+
+    def select(self, mask):
+        """Selects rows of the prepared data.
+
+        The rows stay grouped and sorted, so the selected rows are not prepared again.
+
+        Args:
+            mask (ndarray): Whether each row is selected.
+
+        Returns:
+            data (PreparedData): The prepared data of the selected rows.
+        """
+        target_groups = TargetGroups(self.df[mask], self.target_dataframe_index)
+        return PreparedData(target_groups, self.time_index, self.is_index_checked)
+
+    def select_columns(self, columns):
+        """Selects columns of the prepared data.
+
+        The rows stay grouped and sorted, so the target groups are reused.
+
+        Args:
+            columns (list(str)): Names of the columns to select.
+
+        Returns:
+            data (PreparedData): The prepared data of the selected columns.
+        """
+        target_groups = copy(self.target_groups)
+        target_groups.df = self.df[columns]
+        return PreparedData(target_groups, self.time_index, self.is_index_checked)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from composeml.executor import get_n_jobs
+
+
+def get_window_costs(row_start, row_stop, window_cost=100):
+    """Estimates the cost of labeling each data slice.
+
+    Args:
+        row_start (ndarray): Positions of the first row of the data slices.
+        row_stop (ndarray): Positions after the last row of the data slices.
+        window_cost (int): Fixed cost of creating a data slice as a number of rows.
+
+    Returns:
+        costs (ndarray): The number of rows of each data slice plus the fixed cost.
+    """
+    return np.asarray(row_stop) - np.asarray(row_start) + window_cost
+
+
+def split_tasks(costs, n_jobs, tasks_per_job=4):
+    """Splits data slices into contiguous tasks of similar cost.
+
+    The data slices of all target groups are split in order, so target groups with a low cost
+    are labeled together and target groups with a high cost are split between tasks.
+
+    Args:
+        costs (ndarray): The estimated cost of each data slice in the order of the search.
+        n_jobs (int): Number of workers processing the tasks.
+        tasks_per_job (int): Number of tasks for each worker. More tasks balance the load between workers.
+
+    Returns:
+        tasks (list(tuple)): The positions of the first and after the last data slice of each task.
+    """
+    if not len(costs):
+        return []
+
+    # each data slice belongs to the task that contains the middle of its cost
+    costs = np.asarray(costs, dtype="float64")
+    n_tasks = max(get_n_jobs(n_jobs) * tasks_per_job, 1)
+    middle = np.cumsum(costs) - costs / 2
+    task = np.floor(middle * n_tasks / costs.sum())
+    stops = np.append(np.flatnonzero(np.diff(task)) + 1, len(costs))
+    starts = np.append(0, stops[:-1])
+    return [(start, stop) for start, stop in zip(starts.tolist(), stops.tolist())]
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from pandas.util import hash_array
+
+
+def get_shards(values, num_shards):
+    """Assigns the values of the target dataframe index to shards with a stable hash.
+
+    The values are hashed by their string representation, so a value is assigned to the same shard
+    on every machine and when the data is loaded with a different data type (e.g. categorical or object).
+    Floats with an integer value are hashed like integers, so an id column loaded as float (e.g. because of a null)
+    is assigned to the same shards as when loaded as integer.
+
+    Args:
+        values (Series or array): Values of the target dataframe index.
+        num_shards (int): Number of shards.
+
+    Returns:
+        shards (ndarray): The shard of each value.
+    """
+    info = "number of shards must be a positive integer"
+    assert isinstance(num_shards, int) and num_shards > 0, info
+
+    values = pd.Series(values, copy=False)
+    codes, uniques = pd.factorize(values)
+    strings = pd.Series(uniques).astype(str).to_numpy(dtype=object)
+
+    # the unique values are normalized, so each distinct value is checked once
+    for i, value in enumerate(uniques):
+        if isinstance(value, (float, np.floating)) and float(value).is_integer():
+            strings[i] = str(int(value))
+
+    hashes = hash_array(strings, categorize=False)
+    hashes = hashes.take(codes) if len(hashes) else np.zeros(len(codes), "uint64")
+
+    # nulls are not in the unique values
+    null = codes < 0
+    if null.any():
+        nulls = values[null].astype(str).to_numpy(dtype=object)
+        hashes[null] = hash_array(nulls, categorize=True)
+
+    return (hashes % np.uint64(num_shards)).astype("int64")
+
+
+def is_in_shard(values, shard_index, num_shards):
+    """Whether the values of the target dataframe index belong to a shard.
+
+    The mask can be applied while loading the data, so each shard only loads the rows of its target instances.
+
+    Args:
+        values (Series or array): Values of the target dataframe index.
+        shard_index (int): Position of the shard from zero.
+        num_shards (int): Number of shards.
+
+    Returns:
+        mask (ndarray): Whether each value belongs to the shard.
+
+    Examples:
+        >>> from composeml import is_in_shard
+        >>> is_in_shard([1, 2, 3], shard_index=0, num_shards=1)
+        array([ True,  True,  True])
+    """
+    info = "shard index must be an integer from zero to the number of shards"
+    valid = isinstance(shard_index, int) and isinstance(num_shards, int)
+    assert valid and 0 <= shard_index < num_shards, info
+    return get_shards(values, num_shards) == shard_index
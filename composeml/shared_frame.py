@@ -0,0 +1,155 @@
+import pickle
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# the data frame most recently attached in a worker process
+_attached = {}
+
+
+class SharedFrame:
+    """Publishes the columns of a data frame to shared memory for worker processes.
+
+    Columns with a NumPy data type are copied once to a shared memory block and
+    workers create views of the blocks without copying. Timestamps with a time zone are stored as nanoseconds.
+    Other columns are pickled once to a shared memory block and unpickled once in each worker.
+    The handle is a small description of the blocks that is sent to workers instead of the data frame.
+
+    Args:
+        df (DataFrame): Data frame to publish.
+    """
+
+    def __init__(self, df):
+        self._blocks = []
+        columns = [self._publish(df[column]) for column in df.columns]
+
+        self.handle = {
+            "token": uuid.uuid4().hex,
+            "columns": list(zip(df.columns, columns)),
+            "index": self._publish(df.index),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releases the shared memory blocks. Workers that attached the data frame keep their views."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+        self._blocks.clear()
+
+    def _publish(self, values):
+        """Copies the values of a column or index to a shared memory block and returns how to read them."""
+        name = values.name
+        dtype = values.dtype
+        tz = getattr(dtype, "tz", None)
+
+        if tz is not None:
+            values = pd.DatetimeIndex(values).tz_convert("UTC").tz_localize(None)
+            dtype = values.dtype
+
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            array = values.to_numpy()
+            block = self._create_block(array.nbytes)
+            np.ndarray(array.shape, dtype, buffer=block.buf)[:] = array
+            return "array", block.name, name, dtype.str, len(array), str(tz or "")
+
+        values = values if isinstance(values, pd.Index) else values.array
+        data = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        block = self._create_block(len(data))
+        block.buf[: len(data)] = data
+        return "pickle", block.name, name, None, len(data), ""
+
+    def _create_block(self, size):
+        """Creates a shared memory block that is released when the shared frame is closed."""
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks.append(block)
+        return block
+
+
+def attach_frame(handle):
+    """Creates the data frame from the shared memory blocks of a handle.
+
+    The data frame is kept in the worker, so later tasks with the same handle do not read the blocks again.
+    The data frame of a previous handle is released.
+
+    Args:
+        handle (dict): The handle of a shared frame.
+
+    Returns:
+        df (DataFrame): Data frame with views of the shared memory blocks.
+    """
+    token = handle["token"]
+    if token in _attached:
+        return _attached[token][1]
+
+    release_frames()
+    blocks = []
+    index = pd.Index(_read(handle["index"], blocks), copy=False)
+    index.name = handle["index"][2]
+
+    data = {}
+    for name, spec in handle["columns"]:
+        data[name] = _read(spec, blocks)
+
+    df = pd.DataFrame(data, index=index, columns=list(data), copy=False)
+    _attached[token] = blocks, df
+    return df
+
+
+def release_frames():
+    """Releases the data frames attached in the worker."""
+    while _attached:
+        blocks = _attached.popitem()[1][0]
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # a view of the block is still referenced, so the block is closed when the view is released
+                pass
+
+
+def _read(spec, blocks):
+    """Reads the values of a column or index from a shared memory block."""
+    kind, name, label, dtype, size, tz = spec
+    block = _attach_block(name)
+
+    if kind == "pickle":
+        values = pickle.loads(block.buf[:size])
+        block.close()
+        return values
+
+    blocks.append(block)
+    values = np.ndarray(size, np.dtype(dtype), buffer=block.buf)
+    values.flags.writeable = False
+
+    if tz:
+        values = pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(tz)
+
+    return values
+
+
+def _attach_block(name):
+    """Attaches a shared memory block without tracking it in the worker.
+
+    The process that created the block releases it, so the resource tracker of a worker must not release it when the worker exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
@@ -0,0 +1,132 @@
+import json
+import os
+
+import pandas as pd
+
+from composeml.label_times.deserialize import read_config, read_data
+from composeml.version import __version__
+
+SCHEMA_VERSION = "0.1.0"
+
+
+class SlicePlan(pd.DataFrame):
+    """The data frame that contains the boundaries of the data slices for the target dataframe.
+
+    Each row is a data slice with the target dataframe index, slice number, slice start, slice stop,
+    next start, and the positions of the first (``row_start``) and after the last (``row_stop``) row
+    of the data slice among the rows of the target instance ordered by time.
+    """
+
+    def __init__(
+        self,
+        data=None,
+        target_dataframe_index=None,
+        search_settings=None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(data=data, *args, **kwargs)
+        self.target_dataframe_index = target_dataframe_index
+        self.search_settings = search_settings or {}
+
+    @property
+    def settings(self):
+        """Returns metadata about the slice plan."""
+        return {
+            "compose_version": __version__,
+            "schema_version": SCHEMA_VERSION,
+            "slice_plan": {
+                "target_dataframe_index": self.target_dataframe_index,
+                "search_settings": self.search_settings,
+            },
+        }
+
+    def _save_settings(self, path):
+        """Write the settings in json format to disk.
+
+        Args:
+            path (str) : Directory on disk to write to.
+        """
+        settings = self.settings
+        dtypes = self.dtypes.astype("str")
+        settings["dtypes"] = dtypes.to_dict()
+
+        file = os.path.join(path, "settings.json")
+        with open(file, "w") as file:
+            json.dump(settings, file)
+
+    def to_csv(self, path, save_settings=True, **kwargs):
+        """Write the slice plan in csv format to disk.
+
+        Args:
+            path (str) : Location on disk to write to (will be created as a directory).
+            save_settings (bool) : Whether to save the settings used to make the slice plan.
+            **kwargs: Keyword arguments to pass to underlying pandas.DataFrame.to_csv method
+        """
+        os.makedirs(path, exist_ok=True)
+        file = os.path.join(path, "data.csv")
+        super().to_csv(file, index=False, **kwargs)
+
+        if save_settings:
+            self._save_settings(path)
+
+    def to_parquet(self, path, save_settings=True, **kwargs):
+        """Write the slice plan in parquet format to disk.
+
+        Args:
+            path (str) : Location on disk to write to (will be created as a directory).
+            save_settings (bool) : Whether to save the settings used to make the slice plan.
+            **kwargs: Keyword arguments to pass to underlying pandas.DataFrame.to_parquet method
+        """
+        os.makedirs(path, exist_ok=True)
+        file = os.path.join(path, "data.parquet")
+        super().to_parquet(file, compression=None, engine="auto", **kwargs)
+
+        if save_settings:
+            self._save_settings(path)
+
+    def to_pickle(self, path, save_settings=True, **kwargs):
+        """Write the slice plan in pickle format to disk.
+
+        Args:
+            path (str) : Location on disk to write to (will be created as a directory).
+            save_settings (bool) : Whether to save the settings used to make the slice plan.
+            **kwargs: Keyword arguments to pass to underlying pandas.DataFrame.to_pickle method
+        """
+        os.makedirs(path, exist_ok=True)
+        file = os.path.join(path, "data.pickle")
+        super().to_pickle(file, **kwargs)
+
+        if save_settings:
+            self._save_settings(path)
+
+    # ----------------------------------------
+    # Subclassing Pandas Data Frame
+    # ----------------------------------------
+
+    _metadata = ["search_settings", "target_dataframe_index"]
+
+    @property
+    def _constructor(self):
+        return SlicePlan
+
+
+def read_slice_plan(path, load_settings=True):
+    """Reads a slice plan from disk.
+
+    Args:
+        path (str): Directory where the slice plan is stored.
+
+    Returns:
+        plan (SlicePlan): Deserialized slice plan.
+    """
+    kwargs = {}
+    data = read_data(path)
+
+    if load_settings:
+        config = read_config(path)
+        data = data.astype(config["dtypes"])
+        kwargs.update(config["slice_plan"])
+
+    plan = SlicePlan(data=data, **kwargs)
+    return plan
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+
+class TargetGroups:
+    """Groups a data frame by the target dataframe index with a single sort.
+
+    The rows are sorted once by target group while keeping their order within each group.
+    Each target group is then a positional view of the sorted data frame between its offsets.
+    """
+
+    def __init__(self, df, target_dataframe_index):
+        """Creates the target groups.
+
+        Args:
+            df (DataFrame): Data frame to group.
+            target_dataframe_index (str): Name of the column to group by. Rows with null values are excluded.
+        """
+        codes, keys = pd.factorize(df[target_dataframe_index], sort=True)
+        if (codes[1:] < codes[:-1]).any():
+            order = np.argsort(codes, kind="stable")
+            df, codes = df.take(order), codes[order]
+
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        self.stops = np.cumsum(counts) + np.count_nonzero(codes < 0)
+        self.starts = self.stops - counts
+        self.df, self.keys, self.codes = df, keys, codes
+        self.target_dataframe_index = target_dataframe_index
+
+    def __getitem__(self, i):
+        """Returns the data frame of the target group at a position."""
+        return self.df.iloc[self.starts[i] : self.stops[i]]
+
+    def __iter__(self):
+        """Iterates the key and data frame of each target group."""
+        for key, start, stop in zip(self.keys, self.starts, self.stops):
+            yield key, self.df.iloc[start:stop]
+
+    def __len__(self):
+        """Returns the number of target groups."""
+        return len(self.keys)
+
+    @property
+    def ngroups(self):
+        """Alias for the number of target groups."""
+        return len(self)
+
+    def check_index(self):
+        """Checks if index values are null or unsorted within the target groups."""
+        start = np.count_nonzero(self.codes < 0)
+        index, codes = self.df.index[start:], self.codes[start:]
+        null = index.isnull().any()
+        assert not null, "index contains null values"
+
+        values = index.values
+        same_group = codes[1:] == codes[:-1]
+        unsorted = same_group & (values[1:] < values[:-1])
+        assert not unsorted.any(), "data frame must be sorted chronologically"
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from composeml import LabelMaker
+from composeml.aggregation import WindowAggregation
+
+
+@pytest.fixture
+def df():
+    data = {
+        "time": pd.date_range("2019-01-01", periods=12, freq="1h"),
+        "customer_id": [0, 1, 0, 1, 2, 0, 1, 0, 2, 2, 0, 1],
+        "amount": [1, 4, 2, 8, 3, 5, 7, 6, 9, 0, 2, 1],
+        "price": [1.5, np.nan, 0.1, 0.2, np.nan, 2.5, 0.3, 0.7, 1.1, np.nan, 4.0, 0.1],
+        "flag": [i % 3 != 1 for i in range(12)],
+        "category": list("abcabcabcabc"),
+    }
+
+    df = pd.DataFrame(data)
+    df.category = df.category.astype("category")
+    return df
+
+
+def search(df, labeling_function, **kwargs):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=labeling_function,
+        window_size="3h",
+    )
+
+    kwargs.setdefault("num_examples_per_instance", -1)
+    return lm.search(df, verbose=False, **kwargs)
+
+
+@pytest.mark.parametrize("column", ["amount", "price", "flag"])
+@pytest.mark.parametrize("function", WindowAggregation.functions)
+def test_matches_labeling_function(df, column, function):
+    def aggregate(ds):
+        return getattr(ds[column], function)()
+
+    lt = search(df, {"label": (column, function)}, gap="1h", drop_empty=False)
+    expected = search(df, {"label": aggregate}, gap="1h", drop_empty=False)
+    pd.testing.assert_frame_equal(lt, expected)
+
+
+def test_labeling_function_names(df):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=[("amount", "sum"), ("price", "max")],
+        window_size="3h",
+    )
+
+    assert list(lm.labeling_function) == ["amount_sum", "price_max"]
+    function = lm.labeling_function["amount_sum"]
+    assert repr(function) == "WindowAggregation(column='amount', function='sum')"
+
+
+def test_search_limits(df):
+    labeling_function = {"total": ("amount", "sum"), "n": ("category", "nunique")}
+    kwargs = {"minimum_data": "2h", "maximum_data": "8h", "gap": 2}
+    lt = search(df, labeling_function, num_examples_per_instance=1, **kwargs)
+
+    def total(ds):
+        return ds.amount.sum()
+
+    def n(ds):
+        return ds.category.nunique()
+
+    labeling_function = {"total": total, "n": n}
+    expected = search(df, labeling_function, num_examples_per_instance=1, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+
+
+def test_search_by_label(df):
+    labeling_function = {"total": ("amount", "max")}
+    num_examples_per_instance = {1: 1, 8: 2}
+    lt = search(
+        df, labeling_function, num_examples_per_instance=num_examples_per_instance
+    )
+
+    def total(ds):
+        return ds.amount.max()
+
+    labeling_function = {"total": total}
+    expected = search(
+        df, labeling_function, num_examples_per_instance=num_examples_per_instance
+    )
+    pd.testing.assert_frame_equal(lt, expected)
+
+
+def test_not_vectorized(df):
+    df.amount = df.amount.astype("Int64")
+    aggregation = WindowAggregation("amount", "sum")
+    assert not aggregation.is_vectorized(df)
+
+    lt = search(df, {"label": ("amount", "sum")})
+    assert lt.label.tolist() == search(df, {"label": aggregation}).label.tolist()
+
+
+def test_nunique_blocks(df):
+    # the data slices overlap and are expanded in blocks of a few rows
+    row_start = np.array([0, 2, 1, 5, 5, 0, 11])
+    row_stop = np.array([4, 9, 12, 5, 8, 12, 12])
+    aggregation = WindowAggregation("price", "nunique")
+    labels, _ = aggregation._calculate_nunique(df.price, row_start, row_stop, 3)
+
+    expected = [df.price.iloc[i:j].nunique() for i, j in zip(row_start, row_stop)]
+    assert labels.tolist() == expected
+
+
+def test_invalid_function():
+    match = "aggregation must be one of: count, max, mean, min, nunique, sum"
+    with pytest.raises(AssertionError, match=match):
+        WindowAggregation("amount", "median")
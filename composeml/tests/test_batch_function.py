@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+
+from composeml import LabelMaker, batch
+
+
+@pytest.fixture
+def df():
+    data = {
+        "time": pd.date_range("2019-01-01", periods=12, freq="20min"),
+        "customer_id": [0, 1, 0, 1, 2, 0, 1, 0, 2, 2, 0, 1],
+        "amount": [1.5, 4, 2, 8, 3, 5, 7, 6, 9, 0, 2, 1],
+    }
+
+    return pd.DataFrame(data)
+
+
+def search(df, labeling_function, window_size="1h", **kwargs):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=labeling_function,
+        window_size=window_size,
+    )
+
+    kwargs.setdefault("num_examples_per_instance", -1)
+    return lm.search(df, verbose=False, **kwargs)
+
+
+def total_spent(ds):
+    return ds.amount.sum()
+
+
+@batch
+def total_spent_batch(df, windows):
+    return df.groupby("window_id").amount.sum()
+
+
+@pytest.mark.parametrize("gap", [None, "20min", "2h"])
+@pytest.mark.parametrize("num_examples_per_instance", [-1, 2])
+def test_matches_labeling_function(df, gap, num_examples_per_instance):
+    kwargs = {"gap": gap, "num_examples_per_instance": num_examples_per_instance}
+    lt = search(df, {"total": total_spent_batch}, **kwargs)
+    expected = search(df, {"total": total_spent}, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+
+
+def test_batch_size(df):
+    batches = []
+
+    @batch(batch_size=3)
+    def total_spent(df, windows, scale=1):
+        batches.append(windows)
+        return df.groupby("window_id").amount.sum().mul(scale).tolist()
+
+    lt = search(df, {"total": total_spent}, gap="20min", scale=2)
+    expected = search(df, {"total": total_spent_batch}, gap="20min")
+    assert lt.total.tolist() == expected.total.mul(2).tolist()
+
+    assert all(len(windows) <= 3 for windows in batches)
+    windows = pd.concat(batches)
+    assert windows.index.tolist() == list(range(len(expected)))
+
+    columns = ["customer_id", "slice_number", "slice_start", "slice_stop"]
+    assert windows.columns.tolist() == columns
+    assert windows.slice_start.tolist() == expected.time.tolist()
+
+
+def test_single_data_slice(df):
+    labeling_function = {"total": total_spent_batch}
+    lt = search(df, labeling_function, n_jobs=2, executor="thread")
+    expected = search(df, labeling_function)
+    pd.testing.assert_frame_equal(lt, expected)
+
+    lm = LabelMaker("customer_id", "time", labeling_function, window_size="1h")
+    for ds in lm.slice(df, num_examples_per_instance=1):
+        assert total_spent_batch(ds) == ds.amount.sum()
+
+
+def test_missing_labels(df):
+    @batch
+    def large_total(df, windows):
+        total = df.groupby("window_id").amount.sum()
+        return total[total > 5]
+
+    lt = search(df, {"total": large_total})
+    assert lt.total.gt(5).all()
+
+    expected = search(df, {"total": total_spent})
+    assert lt.total.tolist() == expected.total[expected.total > 5].tolist()
+
+
+def test_invalid_labels(df):
+    @batch
+    def first_label(df, windows):
+        return [0]
+
+    match = "batch labeling function must return one label for each data slice"
+    with pytest.raises(AssertionError, match=match):
+        search(df, {"first": first_label})
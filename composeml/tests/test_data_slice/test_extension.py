@@ -1,7 +1,11 @@
+import pickle
+
+import numpy as np
 import pandas as pd
 from pytest import fixture, mark, raises
 
 from composeml import LabelMaker
+from composeml.data_slice.extension import DataSliceArrays
 
 
 @fixture
@@ -96,3 +100,109 @@ def test_drop_empty(transactions):
     )
 
     assert len(list(ds)) == 5
+
+
+def test_time_slices_match_boolean_masks():
+    index = pd.date_range("2019-01-01", periods=12, freq="20min").repeat(2)
+    df = pd.DataFrame({"value": range(24)}, index=index)
+    slices = df.slice(size="1h", start="2019-01-01 00:30:00", step="30min")
+
+    for ds in slices:
+        start, stop = ds.context.slice_start, ds.context.slice_stop
+        expected = df[(df.index >= start) & (df.index < stop)]
+        assert ds.context.next_start == start + pd.Timedelta("30min")
+        pd.testing.assert_frame_equal(pd.DataFrame(ds), expected)
+
+
+def test_skip_empty_slices_on_sparse_data():
+    index = ["2019-01-01 00:00:30", "2019-07-01 12:00:10", "2021-01-01 00:00:00"]
+    df = pd.DataFrame({"value": [1, 2, 3]}, index=pd.to_datetime(index))
+    slices = df.slice(size="2min", step="1min", drop_empty=True)
+    actual = [str(ds.context).splitlines() + [len(ds)] for ds in slices]
+
+    expected = [
+        ["2019-01-01 00:00:30", "2019-01-01 00:02:30", "2019-01-01 00:01:30", 1],
+        ["2019-07-01 11:58:30", "2019-07-01 12:00:30", "2019-07-01 11:59:30", 1],
+        ["2019-07-01 11:59:30", "2019-07-01 12:01:30", "2019-07-01 12:00:30", 1],
+        ["2020-12-31 23:58:30", "2021-01-01 00:00:30", "2020-12-31 23:59:30", 1],
+        ["2020-12-31 23:59:30", "2021-01-01 00:01:30", "2021-01-01 00:00:30", 1],
+    ]
+
+    expected = [
+        [
+            f"slice_number                      {number}",
+            f"slice_start     {start}",
+            f"slice_stop      {stop}",
+            f"next_start      {next_start}",
+            size,
+        ]
+        for number, (start, stop, next_start, size) in enumerate(expected, start=1)
+    ]
+
+    assert actual == expected
+
+
+def test_bounds_with_time_zone():
+    index = pd.date_range("2019-01-01", periods=6, freq="40min", tz="US/Eastern")
+    df = pd.DataFrame({"value": range(6)}, index=index)
+    bounds = list(df.slice.bounds(size="1h", step="30min"))
+    slices = df.slice(size="1h", step="30min")
+    assert len(bounds) == 7
+
+    for (number, start, stop, next_start, i, j), ds in zip(bounds, slices):
+        assert str(start.tz) == str(index.tz)
+        assert [number, start, stop, next_start] == list(ds.context._series)
+        assert ds.value.tolist() == df.value.iloc[i:j].tolist()
+
+
+@mark.parametrize("tz", [None, "US/Eastern"])
+@mark.parametrize("step", ["30min", 2])
+def test_bound_columns(tz, step):
+    index = pd.date_range("2019-01-01", periods=6, freq="40min", tz=tz)
+    df = pd.DataFrame({"value": range(6)}, index=index)
+    columns = df.slice.bound_columns(size="1h", step=step)
+    bounds = list(df.slice.bounds(size="1h", step=step))
+    assert [list(column) for column in columns] == list(map(list, zip(*bounds)))
+
+
+def test_data_slice_arrays(data_slice):
+    ds = DataSliceArrays.from_frame(data_slice)
+    assert ds.context is data_slice.context
+    assert ds.ctx is data_slice.context
+    assert list(ds) == data_slice.columns.tolist()
+    assert len(ds) == len(data_slice.columns)
+    assert ds.num_rows == len(data_slice)
+    assert (ds.index == data_slice.index.values).all()
+    assert (ds["amount"] == data_slice["amount"].values).all()
+    assert repr(ds).startswith("DataSliceArrays(rows=%d" % len(data_slice))
+
+    arrays = {"amount": np.arange(10.0)}
+    ds = DataSliceArrays(arrays, np.arange(10), 2, 5)
+    assert np.shares_memory(ds["amount"], arrays["amount"])
+    assert ds["amount"].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_context_slots(data_slice):
+    context = data_slice.context
+    assert context.customer_id == 0
+
+    context._set_attribute("session", 1)
+    assert context.session == 1
+    assert list(context._series.index[:2]) == ["session", "customer_id"]
+
+    context.note = "x"
+    context.customer_id = 4
+    assert context.note == "x"
+    assert context.customer_id == 4
+    assert context._series.index.tolist().count("customer_id") == 1
+    assert context._series["customer_id"] == 4
+
+    with raises(AttributeError, match="has no attribute 'missing'"):
+        context.missing
+
+    copied = pickle.loads(pickle.dumps(context))
+    assert str(copied) == str(context)
+
+    del copied.next_start
+    assert not hasattr(copied, "next_start")
+    assert "next_start" not in copied._series
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from composeml.data_slice import DataSliceGenerator
+from composeml.data_slice.offset import DataSliceOffset
+
+
+def test_offsets_are_parsed_once():
+    index = pd.date_range("2019-01-01", periods=6, freq="20min")
+    df = pd.DataFrame({"value": range(6)}, index=index)
+
+    cache = {}
+    kwargs = {"window_size": "1h", "gap": "40min", "cache": cache}
+    generator = DataSliceGenerator(min_data="20min", **kwargs)
+    other = DataSliceGenerator(min_data="2019-01-01 00:40", **kwargs)
+    assert len(cache) == 0
+
+    for _ in range(2):
+        slices = [ds.context.slice_start for ds in generator(df)]
+        assert slices == [index[1], index[3], index[5]]
+
+    assert list(other.bounds(df))[0][-2:] == (2, 5)
+    assert len(cache) == 4
+
+    offsets = generator._get_offsets()
+    assert isinstance(offsets["start"], DataSliceOffset)
+    assert offsets["start"] is not generator._get_offsets()["start"]
+    assert offsets["size"].value == pd.offsets.Hour()
@@ -0,0 +1,276 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from composeml import LabelMaker, batch
+from composeml.executor import get_executor, iter_batches, iter_futures, split_batches
+
+
+def total_spent(df):
+    return df.amount.sum()
+
+
+@pytest.fixture
+def lm():
+    return LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent,
+        window_size=2,
+    )
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [1, -1, {3: 1, 1: -1}])
+def test_search_process_pool(transactions, lm, num_examples_per_instance):
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": 1,
+        "gap": 1,
+        "verbose": False,
+    }
+
+    expected = lm.search(transactions, **kwargs)
+    actual = lm.search(transactions, n_jobs=2, **kwargs)
+    assert actual.equals(expected)
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [1, -1, {3: 1, 1: -1}])
+def test_search_shared_memory(transactions, lm, num_examples_per_instance):
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": 1,
+        "gap": 1,
+        "verbose": False,
+    }
+
+    expected = lm.search(transactions, **kwargs)
+    actual = lm.search(transactions, n_jobs=2, shared_memory=True, **kwargs)
+    assert actual.equals(expected)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("num_examples_per_instance", [2, -1, {3: 1, 1: -1}])
+def test_search_split_groups(transactions, lm, executor, num_examples_per_instance):
+    # the rows of one customer dominate the cost of the search
+    skewed = transactions.assign(customer_id=[0, 0, 1, 1, 1, 1, 1, 1, 1, 2])
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": 1,
+        "gap": 1,
+        "verbose": False,
+    }
+
+    expected = lm.search(skewed, **kwargs)
+    actual = lm.search(
+        skewed,
+        n_jobs=2,
+        executor=executor,
+        split_groups=True,
+        shared_memory=executor == "process",
+        **kwargs,
+    )
+    assert actual.equals(expected)
+
+
+@pytest.mark.parametrize("split_groups", [False, True])
+@pytest.mark.parametrize("num_examples_per_instance", [2, -1, {3: 1, 1: -1}])
+def test_search_bounded_parts(
+    transactions, lm, split_groups, num_examples_per_instance
+):
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": 1,
+        "gap": 1,
+        "verbose": False,
+    }
+
+    expected = lm.search(transactions, **kwargs)
+    lm.max_batch_size = 1
+    lm.window_chunk_size = 1
+    actual = lm.search(
+        transactions,
+        n_jobs=2,
+        executor="thread",
+        split_groups=split_groups,
+        **kwargs,
+    )
+    assert actual.equals(expected)
+
+
+def test_search_bounded_windows(transactions):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total": ("amount", "sum")},
+        window_size=2,
+    )
+
+    expected = lm.search(transactions, -1, gap=1, verbose=False)
+    lm.window_chunk_size = 1
+    actual = lm.search(transactions, -1, gap=1, verbose=False)
+    assert actual.equals(expected)
+
+
+def total_spent_windows(df, windows):
+    return df.groupby("window_id").amount.sum()
+
+
+# keeps the module function picklable for process pools
+total_spent_batch = batch(total_spent_windows)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("labeling_function", [total_spent, total_spent_batch])
+def test_search_split_groups_shuffle(lm, executor, labeling_function):
+    # the tasks hold data slices of target groups that are not next to each other
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2019-01-01", periods=80, freq="30min"),
+            "customer_id": [i % 40 for i in range(80)],
+            "amount": range(80),
+        }
+    )
+
+    lm.labeling_function = {"total_spent": labeling_function}
+    kwargs = {
+        "num_examples_per_instance": -1,
+        "minimum_data": 1,
+        "gap": 1,
+        "shuffle": True,
+        "random_state": 0,
+        "verbose": False,
+    }
+
+    expected = lm.search(df, **kwargs)
+    actual = lm.search(
+        df,
+        n_jobs=2,
+        executor=executor,
+        split_groups=True,
+        shared_memory=executor == "process",
+        **kwargs,
+    )
+    assert actual.equals(expected)
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [1, {3: 1}])
+def test_search_split_groups_stops_complete_groups(lm, num_examples_per_instance):
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2019-01-01", periods=200, freq="1min"),
+            "customer_id": 0,
+            "amount": 1,
+        }
+    )
+
+    calls = []
+
+    def total_spent(ds):
+        calls.append(len(ds))
+        return ds.amount.sum() + 1
+
+    lm.labeling_function = {"total_spent": total_spent}
+    kwargs = {"minimum_data": 1, "gap": 1, "verbose": False}
+    lt = lm.search(
+        df,
+        num_examples_per_instance,
+        n_jobs=1,
+        executor="thread",
+        split_groups=True,
+        **kwargs,
+    )
+
+    assert lt.total_spent.tolist() == [3]
+
+    # the first two of four tasks are submitted before the group has an example
+    assert len(calls) <= 100
+
+
+def test_search_split_groups_column_window(transactions, lm):
+    lm.window_size = "customer_id"
+    match = "splitting target groups requires a time-based window size"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(transactions, -1, n_jobs=2, split_groups=True, verbose=False)
+
+
+def test_search_executor_instance(transactions, lm):
+    expected = lm.search(transactions, -1, gap=1, verbose=False)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        actual = lm.search(transactions, -1, gap=1, verbose=False, executor=executor)
+
+    assert actual.equals(expected)
+
+
+def test_split_batches():
+    batches = split_batches(list(range(10)), n_jobs=2, batches_per_job=2)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    assert split_batches([], n_jobs=2) == []
+
+
+def test_iter_batches():
+    items = iter(range(5))
+    batches = iter_batches(items, batch_size=2)
+    assert next(batches) == [0, 1]
+    assert next(items) == 2
+    assert list(batches) == [[3, 4]]
+
+
+def test_iter_futures():
+    submitted = []
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+
+        def submit(item):
+            submitted.append(item)
+            return executor.submit(pow, item, 2)
+
+        futures = iter_futures(range(10), submit, max_pending=3)
+        item, future = next(futures)
+        assert (item, future.result()) == (0, 0)
+        assert submitted == [0, 1, 2]
+
+        results = [future.result() for _, future in futures]
+        assert results == [item**2 for item in range(1, 10)]
+
+        futures = iter_futures(range(10), submit, max_pending=3)
+        next(futures)
+        futures.close()
+        assert len(submitted) == 13
+
+
+def test_executor_errors():
+    with pytest.raises(AssertionError, match="executor must be"):
+        get_executor("cluster")
+
+    with pytest.raises(AssertionError, match="n_jobs must be"):
+        get_executor("process", n_jobs=0)
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [2, {3: 1, 1: -1}])
+def test_search_thread_pool(transactions, lm, num_examples_per_instance):
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "gap": 1,
+        "verbose": False,
+    }
+
+    expected = lm.search(transactions, **kwargs)
+    actual = lm.search(transactions, n_jobs=2, executor="thread", **kwargs)
+    assert actual.equals(expected)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("max_batch_size", [1, 1000])
+def test_slice_parallel(transactions, lm, executor, max_batch_size):
+    lm.max_batch_size = max_batch_size
+    minimum_data = {1: 1, 2: 0, 3: 0}
+    kwargs = {"num_examples_per_instance": 2, "minimum_data": minimum_data, "gap": 1}
+    expected = list(lm.slice(transactions, **kwargs))
+    actual = list(lm.slice(transactions, n_jobs=2, executor=executor, **kwargs))
+    assert len(actual) == len(expected)
+
+    for a, b in zip(actual, expected):
+        assert a.equals(b)
+        assert str(a.context) == str(b.context)
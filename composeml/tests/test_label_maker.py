@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from composeml import LabelMaker
+from composeml import LabelMaker, batch, read_label_times, uses_columns
 from composeml.tests.utils import to_csv
 
 
@@ -621,3 +622,588 @@ def test_label_maker_categorical_target_with_missing_data(transactions, total_sp
     )
     # use on only the first 8 rows so the df will not contain data for customer 3
     lm.search(transactions.head(8), -1)
+
+
+@pytest.mark.parametrize("executor", [None, "thread"])
+def test_search_iter(transactions, total_spent_fn, executor):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size=2,
+    )
+
+    kwargs = {"num_examples_per_instance": -1, "gap": 1, "verbose": False}
+    if executor:
+        kwargs.update(n_jobs=2, executor=executor)
+
+    batches = list(lm.search_iter(transactions, batch_size=4, **kwargs))
+    assert [len(lt) for lt in batches] == [4, 4, 2]
+
+    expected = lm.search(transactions, **kwargs)
+    for lt in batches:
+        assert lt.target_columns == expected.target_columns
+        assert lt.search_settings == expected.search_settings
+
+    actual = pd.concat(batches, ignore_index=True)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_search_iter_batch_size(transactions, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+    )
+
+    match = "batch size must be a positive integer"
+    with pytest.raises(AssertionError, match=match):
+        next(lm.search_iter(transactions, 1, batch_size=0))
+
+
+@pytest.fixture
+def events():
+    data = {
+        "time": pd.date_range("2019-01-01", periods=60, freq="25min"),
+        "customer_id": [0, 1, 0, 2, 1, 0] * 10,
+        "amount": [float(i % 7) for i in range(60)],
+    }
+
+    return pd.DataFrame(data)
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [-1, 3, {4.0: 2, 9.0: 1}])
+@pytest.mark.parametrize("gap", [None, "30min"])
+def test_update(events, total_spent_fn, num_examples_per_instance, gap):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="2h",
+    )
+
+    kwargs = {"num_examples_per_instance": num_examples_per_instance, "gap": gap}
+    previous = events[events.time < "2019-01-01 12:00"]
+    lt = lm.search(previous, verbose=False, **kwargs)
+    expected = lm.search(events, verbose=False, **kwargs)
+
+    actual = lm.update(events, lt, verbose=False)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.search_settings == expected.search_settings
+
+
+def test_update_uses_rows_after_watermark(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="2h",
+    )
+
+    kwargs = {"num_examples_per_instance": -1, "gap": "1h", "verbose": False}
+    lt = lm.search(events[events.time < "2019-01-01 12:00"], **kwargs)
+    expected = lm.search(events, **kwargs)
+
+    # the data slices that end after the watermark start one hour before it
+    watermark = lt.groupby("customer_id").time.max()
+    start = events.customer_id.map(watermark) - pd.Timedelta("1h")
+    actual = lm.update(events[events.time >= start], lt, verbose=False)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_update_requires_fixed_offsets(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="2h",
+    )
+
+    lt = lm.search(events, num_examples_per_instance=-1, gap=2, verbose=False)
+    match = "updating labels requires a fixed time-based window size and gap"
+    with pytest.raises(AssertionError, match=match):
+        lm.update(events, lt, verbose=False)
+
+
+@pytest.mark.parametrize("executor", [None, "thread"])
+def test_search_checkpoint(events, tmp_path, executor):
+    calls, fail = [], []
+
+    def total_spent(df):
+        calls.append(df)
+        if fail and len(calls) > 30:
+            raise RuntimeError("search interrupted")
+        return df.amount.sum()
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent,
+        window_size="1h",
+    )
+
+    kwargs = {"num_examples_per_instance": -1, "verbose": False}
+    if executor:
+        kwargs.update(n_jobs=2, executor=executor)
+
+    expected = lm.search(events, **kwargs)
+    checkpoint = {"checkpoint": str(tmp_path), "checkpoint_size": 1}
+
+    calls.clear()
+    fail.append(True)
+    with pytest.raises(RuntimeError, match="search interrupted"):
+        lm.search(events, **checkpoint, **kwargs)
+
+    # the first target group was saved before the search was interrupted
+    calls.clear()
+    fail.clear()
+    lt = lm.search(events, **checkpoint, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+    assert lt.search_settings == expected.search_settings
+    assert len(calls) == len(expected) - 20
+
+    # the target groups in the checkpoint are not searched again
+    calls.clear()
+    lt = lm.search(events, **checkpoint, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+    assert not calls
+
+
+def test_search_checkpoint_settings(events, total_spent_fn, tmp_path):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    kwargs = {"checkpoint": str(tmp_path), "verbose": False}
+    lm.search(events, num_examples_per_instance=-1, **kwargs)
+
+    match = "checkpoint was saved by a search with different settings or data"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(events, num_examples_per_instance=1, **kwargs)
+
+
+def test_search_checkpoint_object_column(events, total_spent_fn, tmp_path):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    # the lists of the column are not hashable
+    events = events.assign(tags=[[i, {"n": i}] for i in range(len(events))])
+    kwargs = {"num_examples_per_instance": -1, "verbose": False}
+    expected = lm.search(events, **kwargs)
+
+    kwargs["checkpoint"] = str(tmp_path)
+    pd.testing.assert_frame_equal(lm.search(events, **kwargs), expected)
+    pd.testing.assert_frame_equal(lm.search(events, **kwargs), expected)
+
+    events.at[0, "tags"] = [-1]
+    match = "checkpoint was saved by a search with different settings or data"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(events, **kwargs)
+
+
+def test_prepare(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    data = lm.prepare(events)
+    assert lm.prepare(data) is data
+    assert data.is_index_checked
+
+    kwargs = {"num_examples_per_instance": 2, "gap": "30min", "verbose": False}
+    pd.testing.assert_frame_equal(
+        lm.search(data, **kwargs), lm.search(events, **kwargs)
+    )
+
+    kwargs = {"num_examples_per_instance": -1, "shard_index": 1, "num_shards": 2}
+    expected = lm.search(events, verbose=False, **kwargs)
+    pd.testing.assert_frame_equal(lm.search(data, verbose=False, **kwargs), expected)
+
+    plan = lm.plan(data, -1)
+    pd.testing.assert_frame_equal(plan, lm.plan(events, -1))
+    pd.testing.assert_frame_equal(
+        lm.label(data, plan, verbose=False), lm.label(events, plan, verbose=False)
+    )
+
+    expected = list(lm.slice(events, 1))
+    actual = list(lm.slice(data, 1))
+    assert len(actual) == len(expected)
+    for a, b in zip(actual, expected):
+        assert a.equals(b)
+
+    # the prepared data is reused by label makers with other windows and labeling functions
+    lm.window_size = "2h"
+    lm.labeling_function = [("amount", "max")]
+    expected = lm.search(events, -1, verbose=False)
+    pd.testing.assert_frame_equal(lm.search(data, -1, verbose=False), expected)
+
+
+def test_prepare_errors(transactions, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size=2,
+    )
+
+    match = "data frame must be sorted chronologically"
+    with pytest.raises(AssertionError, match=match):
+        lm.prepare(transactions.sample(n=10, random_state=0))
+
+    data = lm.prepare(transactions)
+    lm.target_dataframe_index = "amount"
+    match = "prepared data must have the same target dataframe index and time index"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(data, -1, verbose=False)
+
+
+def test_sweep(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    configs = {
+        "default": {},
+        "wide": {"window_size": "3h", "gap": "1h", "num_examples_per_instance": 2},
+        "late": {"minimum_data": "2019-01-01 10:00", "drop_empty": False},
+        "rows": {"window_size": 4, "gap": 2, "num_examples_per_instance": {4.0: 1}},
+    }
+
+    actual = lm.sweep(events, configs, num_examples_per_instance=-1, verbose=False)
+    assert list(actual) == list(configs)
+
+    for name, config in configs.items():
+        config = config.copy()
+        lm.window_size = config.pop("window_size", "1h")
+        config.setdefault("num_examples_per_instance", -1)
+        expected = lm.search(events, verbose=False, **config)
+        pd.testing.assert_frame_equal(actual[name], expected)
+        assert actual[name].search_settings == expected.search_settings
+
+
+def test_sweep_configs_list(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    configs = [
+        {"window_size": "2h", "gap": "1h"},
+        {"window_size": "1h"},
+        {"num_examples_per_instance": {4.0: 1}},
+        {"minimum_data": pd.Series({0: "2019-01-01 10:00"})},
+        {"window_size": "1h"},
+    ]
+
+    actual = lm.sweep(events, configs, verbose=False)
+    assert list(actual) == [0, 1, 2, 3, 4]
+
+    for i, config in enumerate(configs):
+        config = config.copy()
+        lm.window_size = config.pop("window_size", "1h")
+        config.setdefault("num_examples_per_instance", -1)
+        expected = lm.search(events, verbose=False, **config)
+        pd.testing.assert_frame_equal(actual[i], expected)
+
+    lm.window_size = "1h"
+
+    match = "configuration has unknown settings: size"
+    with pytest.raises(AssertionError, match=match):
+        lm.sweep(events, [{"size": "1h"}], verbose=False)
+
+
+@pytest.mark.parametrize("labeling_function", ["total_spent", ("amount", "sum")])
+def test_search_quota(events, total_spent_fn, labeling_function):
+    calls = []
+
+    def total_spent(df):
+        calls.append(getattr(df.context, "customer_id"))
+        return total_spent_fn(df)
+
+    if labeling_function == "total_spent":
+        labeling_function = total_spent
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total_spent": labeling_function},
+        window_size="1h",
+    )
+
+    expected = lm.search(events, -1, verbose=False)
+    calls.clear()
+
+    # the search stops visiting target groups when the quota is met
+    actual = lm.search(events, -1, quota=3, verbose=False)
+    pd.testing.assert_frame_equal(actual, expected.head(3))
+    assert set(calls) <= {0}
+
+    actual = lm.search(events, -1, quota={4.0: 2, 9.0: 1}, verbose=False)
+    found = [expected[expected.total_spent == 4.0].head(2)]
+    found.append(expected[expected.total_spent == 9.0].head(1))
+    expected = pd.concat(found).sort_index().reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_search_shuffle(events, total_spent_fn):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    kwargs = {"num_examples_per_instance": 2, "verbose": False, "random_state": 0}
+    expected = lm.search(events, **kwargs)
+    actual = lm.search(events, shuffle=True, **kwargs)
+    assert actual.customer_id.unique().tolist() == [2, 1, 0]
+
+    actual = actual.sort_values(["customer_id", "time"], kind="stable")
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected)
+
+    actual = lm.search(events, shuffle=True, quota=2, **kwargs)
+    assert actual.customer_id.tolist() == [2, 2]
+
+    match = "global quotas require a serial search"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(events, -1, quota=2, n_jobs=2, executor="thread", verbose=False)
+
+
+@batch
+def batch_has_rows(df, windows):
+    counts = df.groupby("window_id").size()
+    return counts.reindex(windows.index, fill_value=0) >= 2
+
+
+@pytest.mark.parametrize("labeling_function", ["total_spent", ("amount", "sum")])
+@pytest.mark.parametrize("slice_filter", ["has_rows", "batch_has_rows"])
+@pytest.mark.parametrize(
+    "search_kwargs",
+    [
+        {},
+        {"n_jobs": 2, "executor": "thread"},
+        {"n_jobs": 2, "executor": "thread", "split_groups": True},
+    ],
+)
+def test_search_slice_filter(
+    events, total_spent_fn, labeling_function, slice_filter, search_kwargs
+):
+    sizes = []
+
+    def total_spent(ds):
+        sizes.append(len(ds))
+        return total_spent_fn(ds)
+
+    def has_rows(ds):
+        return len(ds) >= 2
+
+    def labeled_rows(ds):
+        return total_spent_fn(ds) if len(ds) >= 2 else None
+
+    if labeling_function == "total_spent":
+        labeling_function = total_spent
+
+    slice_filter = {"has_rows": has_rows, "batch_has_rows": batch_has_rows}[
+        slice_filter
+    ]
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total_spent": labeling_function},
+        window_size="2h",
+        slice_filter=slice_filter,
+    )
+
+    actual = lm.search(events, 2, verbose=False, **search_kwargs)
+    statistics = lm.search_statistics
+    lm.slice_filter, lm.labeling_function = None, {"total_spent": labeled_rows}
+    expected = lm.search(events, 2, verbose=False)
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert min(sizes, default=2) >= 2
+    assert statistics["target_groups"] == 3
+    assert statistics["labels"] == len(expected)
+    assert statistics["filtered_slices"] == 10
+
+
+def test_slice_filter_callable():
+    with pytest.raises(AssertionError, match="slice filter must be callable"):
+        LabelMaker("customer_id", "time", slice_filter="has_rows")
+
+
+def test_search_columns(events, total_spent_fn):
+    events = events.assign(note=["x" * 100] * len(events))
+    columns = []
+
+    @uses_columns("amount")
+    def total_spent(ds):
+        columns.append(ds.columns.tolist())
+        return total_spent_fn(ds)
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total_spent": total_spent},
+        window_size="1h",
+    )
+
+    actual = lm.search(events, 2, verbose=False)
+    assert columns and all(c == ["customer_id", "amount"] for c in columns)
+
+    columns.clear()
+    data = LabelMaker("customer_id", "time").prepare(events)
+    pd.testing.assert_frame_equal(lm.search(data, 2, verbose=False), actual)
+    assert columns and all(c == ["customer_id", "amount"] for c in columns)
+    assert data.df.columns.tolist() == ["customer_id", "amount", "note"]
+
+    columns.clear()
+    lm.labeling_function = {"total_spent": lambda ds: total_spent(ds)}
+    expected = lm.search(events, 2, verbose=False)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert columns and all(c == ["customer_id", "amount", "note"] for c in columns)
+
+    columns.clear()
+    lm.columns = ["amount"]
+    pd.testing.assert_frame_equal(lm.search(events, 2, verbose=False), actual)
+    assert columns and all(c == ["customer_id", "amount"] for c in columns)
+
+    lm.columns = ["price"]
+    with pytest.raises(AssertionError, match="columns are missing from the data frame"):
+        lm.search(events, 2, verbose=False)
+
+
+def test_search_columns_aggregation(events):
+    events = events.assign(note=["x" * 100] * len(events))
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total_spent": ("amount", "sum")},
+        window_size="1h",
+    )
+
+    target_groups = lm._get_target_groups(events)
+    assert target_groups.df.columns.tolist() == ["customer_id", "amount"]
+
+
+def test_slice_columns_without_labeling_function(events):
+    lm = LabelMaker("customer_id", "time", window_size="1h")
+    ds = next(lm.slice(events, 1))
+    assert ds.columns.tolist() == ["customer_id", "amount"]
+
+
+@pytest.mark.parametrize(
+    "search_kwargs",
+    [
+        {},
+        {"n_jobs": 2, "executor": "thread"},
+        {"n_jobs": 2, "executor": "thread", "split_groups": True},
+    ],
+)
+@pytest.mark.parametrize("window_size", ["1h", "session"])
+def test_search_raw(events, search_kwargs, window_size):
+    events = events.assign(session=np.arange(len(events)) // 4)
+    if window_size == "session" and search_kwargs.get("split_groups"):
+        pytest.skip("splitting target groups requires a time-based window size")
+
+    types = set()
+
+    def total_spent(ds):
+        types.add(type(ds).__name__)
+        return float(ds["amount"].sum())
+
+    def has_rows(ds):
+        return len(ds.index) >= 2
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function={"total_spent": total_spent, "max": ("amount", "max")},
+        window_size=window_size,
+        slice_filter=has_rows,
+        raw=True,
+    )
+
+    actual = lm.search(events, 2, verbose=False, **search_kwargs)
+    assert types == {"DataSliceArrays"}
+
+    lm.raw = False
+    expected = lm.search(events, 2, verbose=False)
+    assert types == {"DataSliceArrays", "DataSliceFrame"}
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_search_raw_stops_each_group(events):
+    calls = []
+
+    def total_spent(ds):
+        calls.append(type(ds).__name__)
+        return float(ds["amount"].sum())
+
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent,
+        window_size="1h",
+    )
+
+    expected = lm.search(events, 1, gap="10min", verbose=False)
+    assert calls == ["DataSliceFrame"] * 3
+
+    calls.clear()
+    lm.raw = True
+    actual = lm.search(events, 1, gap="10min", verbose=False)
+    assert calls == ["DataSliceArrays"] * 3
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [-1, {4.0: 2, 9.0: 1}])
+def test_update_saved_label_times(
+    events, total_spent_fn, tmp_path, num_examples_per_instance
+):
+    lm = LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="2h",
+    )
+
+    # a new target group only has data after the previous search
+    new = pd.DataFrame(
+        {
+            "time": pd.date_range("2019-01-01 13:00", periods=6, freq="1h"),
+            "customer_id": 3,
+            "amount": 4.0,
+        }
+    )
+
+    events = pd.concat([events, new]).sort_values("time", kind="stable")
+    minimum_data = pd.Series(["2019-01-01 01:00"] * 3 + ["2019-01-01 14:00"])
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": minimum_data,
+    }
+
+    previous = events[events.time < "2019-01-01 12:00"]
+    lm.search(previous, verbose=False, **kwargs).to_parquet(tmp_path)
+    lt = read_label_times(tmp_path)
+    expected = lm.search(events, verbose=False, **kwargs)
+
+    actual = lm.update(events, lt, verbose=False)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert 3 in actual.customer_id.values
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from composeml.label_times.records import LabelRecords
+
+TIMESTAMPS = pd.date_range("2019-01-01", periods=3, freq="1h").tolist()
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2, np.int64(3)],
+        [1.5, np.nan, np.float64(2)],
+        [np.float32(1.5), np.float32(2), np.float32(3)],
+        [True, False, np.bool_(True)],
+        ["a", "b", "c"],
+        TIMESTAMPS,
+        [ts.tz_localize("US/Eastern") for ts in TIMESTAMPS],
+        [1, 2, 2.5],
+        [True, False, 1],
+        [1, 2, 2**70],
+        [1.5, 2.5, "c"],
+        [TIMESTAMPS[0], TIMESTAMPS[1].tz_localize("UTC"), TIMESTAMPS[2]],
+    ],
+)
+def test_matches_data_frame(values):
+    records = LabelRecords(["customer_id", "label"], capacity=1)
+    records.extend((i, value) for i, value in enumerate(values))
+    assert len(records) == 3
+
+    data = [{"customer_id": i, "label": value} for i, value in enumerate(values)]
+    expected = pd.DataFrame(data)
+    actual = pd.DataFrame(records.to_dict())
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_repeated_columns():
+    records = LabelRecords(["customer_id", "time", "time"])
+    records.append((0, 1, 2))
+    data = {key: list(values) for key, values in records.to_dict().items()}
+    assert data == {"customer_id": [0], "time": [2]}
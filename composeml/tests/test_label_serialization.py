@@ -2,6 +2,7 @@ import os
 import shutil
 
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 import composeml as cp
@@ -45,3 +46,71 @@ def test_pickle(path, total_spent):
     total_spent_copy = cp.read_label_times(path)
     pd.testing.assert_frame_equal(total_spent, total_spent_copy)
     assert total_spent.equals(total_spent_copy)
+
+
+@pytest.mark.parametrize("row_group_size", [1, 3, 100])
+def test_parquet_sink(path, transactions, total_spent_fn, row_group_size):
+    lm = cp.LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+    kwargs = {"num_examples_per_instance": -1, "gap": "30min", "verbose": False}
+    sink = cp.ParquetSink(path, row_group_size=row_group_size)
+    assert lm.search(transactions, sink=sink, **kwargs) == path
+
+    lt = cp.read_label_times(path)
+    expected = lm.search(transactions, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+    assert lt.equals(expected)
+
+    file = pq.ParquetFile(os.path.join(path, "data.parquet"))
+    assert file.num_row_groups == -(-len(expected) // row_group_size)
+
+
+def test_parquet_sink_without_labels(path, transactions, total_spent_fn):
+    lm = cp.LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+    )
+
+    kwargs = {"num_examples_per_instance": 1, "minimum_data": "2020-01-01"}
+    lm.search(transactions, sink=cp.ParquetSink(path), verbose=False, **kwargs)
+    lt = cp.read_label_times(path)
+    assert lt.empty
+    assert lt.search_settings["minimum_data"] == "2020-01-01"
+
+
+@pytest.mark.parametrize("labels", [[[1, 2], [1.5, None]], [[None], [1, 2], [2.5]]])
+def test_parquet_sink_promotes_labels(path, labels):
+    batches, start = [], 0
+    for values in labels:
+        # each batch infers the data type of its own labels
+        data = {
+            "customer_id": range(start, start + len(values)),
+            "time": pd.date_range("2019-01-01", periods=len(values)),
+            "label": values,
+        }
+
+        lt = cp.LabelTimes(
+            data=pd.DataFrame(data),
+            target_dataframe_index="customer_id",
+            target_columns=["label"],
+        )
+
+        batches.append(lt)
+        start += len(values)
+
+    with cp.ParquetSink(path, row_group_size=1) as sink:
+        for lt in batches:
+            sink.write(lt)
+
+    lt = cp.read_label_times(path)
+    expected = [lt.astype({"label": "float64"}) for lt in batches]
+    expected = pd.concat(expected, ignore_index=True)
+    assert lt.label.dtype == "float64"
+    pd.testing.assert_frame_equal(lt, expected, check_like=True)
+    assert not os.path.exists(os.path.join(path, "data.parquet.tmp"))
@@ -0,0 +1,21 @@
+import numpy as np
+
+from composeml.scheduler import get_window_costs, split_tasks
+
+
+def test_get_window_costs():
+    costs = get_window_costs([0, 2, 5], [2, 5, 5], window_cost=1)
+    assert costs.tolist() == [3, 4, 1]
+
+
+def test_split_tasks():
+    costs = np.array([1, 1, 1, 1, 12, 1, 1, 1, 1])
+    tasks = split_tasks(costs, n_jobs=2, tasks_per_job=2)
+    assert tasks == [(0, 4), (4, 5), (5, 9)]
+    assert split_tasks([], n_jobs=2) == []
+
+
+def test_split_tasks_uniform():
+    costs = np.ones(100)
+    tasks = split_tasks(costs, n_jobs=2, tasks_per_job=2)
+    assert tasks == [(0, 25), (25, 50), (50, 75), (75, 100)]
@@ -0,0 +1,156 @@
+import pandas as pd
+import pytest
+
+from composeml import LabelMaker, is_in_shard, merge_label_times, read_label_times
+from composeml.shard import get_shards
+
+
+@pytest.fixture
+def lm(total_spent_fn):
+    return LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size=2,
+    )
+
+
+def test_get_shards():
+    values = pd.Series([0, 1, 2, 3])
+    expected = [2, 1, 2, 1]
+    assert get_shards(values, 3).tolist() == expected
+    assert get_shards(values.astype("category"), 3).tolist() == expected
+    assert get_shards(values.astype(object), 3).tolist() == expected
+
+
+def test_get_shards_float_keys():
+    values = pd.Series([0, 1, 2, 3, 10**15])
+    expected = get_shards(values, 3).tolist()
+    assert get_shards(values.astype("float64"), 3).tolist() == expected
+    assert get_shards(values.astype("float64").astype(object), 3).tolist() == expected
+
+    # an id column with a null is loaded as float
+    values = pd.Series([0, None, 2, 3.5])
+    actual = get_shards(values, 3).tolist()
+    assert actual[0] == expected[0] and actual[2] == expected[2]
+    assert actual[1] == get_shards(pd.Series(["nan"]), 3)[0]
+    assert actual[3] == get_shards(pd.Series(["3.5"]), 3)[0]
+
+
+def test_is_in_shard_errors():
+    match = "shard index must be an integer from zero to the number of shards"
+    with pytest.raises(AssertionError, match=match):
+        is_in_shard([0, 1], shard_index=2, num_shards=2)
+
+    with pytest.raises(AssertionError, match=match):
+        is_in_shard([0, 1], shard_index=0, num_shards=None)
+
+
+def test_search_shards(transactions, lm, tmp_path):
+    kwargs = {"num_examples_per_instance": 2, "gap": 1, "verbose": False}
+    expected = lm.search(transactions, **kwargs)
+    paths, keys = [], set()
+
+    for shard_index in range(3):
+        lt = lm.search(transactions, shard_index=shard_index, num_shards=3, **kwargs)
+        shard_keys = set() if lt.empty else set(lt.customer_id)
+        assert keys.isdisjoint(shard_keys)
+        keys.update(shard_keys)
+
+        path = str(tmp_path / str(shard_index))
+        lt.to_parquet(path)
+        paths.append(path)
+
+    path = str(tmp_path / "merged")
+    actual = merge_label_times(paths, path)
+    assert actual.equals(expected)
+
+    actual = merge_label_times([path])
+    assert actual.equals(expected)
+
+
+def test_slice_shards(transactions, lm):
+    kwargs = {"num_examples_per_instance": 2, "gap": 1}
+    expected = list(lm.slice(transactions, **kwargs))
+    actual = []
+
+    for shard_index in range(2):
+        actual += lm.slice(
+            transactions, shard_index=shard_index, num_shards=2, **kwargs
+        )
+
+    key = "customer_id"
+    actual.sort(key=lambda ds: (getattr(ds.context, key), ds.context.slice_number))
+    assert len(actual) == len(expected)
+
+    for a, b in zip(actual, expected):
+        assert a.equals(b)
+        assert str(a.context) == str(b.context)
+
+
+def test_merge_label_times_settings(transactions, lm, tmp_path):
+    lt = lm.search(transactions, 1, verbose=False)
+    lt.to_parquet(str(tmp_path / "a"))
+    lt = lm.search(transactions, 2, gap=1, verbose=False)
+    lt.to_parquet(str(tmp_path / "b"))
+
+    match = "label times must have the same settings to merge"
+    with pytest.raises(AssertionError, match=match):
+        merge_label_times([str(tmp_path / "a"), str(tmp_path / "b")])
+
+
+@pytest.mark.parametrize("num_examples_per_instance", [2, -1, {2: 1, 1: -1}])
+def test_search_time_shards(transactions, lm, tmp_path, num_examples_per_instance):
+    lm.window_size = "1h"
+    kwargs = {
+        "num_examples_per_instance": num_examples_per_instance,
+        "minimum_data": "2019-01-01 08:00:00",
+        "maximum_data": "2019-01-01 12:30:00",
+        "gap": "30min",
+        "verbose": False,
+    }
+
+    expected = lm.search(transactions, **kwargs)
+    paths = []
+
+    for i in range(3):
+        args = i, 3, kwargs["minimum_data"], kwargs["maximum_data"], kwargs["gap"]
+        start, stop = lm.get_time_shard(*args)
+        time = pd.to_datetime(transactions.time)
+        df = transactions[(time >= start) & (time < stop)]
+        lt = lm.search(df, time_shard_index=i, num_time_shards=3, **kwargs)
+
+        path = str(tmp_path / str(i))
+        lt.to_parquet(path)
+        paths.append(path)
+
+    # the keys of the number of examples are strings after saving the settings
+    expected.to_parquet(str(tmp_path / "expected"))
+    expected = read_label_times(str(tmp_path / "expected"))
+    actual = merge_label_times(paths)
+    assert actual.equals(expected)
+
+
+def test_get_time_shard(lm):
+    lm.window_size = "1h"
+    start, stop = lm.get_time_shard(
+        1, 2, "2019-01-01 08:00", "2019-01-01 09:30", "30min"
+    )
+    assert start == pd.Timestamp("2019-01-01 09:00")
+    assert stop == pd.Timestamp("2019-01-01 10:30")
+
+
+def test_time_shard_errors(transactions, lm):
+    kwargs = {"minimum_data": "2019-01-01", "verbose": False}
+    match = "time shards require a fixed time-based window size and gap"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(transactions, -1, time_shard_index=0, num_time_shards=2, **kwargs)
+
+    lm.window_size = "1h"
+    match = "time shards require timestamps for the minimum and maximum data"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(transactions, -1, time_shard_index=0, num_time_shards=2, **kwargs)
+
+    match = "time shards require dropping empty slices"
+    with pytest.raises(AssertionError, match=match):
+        lm.search(transactions, -1, drop_empty=False, time_shard_index=0, **kwargs)
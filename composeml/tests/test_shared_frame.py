@@ -0,0 +1,36 @@
+import pandas as pd
+
+from composeml.shared_frame import SharedFrame, attach_frame, release_frames
+
+
+def test_attach_frame():
+    index = pd.date_range("2019-01-01", periods=3, freq="h", name="time")
+    df = pd.DataFrame(
+        {
+            "amount": [1.5, 2.5, 3.5],
+            "count": [1, 2, 3],
+            "flag": [True, False, True],
+            "name": ["a", "b", None],
+            "category": pd.Categorical(["x", "y", "x"]),
+            "time_zone": pd.date_range("2019-01-01", periods=3, tz="US/Eastern"),
+        },
+        index=index,
+    )
+
+    with SharedFrame(df) as frame:
+        actual = attach_frame(frame.handle)
+        pd.testing.assert_frame_equal(actual, df, check_freq=False)
+        assert attach_frame(frame.handle) is actual
+        assert not actual["amount"].to_numpy().flags.writeable
+
+    release_frames()
+
+
+def test_attach_frame_empty():
+    df = pd.DataFrame({"amount": []}, index=pd.DatetimeIndex([], name="time"))
+
+    with SharedFrame(df) as frame:
+        actual = attach_frame(frame.handle)
+        pd.testing.assert_frame_equal(actual, df)
+
+    release_frames()
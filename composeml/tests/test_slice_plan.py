@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import composeml as cp
+
+
+@pytest.fixture
+def path():
+    pwd = os.path.dirname(__file__)
+    path = os.path.join(pwd, ".cache")
+    yield path
+    shutil.rmtree(path)
+
+
+@pytest.fixture
+def lm(total_spent_fn):
+    return cp.LabelMaker(
+        target_dataframe_index="customer_id",
+        time_index="time",
+        labeling_function=total_spent_fn,
+        window_size="1h",
+    )
+
+
+def test_plan_matches_slices(transactions, lm):
+    kwargs = {"num_examples_per_instance": 2, "gap": "30min", "drop_empty": False}
+    plan = lm.plan(transactions, **kwargs)
+    assert plan.target_dataframe_index == "customer_id"
+    assert plan.search_settings["num_examples_per_instance"] == 2
+
+    slices = list(lm.slice(transactions, **kwargs))
+    assert len(plan) == len(slices)
+
+    for window, ds in zip(plan.itertuples(index=False), slices):
+        context = ds.context
+        assert window.customer_id == context.customer_id
+        assert window.slice_number == context.slice_number
+        assert window.slice_start == context.slice_start
+        assert window.slice_stop == context.slice_stop
+        assert window.next_start == context.next_start
+
+        df = transactions[transactions.customer_id == window.customer_id]
+        df = df.iloc[window.row_start : window.row_stop]
+        assert df.amount.tolist() == ds.amount.tolist()
+
+
+@pytest.mark.parametrize(
+    "labeling_function",
+    ["total_spent_fn", ("amount", "sum"), cp.batch(lambda df, _: [1.0] * len(_))],
+)
+def test_label_matches_search(transactions, lm, labeling_function, request):
+    if isinstance(labeling_function, str):
+        labeling_function = request.getfixturevalue(labeling_function)
+
+    lm.labeling_function = {"label": labeling_function}
+    kwargs = {"num_examples_per_instance": -1, "minimum_data": "30min", "gap": 1}
+    plan = lm.plan(transactions, **kwargs)
+
+    df = transactions.sort_values("customer_id", ascending=False, kind="stable")
+    lt = lm.label(df, plan, verbose=False)
+    expected = lm.search(transactions, verbose=False, **kwargs)
+    pd.testing.assert_frame_equal(lt, expected)
+    assert lt.search_settings == plan.search_settings
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet", "pickle"])
+def test_serialization(path, transactions, lm, file_format):
+    plan = lm.plan(transactions, num_examples_per_instance=-1, gap="30min")
+    getattr(plan, f"to_{file_format}")(path)
+    plan_copy = cp.read_slice_plan(path)
+    pd.testing.assert_frame_equal(plan, plan_copy)
+    assert plan_copy.search_settings == plan.search_settings
+
+    lt = lm.label(transactions, plan_copy, verbose=False)
+    pd.testing.assert_frame_equal(lt, lm.label(transactions, plan, verbose=False))
+
+
+def test_label_missing_target_group(transactions, lm):
+    plan = lm.plan(transactions, num_examples_per_instance=1)
+    df = transactions[transactions.customer_id != 3]
+    match = "target groups in slice plan not found in data frame"
+    with pytest.raises(AssertionError, match=match):
+        lm.label(df, plan, verbose=False)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from composeml.target_groups import TargetGroups
+
+
+@pytest.fixture
+def df():
+    data = {
+        "time": pd.date_range("2019-01-01", periods=6, freq="1h"),
+        "customer_id": [2, 1, np.nan, 2, 1, 0],
+        "amount": range(6),
+    }
+    return pd.DataFrame(data).set_index("time")
+
+
+def test_target_groups(df):
+    target_groups = TargetGroups(df, "customer_id")
+    assert target_groups.ngroups == 3
+
+    actual = {key: ds.amount.tolist() for key, ds in target_groups}
+    assert actual == {0: [5], 1: [1, 4], 2: [0, 3]}
+
+    expected = {key: ds.amount.tolist() for key, ds in df.groupby("customer_id")}
+    assert actual == expected
+
+
+def test_target_groups_sorted(df):
+    df = df.dropna().sort_values("customer_id", kind="stable")
+    target_groups = TargetGroups(df, "customer_id")
+    assert target_groups.df is df
+    assert target_groups.starts.tolist() == [0, 1, 3]
+    assert target_groups.stops.tolist() == [1, 3, 5]
+
+
+def test_check_index(df):
+    TargetGroups(df, "customer_id").check_index()
+
+    unsorted = df.iloc[[3, 1, 2, 0, 4, 5]]
+    match = "data frame must be sorted chronologically"
+    with pytest.raises(AssertionError, match=match):
+        TargetGroups(unsorted, "customer_id").check_index()
+
+    null = df.set_index(df.index.where(df.amount != 4))
+    with pytest.raises(AssertionError, match="index contains null values"):
+        TargetGroups(null, "customer_id").check_index()